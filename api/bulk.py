@@ -0,0 +1,110 @@
+from flask import request, jsonify, current_app
+from marshmallow import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from api.extensions import db
+
+
+def get_partial_arg():
+    """
+    Reads the `partial` query parameter of a bulk request. When set, rows that fail
+    are reported and skipped instead of aborting the whole request.
+    """
+    return request.args.get('partial', '').lower() in ('1', 'true', 'yes')
+
+
+def load_bulk_rows(schema, data, partial=False):
+    """
+    Validates a JSON array of rows with `schema` and returns them as (index, values)
+    pairs together with the validation errors of the rejected rows by index.
+    Without `partial` any invalid row raises ValidationError, as does a body that is
+    not an array or is longer than BULK_MAX_ROWS.
+    """
+    if not isinstance(data, list):
+        raise ValidationError("Expected a list of rows")
+
+    max_rows = current_app.config["BULK_MAX_ROWS"]
+    if len(data) > max_rows:
+        raise ValidationError(f"At most {max_rows} rows can be created at once")
+
+    if not partial:
+        return list(enumerate(schema.load(data, many=True))), {}
+
+    rows, errors = [], {}
+    for index, row in enumerate(data):
+        try:
+            rows.append((index, schema.load(row)))
+        except ValidationError as e:
+            errors[index] = e.messages
+    return rows, errors
+
+
+def bulk_insert(model, rows, partial=False, statement=None):
+    """
+    Inserts the (index, values) `rows` into the table of `model` with one executemany
+    per BULK_BATCH_SIZE rows, in the current transaction. `statement` replaces the
+    plain INSERT, for instance with an upsert.
+    Without `partial` the first row the database rejects raises IntegrityError, or
+    DataError for a value the column can't hold. With it each batch runs in a
+    savepoint and a rejected batch is retried one row at a time, so only the failing
+    rows are skipped. Returns their errors by index.
+    """
+    batch_size = current_app.config["BULK_BATCH_SIZE"]
+    statement = insert(model) if statement is None else statement
+    errors = {}
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        if not partial:
+            db.session.execute(statement, [values for _, values in batch])
+            continue
+
+        try:
+            with db.session.begin_nested():
+                db.session.execute(statement, [values for _, values in batch])
+        except (IntegrityError, DataError):
+            for index, values in batch:
+                try:
+                    with db.session.begin_nested():
+                        db.session.execute(statement, [values])
+                except (IntegrityError, DataError) as e:
+                    errors[index] = str(e.orig)
+
+    return errors
+
+
+def bulk_create(schema, create):
+    """
+    Handles a bulk create request: validates the JSON array of rows with `schema`,
+    writes them with `create(rows, partial)`, which returns the errors of the rows
+    the database rejected, and builds the response with bulk_response.
+    """
+    partial = get_partial_arg()
+    try:
+        rows, errors = load_bulk_rows(schema, request.json, partial)
+    except ValidationError as e:
+        return jsonify({'error': e.messages}), 400
+
+    try:
+        errors.update(create(rows, partial))
+    except IntegrityError as e:
+        return jsonify({'error': str(e.orig)}), 409
+    except DataError as e:
+        return jsonify({'error': str(e.orig)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    return bulk_response(rows, errors)
+
+
+def bulk_response(rows, errors):
+    """
+    Builds the response of a bulk request: the number of rows created and the
+    errors of the skipped rows in request order. Answers 207 when some rows failed.
+    """
+    created = sum(1 for index, _ in rows if index not in errors)
+    body = {
+        'created': created,
+        'errors': [{'index': index, 'errors': errors[index]} for index in sorted(errors)],
+    }
+    return jsonify(body), 207 if errors else 201
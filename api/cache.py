@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app
+from sqlalchemy.orm import object_session
+from api.versioning import get_versions
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded cache whose entries expire after `ttl` seconds
+    and are evicted least-recently-used first once `maxsize` is reached.
+    Keys are grouped into namespaces so that a write can drop every entry of the
+    resource it touched.
+    """
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+        self.evictions = 0
+
+    def get(self, namespace, key):
+        """
+        Returns (True, value) on a hit and (False, None) on a miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end((namespace, key))
+                self.hits[namespace] = self.hits.get(namespace, 0) + 1
+                return True, entry[1]
+
+            if entry is not None:
+                del self._entries[(namespace, key)]
+            self.misses[namespace] = self.misses.get(namespace, 0) + 1
+            return False, None
+
+    def set(self, namespace, key, value, generation, ttl=None):
+        """
+        Stores `value` unless `namespace` was invalidated since `generation` was read,
+        which keeps a read racing with a write from caching the old rows.
+        `ttl` shortens the lifetime of this entry below the cache's own ttl.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            if self._generations.get(namespace, 0) != generation:
+                return
+
+            self._entries[(namespace, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self, namespace):
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def invalidate(self, *namespaces):
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for cache_key in [cache_key for cache_key in self._entries if cache_key[0] in namespaces]:
+                del self._entries[cache_key]
+
+    def stats(self):
+        with self._lock:
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': hits,
+                'misses': misses,
+                'evictions': self.evictions,
+                'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+                'namespaces': {
+                    namespace: {'hits': self.hits.get(namespace, 0), 'misses': self.misses.get(namespace, 0)}
+                    for namespace in sorted(set(self.hits) | set(self.misses))
+                },
+            }
+
+
+class Cache:
+    """
+    In-process read-through cache for service read methods.
+    Each app gets its own TTLCache. Entries are keyed on the versions of the tables
+    they were read from, so a write committed by another worker is seen on the next read.
+    """
+    def init_app(self, app):
+        app.extensions['cache'] = TTLCache(app.config["CACHE_MAX_SIZE"], app.config["CACHE_TTL"])
+
+    @property
+    def store(self):
+        return current_app.extensions['cache']
+
+    def cached(self, namespace, depends_on=None):
+        """
+        Caches the return value of a service read method under `namespace`.
+        `depends_on` lists the tables the method reads and defaults to the namespace.
+        """
+        tables = tuple(depends_on or (namespace,))
+
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                store = self.store
+                key = (f.__name__, args, tuple(sorted(kwargs.items())), get_versions(tables))
+
+                hit, value = store.get(namespace, key)
+                if hit:
+                    return _attach(value)
+
+                generation = store.generation(namespace)
+                value = f(*args, **kwargs)
+                store.set(namespace, key, _detach(value), generation)
+                return value
+
+            return wrapper
+        return decorator
+
+    def invalidates(self, *namespaces):
+        """
+        Drops every cached entry of `namespaces` once a service write method returns or fails.
+        """
+        def decorator(f):
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    self.store.invalidate(*namespaces)
+
+            return wrapper
+        return decorator
+
+cache = Cache()
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _detach(value):
+    """
+    Expunges cached model instances from the request session so they outlive it.
+    """
+    if hasattr(value, '_sa_instance_state'):
+        session = object_session(value)
+        if session is not None:
+            session.expunge(value)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _detach(item)
+    return value
+
+
+def _attach(value):
+    """
+    Copies cached model instances into the current session without querying the database.
+    """
+    if hasattr(value, '_sa_instance_state'):
+        return current_app.extensions['sqlalchemy'].session.merge(value, load=False)
+    if isinstance(value, list):
+        return [_attach(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_attach(item) for item in value)
+    return value
@@ -6,12 +6,82 @@ load_dotenv()
 class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRES"))
+    JWT_VERIFY_CACHE_SIZE = int(os.getenv("JWT_VERIFY_CACHE_SIZE", 1024))
+    JWT_VERIFY_CACHE_TTL = int(os.getenv("JWT_VERIFY_CACHE_TTL", 300))
     SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI")
     NOSQLDB_URI = os.getenv("NOSQLDB_URI")
     NOSQLDB_NAME = os.getenv("NOSQLDB_NAME")
     LOGGING_COLLECTION_NAME = os.getenv("LOGGING_COLLECTION_NAME")
+    NOSQLDB_TIMEOUT_MS = int(os.getenv("NOSQLDB_TIMEOUT_MS", 2000))
     SENSITIVE_FIELDS = {"password"}
 
+    # Set the database connection pool of every worker: connections kept open, extra
+    # connections allowed under bursts, seconds to wait for one before failing, and
+    # how many to open at startup (only SQLite files are pooled; an in-memory SQLite
+    # database ignores all but pre-ping and recycle, and SQLite pools are never warmed)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", DB_POOL_SIZE))
+
+    # Set PostgreSQL connection timeouts and TCP keepalives, in seconds except the
+    # statement timeout, which only applies to statements run by requests (0 disables it)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 10))
+    DB_KEEPALIVES_IDLE = int(os.getenv("DB_KEEPALIVES_IDLE", 30))
+    DB_KEEPALIVES_INTERVAL = int(os.getenv("DB_KEEPALIVES_INTERVAL", 10))
+    DB_KEEPALIVES_COUNT = int(os.getenv("DB_KEEPALIVES_COUNT", 5))
+
+    # Set keyset pagination limits for list endpoints
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", 100))
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", 1000))
+
+    # Set the number of rows fetched and written per chunk by streaming exports
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+    # Set the size and lifetime of the in-process catalog read cache
+    CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", 1024))
+    CACHE_TTL = int(os.getenv("CACHE_TTL", 300))
+
+    # Set how many catalog snapshots and encoded payloads each worker keeps for delta sync
+    CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", 32))
+    CATALOG_CACHE_TTL = int(os.getenv("CATALOG_CACHE_TTL", 86400))
+
+    # Set the request log shipper. REQUEST_LOG_PATH is a JSON Lines file used when NOSQLDB_URI is unset
+    REQUEST_LOG_PATH = os.getenv("REQUEST_LOG_PATH")
+    REQUEST_LOG_SPOOL_PATH = os.getenv("REQUEST_LOG_SPOOL_PATH", "instance/request_log.spool")
+    REQUEST_LOG_QUEUE_SIZE = int(os.getenv("REQUEST_LOG_QUEUE_SIZE", 10000))
+    REQUEST_LOG_BATCH_SIZE = int(os.getenv("REQUEST_LOG_BATCH_SIZE", 500))
+    REQUEST_LOG_FLUSH_INTERVAL = float(os.getenv("REQUEST_LOG_FLUSH_INTERVAL", 1.0))
+
+    # Set the rows accepted per bulk create request and written per INSERT batch
+    BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", 10000))
+    BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 1000))
+
+    # Set the rows read and validated per chunk by CSV imports and where uploads are spooled
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 5000))
+    IMPORT_DIR = os.getenv("IMPORT_DIR", "instance/imports")
+
+    # Set per-request SQL statement stats: X-DB-Queries and Server-Timing headers, and the
+    # duration above which a statement is logged as slow (0 disables the slow query log)
+    QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", "true").lower() == "true"
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 250))
+
+    # Set where every worker writes its /metrics totals so a scrape of any worker reports
+    # them all (unset for a single process), and how often they are written, in seconds.
+    # Exited workers' counters are kept in its archive.json; empty the directory on deploy
+    # so series of endpoints that no longer exist are dropped
+    METRICS_DIR = os.getenv("METRICS_DIR") or None
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+
+    # Set how many background jobs each worker runs at once
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+
+    # Set the stock level reorder suggestions top up to, as a multiple of the item's warning level
+    REORDER_TARGET_MULTIPLIER = float(os.getenv("REORDER_TARGET_MULTIPLIER", 2.0))
+
     # Set API documentation configurations
     API_TITLE = "My API"
     API_VERSION = "v1"
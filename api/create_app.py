@@ -1,9 +1,13 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from .middleware import jwt_required
+from .middleware import jwt_required, log_request
 from .config import Config
 from .extensions import db, migrate, api, ma, jwt
-from .routes import index_blueprint, auth_blueprint, product_blueprint, supplier_blueprint, branch_blueprint, tag_blueprint, category_blueprint, recipe_blueprint, inventory_item_blueprint, outlet_blueprint, branch_stock_count_blueprint
+from .cache import cache
+from .query_stats import init_query_stats
+from .metrics import init_metrics
+from .db_pool import engine_options, warm_pool
+from .routes import index_blueprint, auth_blueprint, product_blueprint, supplier_blueprint, branch_blueprint, tag_blueprint, category_blueprint, recipe_blueprint, inventory_item_blueprint, outlet_blueprint, branch_stock_count_blueprint, cache_blueprint, catalog_blueprint, sale_blueprint, product_cost_blueprint, job_blueprint, reorder_blueprint, csv_import_blueprint, metrics_blueprint
 from .seeds.products import register_commands as register_products
 from .seeds.outlets import register_commands as register_outlets
 from .seeds.suppliers import register_commands as register_suppliers
@@ -14,6 +18,8 @@ from .seeds.branchstockcounts import register_commands as register_branch_stock_
 from .seeds.categories import register_commands as register_categories
 from .seeds.tags import register_commands as register_tags
 from .seeds.users import register_commands as register_users
+from .seeds.synthetic import register_commands as register_synthetic
+from .csv_import import register_commands as register_csv_import
 
 def create_app():
     app = Flask(__name__)
@@ -23,12 +29,19 @@ def create_app():
     # Or enable CORS for specific domains only (recommended for production)
     # CORS(app, resources={r"/*": {"origins": ["https://flutter-frontend.example.com", "https://angular-frontend.example.com"]}})
     app.config.from_object(Config)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
 
     db.init_app(app)
     migrate.init_app(app, db)
     ma.init_app(app)
     jwt.init_app(app)
     api.init_app(app)
+    cache.init_app(app)
+
+    app.after_request(log_request)
+    init_query_stats(app)
+    warm_pool(app)
+    init_metrics(app)
 
     # @app.before_request
     # def check_authentication():
@@ -47,6 +60,8 @@ def create_app():
     register_categories(app)
     register_tags(app)
     register_users(app)
+    register_synthetic(app)
+    register_csv_import(app)
     
     api.register_blueprint(index_blueprint)
     api.register_blueprint(product_blueprint)
@@ -59,5 +74,13 @@ def create_app():
     api.register_blueprint(inventory_item_blueprint)
     api.register_blueprint(outlet_blueprint)
     api.register_blueprint(branch_stock_count_blueprint)
+    api.register_blueprint(cache_blueprint)
+    api.register_blueprint(catalog_blueprint)
+    api.register_blueprint(sale_blueprint)
+    api.register_blueprint(product_cost_blueprint)
+    api.register_blueprint(job_blueprint)
+    api.register_blueprint(reorder_blueprint)
+    api.register_blueprint(csv_import_blueprint)
+    api.register_blueprint(metrics_blueprint)
     
     return app
@@ -0,0 +1,116 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from api.bulk import load_bulk_rows
+from api.schemas.branchstockcount import BranchStockCountSchema
+from api.schemas.inventoryitems import InventorySchema
+from api.services.branchstockcount_service import BranchStockCountService
+from api.services.inventoryitem_service import InventoryItemService
+
+# Resources that can be imported, with the schema validating each row and the
+# service method writing a chunk of valid rows. Stock counts are upserted.
+IMPORT_RESOURCES = {
+    "inventory-items": (InventorySchema, InventoryItemService.bulk_create_inventory_items),
+    "branchstockcounts": (BranchStockCountSchema, BranchStockCountService.bulk_upsert_branch_stock_counts),
+}
+
+
+def import_csv(resource, file, rejects_path):
+    """
+    Imports the CSV rows of the text stream `file` into `resource`, reading, validating
+    and writing IMPORT_CHUNK_SIZE rows at a time so memory stays bounded whatever the
+    file size. Every chunk is committed on its own. Rows that fail validation or that
+    the database rejects are skipped and written to `rejects_path` with their errors.
+    Returns the counts and throughput of the import.
+    """
+    schema_class, write_rows = IMPORT_RESOURCES[resource]
+    schema = schema_class()
+    chunk_size = current_app.config["IMPORT_CHUNK_SIZE"]
+    reader = csv.DictReader(file)
+    report = {'resource': resource, 'rows': 0, 'imported': 0, 'rejected': 0}
+    started = time.perf_counter()
+
+    with _RejectWriter(rejects_path, reader) as rejects:
+        while chunk := list(islice(reader, chunk_size)):
+            # Columns the schema doesn't load, such as the id of an export, are ignored
+            data = [{name: value for name, value in row.items() if name in schema.load_fields} for row in chunk]
+            rows, errors = load_bulk_rows(schema, data, partial=True)
+            if rows:
+                errors.update(write_rows(rows, partial=True))
+
+            for index in sorted(errors):
+                rejects.write(report['rows'] + index + 1, errors[index], chunk[index])
+            report['rows'] += len(chunk)
+            report['imported'] += len(chunk) - len(errors)
+            report['rejected'] += len(errors)
+
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    report['rows_per_second'] = round(report['rows'] / report['seconds']) if report['seconds'] else None
+    return report
+
+
+def import_csv_file(resource, path, rejects_path, remove=False):
+    """
+    Imports the CSV file at `path`, removing it afterwards when `remove` is set.
+    """
+    try:
+        # utf-8-sig drops the byte order mark spreadsheet exports start with
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            return import_csv(resource, file, rejects_path)
+    finally:
+        if remove:
+            os.remove(path)
+
+################################################################
+#                    CLI COMMANDS                              #
+################################################################
+@click.command("import-csv")
+@click.argument("resource", type=click.Choice(sorted(IMPORT_RESOURCES)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--rejects", "rejects_path", type=click.Path(dir_okay=False), help="CSV file rejected rows are written to. Defaults to <path>.rejects.csv")
+@with_appcontext
+def import_csv_command(resource, path, rejects_path):
+    """Import a CSV file of inventory items or branch stock counts."""
+    rejects_path = rejects_path or f"{os.path.splitext(path)[0]}.rejects.csv"
+    report = import_csv_file(resource, path, rejects_path)
+
+    click.echo(f"Imported {report['imported']} of {report['rows']} {resource} rows in {report['seconds']}s ({report['rows_per_second'] or 0} rows/s)")
+    if report['rejected']:
+        click.echo(f"{report['rejected']} rejected rows written to {rejects_path}")
+
+
+def register_commands(app):
+    app.cli.add_command(import_csv_command)
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+class _RejectWriter:
+    """
+    Writes rejected rows as CSV with their row number and errors in front of the
+    original columns. The file is only created once a row is rejected.
+    """
+    def __init__(self, path, reader):
+        self.path = path
+        self.reader = reader
+        self._file = None
+        self._writer = None
+
+    def write(self, row_number, errors, row):
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=["row", "errors", *(self.reader.fieldnames or [])], extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerow({**row, "row": row_number, "errors": json.dumps(errors)})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            self._file.close()
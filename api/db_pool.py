@@ -0,0 +1,137 @@
+import logging
+import os
+import weakref
+from flask import current_app, has_request_context
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from api.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Engines whose pools were warmed, so a forked worker can drop the connections it inherited
+_warmed_engines = weakref.WeakSet()
+
+
+def engine_options(config):
+    """
+    Builds SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings, after checking them.
+    An in-memory SQLite database gets no pool sizing, since it runs on a single
+    shared connection; a SQLite file gets a sized QueuePool like any server database.
+    """
+    validate_pool_config(config)
+
+    options = {
+        'pool_pre_ping': config["DB_POOL_PRE_PING"],
+        'pool_recycle': config["DB_POOL_RECYCLE"],
+    }
+
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        pool_size=config["DB_POOL_SIZE"],
+        max_overflow=config["DB_MAX_OVERFLOW"],
+        pool_timeout=config["DB_POOL_TIMEOUT"],
+    )
+
+    if url.get_backend_name() == "postgresql":
+        options['connect_args'] = {
+            'connect_timeout': config["DB_CONNECT_TIMEOUT"],
+            'keepalives': 1,
+            'keepalives_idle': config["DB_KEEPALIVES_IDLE"],
+            'keepalives_interval': config["DB_KEEPALIVES_INTERVAL"],
+            'keepalives_count': config["DB_KEEPALIVES_COUNT"],
+        }
+
+    return options
+
+
+def validate_pool_config(config):
+    """Raises ValueError listing every DB_* setting that is out of range"""
+    checks = [
+        ("DB_POOL_SIZE", config["DB_POOL_SIZE"] >= 1, "must be at least 1"),
+        ("DB_MAX_OVERFLOW", config["DB_MAX_OVERFLOW"] >= -1, "must be -1 (unlimited) or more"),
+        ("DB_POOL_TIMEOUT", config["DB_POOL_TIMEOUT"] > 0, "must be positive"),
+        ("DB_POOL_RECYCLE", config["DB_POOL_RECYCLE"] == -1 or config["DB_POOL_RECYCLE"] > 0, "must be -1 (never) or positive"),
+        ("DB_STATEMENT_TIMEOUT_MS", config["DB_STATEMENT_TIMEOUT_MS"] >= 0, "must be 0 (disabled) or positive"),
+        ("DB_CONNECT_TIMEOUT", config["DB_CONNECT_TIMEOUT"] >= 2, "must be at least 2, libpq's minimum"),
+        ("DB_KEEPALIVES_IDLE", config["DB_KEEPALIVES_IDLE"] >= 1, "must be at least 1"),
+        ("DB_KEEPALIVES_INTERVAL", config["DB_KEEPALIVES_INTERVAL"] >= 1, "must be at least 1"),
+        ("DB_KEEPALIVES_COUNT", config["DB_KEEPALIVES_COUNT"] >= 1, "must be at least 1"),
+        # Connections past the pool size are overflow, which is closed on return rather than kept warm
+        ("DB_POOL_WARMUP", 0 <= config["DB_POOL_WARMUP"] <= config["DB_POOL_SIZE"], "must be between 0 and DB_POOL_SIZE"),
+    ]
+    errors = [f"{name} {message}" for name, valid, message in checks if not valid]
+    if errors:
+        raise ValueError(f"Invalid database pool settings: {'; '.join(errors)}")
+
+
+def warm_pool(app):
+    """
+    Opens DB_POOL_WARMUP connections of every engine before the app takes traffic, so
+    the first requests of a worker don't each pay for a connection. An unreachable
+    database is logged rather than raised, so CLI commands still start; the pool
+    connects on demand once it is back.
+    """
+    count = app.config["DB_POOL_WARMUP"]
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite" or not count:
+                continue
+
+            connections = []
+            try:
+                for _ in range(count):
+                    connections.append(engine.connect())
+                _check_server_limit(engine, connections[0], app.config)
+            except SQLAlchemyError as e:
+                logger.warning("Could not warm the pool of %s: %s", engine.url.render_as_string(hide_password=True), e)
+            finally:
+                for connection in connections:
+                    connection.close()
+
+            _warmed_engines.add(engine)
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _check_server_limit(engine, connection, config):
+    """Warns when one worker's pool alone could use up the server's connections"""
+    if engine.dialect.name != "postgresql" or config["DB_MAX_OVERFLOW"] == -1:
+        return
+    limit = int(connection.execute(text("SHOW max_connections")).scalar())
+    per_worker = config["DB_POOL_SIZE"] + config["DB_MAX_OVERFLOW"]
+    if per_worker >= limit:
+        logger.warning(
+            "DB_POOL_SIZE + DB_MAX_OVERFLOW (%d) reaches the server's max_connections (%d); "
+            "workers will fail to connect under load", per_worker, limit,
+        )
+
+
+def _discard_inherited_connections():
+    # A forked child must not use its parent's sockets; close=False leaves them to the parent
+    for engine in list(_warmed_engines):
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_discard_inherited_connections)
+
+################################################################
+#                    SESSION EVENTS                            #
+################################################################
+@event.listens_for(Session, "after_begin")
+def _limit_request_statements(session, transaction, connection):
+    """
+    Caps the statements of every transaction begun while handling a request at
+    DB_STATEMENT_TIMEOUT_MS. SET LOCAL ends with the transaction, so migrations, CLI
+    commands and background jobs, which may legitimately run long, are left unlimited.
+    """
+    if not has_request_context() or connection.dialect.name != "postgresql":
+        return
+    timeout = current_app.config["DB_STATEMENT_TIMEOUT_MS"]
+    if timeout:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
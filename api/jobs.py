@@ -0,0 +1,76 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, UTC
+from uuid import uuid4
+from flask import current_app
+from api.extensions import db
+from api.models.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+
+def submit_job(kind, target, *args):
+    """
+    Records a pending job and runs `target(*args)` on the app's job pool.
+    The job row holds the status and the JSON result, so any worker can answer
+    GET /jobs/<job_id>. Returns the job id.
+    """
+    app = current_app._get_current_object()
+    job = Job(uuid4().hex, kind)
+    db.session.add(job)
+    db.session.commit()
+
+    job_id = job.job_id
+    _executor(app).submit(_run_job, app, job_id, target, args)
+    return job_id
+
+
+def get_job(job_id):
+    return db.session.get(Job, job_id)
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _executor(app):
+    executor = app.extensions.get('jobs')
+    if executor is None:
+        # An executor starts no threads until its first submit, so one losing a race is harmless
+        executor = app.extensions.setdefault(
+            'jobs',
+            ThreadPoolExecutor(max_workers=app.config["JOB_WORKERS"], thread_name_prefix="job"),
+        )
+    return executor
+
+
+def _run_job(app, job_id, target, args):
+    """
+    Runs a job and records its outcome. Any failure, including committing the
+    running status or the result, marks the job failed, so it is never left running.
+    """
+    with app.app_context():
+        try:
+            job = db.session.get(Job, job_id)
+            job.status = 'running'
+            db.session.commit()
+
+            result = target(*args)
+
+            job.status, job.result = 'finished', result
+            job.finished_at = datetime.now(UTC)
+            db.session.commit()
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            db.session.rollback()
+            _mark_failed(job_id, e)
+        finally:
+            db.session.remove()
+
+
+def _mark_failed(job_id, error):
+    try:
+        job = db.session.get(Job, job_id)
+        job.status, job.error, job.finished_at = 'failed', str(error), datetime.now(UTC)
+        db.session.commit()
+    except Exception:
+        logger.exception("Could not record the failure of job %s", job_id)
+        db.session.rollback()
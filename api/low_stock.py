@@ -0,0 +1,63 @@
+from itertools import chain, product
+from sqlalchemy import delete, event, inspect, insert, or_, select, tuple_
+from sqlalchemy.orm import Session
+from api.models.branchstockcount import BranchStockCount
+from api.models.inventoryitems import InventoryItem
+from api.models.low_stock_alerts import LowStockAlert
+
+
+def refresh_low_stock(connection, keys=(), item_ids=()):
+    """
+    Rebuilds the low_stock_alerts rows of the (branch_id, item_id) `keys` and of every
+    branch of `item_ids` in the transaction of `connection`, so the alert set always
+    matches the stock counts it was derived from.
+    """
+    keys, item_ids = list(keys), list(item_ids)
+    if not keys and not item_ids:
+        return
+
+    def matches(columns):
+        conditions = []
+        if keys:
+            conditions.append(tuple_(columns.branch_id, columns.item_id).in_(keys))
+        if item_ids:
+            conditions.append(columns.item_id.in_(item_ids))
+        return or_(*conditions)
+
+    connection.execute(delete(LowStockAlert).where(matches(LowStockAlert)))
+    connection.execute(insert(LowStockAlert).from_select(
+        ['branch_id', 'item_id', 'in_stock', 'stock_warning_level', 'shortfall'],
+        select(
+            BranchStockCount.branch_id,
+            BranchStockCount.item_id,
+            BranchStockCount.in_stock,
+            InventoryItem.stock_warning_level,
+            InventoryItem.stock_warning_level - BranchStockCount.in_stock,
+        )
+        .join(InventoryItem, InventoryItem.item_id == BranchStockCount.item_id)
+        .where(matches(BranchStockCount), BranchStockCount.in_stock <= InventoryItem.stock_warning_level)
+    ))
+
+################################################################
+#                    SESSION EVENTS                            #
+################################################################
+@event.listens_for(Session, "after_flush")
+def _refresh_flushed_stock(session, flush_context):
+    """
+    Refreshes the alerts of every stock count written by a unit-of-work flush and of
+    every item whose warning level changed. Statements that bypass the flush, such as
+    the stock adjustments, call refresh_low_stock themselves.
+    """
+    keys, item_ids = set(), set()
+    for instance in chain(session.new, session.deleted, session.dirty):
+        state = inspect(instance)
+        if isinstance(instance, BranchStockCount):
+            # Include the old key when a stock count is moved to another branch or item
+            branch_ids = {instance.branch_id, *state.attrs.branch_id.history.deleted}
+            stock_item_ids = {instance.item_id, *state.attrs.item_id.history.deleted}
+            keys.update(product(branch_ids, stock_item_ids))
+        elif isinstance(instance, InventoryItem) and instance not in session.new:
+            if instance in session.deleted or state.attrs.stock_warning_level.history.has_changes():
+                item_ids.add(instance.item_id)
+
+    refresh_low_stock(session.connection(), keys, item_ids)
@@ -0,0 +1,411 @@
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from flask import current_app, g, request
+from sqlalchemy import event
+from api.cache import TTLCache
+from api.extensions import db
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CHECKOUT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# Every exported metric with its type, help text and, for histograms, its buckets
+METRICS = {
+    'http_requests_total': ('counter', "Requests handled, by endpoint, method and status."),
+    'http_request_duration_seconds': ('histogram', "Time spent handling requests, by endpoint.", REQUEST_BUCKETS),
+    'http_requests_in_flight': ('gauge', "Requests being handled right now."),
+    'db_pool_checkout_wait_seconds': ('histogram', "Time spent waiting for a database connection from the pool.", CHECKOUT_BUCKETS),
+    'db_pool_connections': ('gauge', "Database connections of the pool, by state."),
+    'cache_hits_total': ('counter', "Cache lookups that found a fresh entry, by cache and namespace."),
+    'cache_misses_total': ('counter', "Cache lookups that found no fresh entry, by cache and namespace."),
+    'cache_evictions_total': ('counter', "Entries evicted to keep a cache under its size limit."),
+    'cache_entries': ('gauge', "Entries held by a cache."),
+    'cache_hit_ratio': ('gauge', "Share of cache lookups that were hits since the workers started."),
+    'request_log_queue_depth': ('gauge', "Request log entries waiting to be shipped."),
+    'request_log_entries_total': ('counter', "Request log entries, by outcome."),
+}
+
+# File of METRICS_DIR holding the summed counters of every worker that has exited
+ARCHIVE_FILE = "archive.json"
+
+# Caches kept in app.extensions whose stats are exported
+CACHES = {'cache': "read", 'verified_tokens': "tokens", 'catalog': "catalog"}
+
+
+class Metrics:
+    """
+    Per-process request metrics. Every thread counts into its own shard, so recording
+    takes no lock; a scrape adds the shards up. The shards of exited threads are folded
+    into one retired shard, so a server starting a thread per request doesn't keep one
+    shard per request it ever served. With METRICS_DIR set, every worker
+    also writes its totals there, at most every METRICS_FLUSH_INTERVAL seconds, and a
+    scrape of any worker merges the totals of them all. The files of exited workers
+    are folded into one archive file, so the directory holds one file per live worker.
+    """
+    def __init__(self, directory=None, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+        self._retired = _new_shard()
+        self._pid = os.getpid()
+        self._flushed = 0.0
+        self._token = None
+        self._checked_token = None
+
+    def inc(self, name, labels, value=1.0):
+        self._shard()['counters'][(name, _label_key(labels))] += value
+
+    def set_in_flight(self, delta):
+        self._shard()['gauges'][('http_requests_in_flight', ())] += delta
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        histograms = self._shard()['histograms']
+        key = (name, _label_key(labels))
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+        histogram[bisect_left(buckets, value)] += 1
+        histogram[-2] += value
+        histogram[-1] += 1
+
+    def snapshot(self, collected=()):
+        """Returns the totals of this process, with the scrape-time `collected` samples added"""
+        totals = _new_shard()
+        with self._lock:
+            self._retire_exited_threads()
+            for shard in [self._retired, *(shard for _, shard in self._shards)]:
+                _add_shard(totals, shard)
+        counters, gauges, histograms = totals['counters'], totals['gauges'], totals['histograms']
+
+        for kind, name, labels, value in collected:
+            (counters if kind == 'counter' else gauges)[(name, _label_key(labels))] += value
+
+        return {'pid': os.getpid(), 'token': self._process_token(), **_dump_shard(totals)}
+
+    def maybe_flush(self):
+        """Writes this worker's totals to METRICS_DIR when the flush interval has passed"""
+        if self.directory and time.monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes this worker's totals, including its cache and request log counters read
+        from the app, so every file holds the full set of series of its worker.
+        """
+        self._flushed = time.monotonic()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        snapshot = self.snapshot(_collect())
+
+        if self._checked_token != snapshot['token']:
+            # The file left by an exited worker that had the same pid is archived, not overwritten
+            existing = _read_snapshot(path)
+            if existing is not None and existing.get('token') != snapshot['token']:
+                self._archive(path)
+            self._checked_token = snapshot['token']
+
+        _write_snapshot(path, snapshot)
+
+    def snapshots(self):
+        """
+        Returns the totals of every worker. Counters of workers that have exited are
+        moved to the archive file, so totals never go backwards; their gauges are dropped.
+        """
+        if not self.directory:
+            return [self.snapshot(_collect())]
+
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            snapshot = _read_snapshot(path)
+            if snapshot is None:
+                continue
+            if _is_running(snapshot['pid']):
+                snapshots.append(snapshot)
+            else:
+                self._archive(path)
+
+        archived = _read_snapshot(os.path.join(self.directory, ARCHIVE_FILE))
+        if archived is not None:
+            snapshots.append(archived)
+        return snapshots
+
+    def _archive(self, path):
+        """Adds the counters and histograms of the worker file at `path` to the archive file and removes it"""
+        # Renaming claims the file, so two workers scraping at once don't both archive it
+        claimed = f"{path}.{os.getpid()}.archiving"
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return
+
+        archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+        with _locked(f"{archive_path}.lock"):
+            total = _new_shard()
+            for snapshot in (_read_snapshot(archive_path), _read_snapshot(claimed)):
+                if snapshot is not None:
+                    _add_shard(total, _load_shard({**snapshot, 'gauges': []}))
+            _write_snapshot(archive_path, {'pid': None, **_dump_shard(total)})
+        os.remove(claimed)
+
+    def _process_token(self):
+        """Returns a token telling this process apart from an earlier one with the same pid"""
+        if self._token is None or self._token[0] != os.getpid():
+            self._token = (os.getpid(), uuid.uuid4().hex)
+        return self._token[1]
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None or self._pid != os.getpid():
+            shard = _new_shard()
+            with self._lock:
+                if self._pid != os.getpid():
+                    # Counts inherited from the parent process belong to the parent
+                    self._pid, self._shards, self._retired = os.getpid(), [], _new_shard()
+                self._retire_exited_threads()
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+        return shard
+
+    def _retire_exited_threads(self):
+        """Folds the shards of threads that have exited, and so stopped writing, into the retired shard"""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                _add_shard(self._retired, shard)
+        self._shards = live
+
+
+def init_metrics(app):
+    """
+    Records request counts, latencies and in-flight requests, and the time spent
+    waiting on the connection pool, into the app's Metrics.
+    """
+    metrics = app.extensions['metrics'] = Metrics(app.config["METRICS_DIR"], app.config["METRICS_FLUSH_INTERVAL"])
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _time_checkouts(engine.pool, metrics)
+            # Disposing an engine, as a forked worker does, replaces its pool
+            event.listen(engine, "engine_disposed", lambda engine: _time_checkouts(engine.pool, metrics))
+
+    @app.before_request
+    def _start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        metrics.set_in_flight(1)
+
+    @app.after_request
+    def _keep_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _record_request_metrics(exception=None):
+        if 'metrics_started' not in g:
+            return
+        metrics.set_in_flight(-1)
+        endpoint = request.endpoint or "unmatched"
+        labels = {'blueprint': request.blueprint or "", 'endpoint': endpoint}
+        metrics.inc('http_requests_total', {**labels, 'method': request.method, 'status': str(g.get('metrics_status', 500))})
+        metrics.observe('http_request_duration_seconds', labels, time.perf_counter() - g.metrics_started)
+        metrics.maybe_flush()
+
+
+def render_metrics():
+    """Returns every worker's metrics, summed, in the Prometheus text exposition format"""
+    metrics = current_app.extensions['metrics']
+    snapshots = metrics.snapshots()
+
+    merged = {'counter': defaultdict(float), 'gauge': defaultdict(float), 'histogram': {}}
+    for snapshot in snapshots:
+        for kind, samples in (('counter', snapshot['counters']), ('gauge', snapshot['gauges'])):
+            for name, labels, value in samples:
+                merged[kind][(name, tuple(map(tuple, labels)))] += value
+        for name, labels, values in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = merged['histogram'].setdefault(key, [0] * len(values))
+            merged['histogram'][key] = [a + b for a, b in zip(total, values)]
+
+    # Ratios are derived from the merged counters, since ratios of workers can't be added
+    lookups = defaultdict(lambda: [0.0, 0.0])
+    for (name, labels), value in merged['counter'].items():
+        if name in ('cache_hits_total', 'cache_misses_total'):
+            cache_label = dict(labels)['cache']
+            lookups[cache_label][name == 'cache_misses_total'] += value
+    for cache_label, (hits, misses) in lookups.items():
+        merged['gauge'][('cache_hit_ratio', (('cache', cache_label),))] = hits / (hits + misses) if hits + misses else 0.0
+
+    lines = []
+    for name, (kind, help_text, *buckets) in METRICS.items():
+        samples = sorted((labels, value) for (sample_name, labels), value in merged[kind].items() if sample_name == name)
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            if kind != 'histogram':
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets[0], float("inf")), value):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+
+    return "\n".join(lines) + "\n"
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _collect():
+    """Reads the scrape-time samples of this worker: pool state, cache stats and the log queue"""
+    samples = []
+    for engine in db.engines.values():
+        pool = engine.pool
+        if hasattr(pool, 'checkedout') and hasattr(pool, 'checkedin'):
+            samples.append(('gauge', 'db_pool_connections', {'state': "checked_out"}, pool.checkedout()))
+            samples.append(('gauge', 'db_pool_connections', {'state': "idle"}, pool.checkedin()))
+
+    for extension, cache_label in CACHES.items():
+        store = current_app.extensions.get(extension)
+        if not isinstance(store, TTLCache):
+            continue
+        stats = store.stats()
+        samples.append(('counter', 'cache_evictions_total', {'cache': cache_label}, stats['evictions']))
+        samples.append(('gauge', 'cache_entries', {'cache': cache_label}, stats['size']))
+        for namespace, counts in stats['namespaces'].items():
+            samples.append(('counter', 'cache_hits_total', {'cache': cache_label, 'namespace': str(namespace)}, counts['hits']))
+            samples.append(('counter', 'cache_misses_total', {'cache': cache_label, 'namespace': str(namespace)}, counts['misses']))
+
+    shipper = current_app.extensions.get('request_log')
+    if shipper is not None:
+        samples.append(('gauge', 'request_log_queue_depth', {}, shipper.queue.qsize()))
+        for outcome in ('shipped', 'spooled', 'dropped'):
+            samples.append(('counter', 'request_log_entries_total', {'outcome': outcome}, getattr(shipper, outcome)))
+
+    return samples
+
+
+def _new_shard():
+    return {'counters': defaultdict(float), 'gauges': defaultdict(float), 'histograms': {}}
+
+
+def _load_shard(snapshot):
+    """Turns the sample lists of a snapshot back into a shard"""
+    shard = _new_shard()
+    for kind in ('counters', 'gauges'):
+        for name, labels, value in snapshot[kind]:
+            shard[kind][(name, tuple(map(tuple, labels)))] += value
+    for name, labels, values in snapshot['histograms']:
+        shard['histograms'][(name, tuple(map(tuple, labels)))] = values
+    return shard
+
+
+def _dump_shard(shard):
+    """Turns a shard into the sample lists of a snapshot"""
+    return {
+        'counters': [[name, list(labels), value] for (name, labels), value in shard['counters'].items()],
+        'gauges': [[name, list(labels), value] for (name, labels), value in shard['gauges'].items()],
+        'histograms': [[name, list(labels), values] for (name, labels), values in shard['histograms'].items()],
+    }
+
+
+def _read_snapshot(path):
+    """Returns the snapshot stored at `path`, or None when it is missing or half written"""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path, snapshot):
+    with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+        json.dump(snapshot, file)
+    os.replace(f"{path}.tmp", path)
+
+
+@contextmanager
+def _locked(path):
+    """Holds an exclusive lock on the file at `path`, across processes where the platform supports it"""
+    with open(path, "a") as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        yield
+
+
+def _add_shard(total, shard):
+    """Adds the counts of `shard` to `total`"""
+    for key, value in list(shard['counters'].items()):
+        total['counters'][key] += value
+    for key, value in list(shard['gauges'].items()):
+        total['gauges'][key] += value
+    for key, values in list(shard['histograms'].items()):
+        current = total['histograms'].get(key)
+        total['histograms'][key] = list(values) if current is None else [a + b for a, b in zip(current, values)]
+
+
+def _time_checkouts(pool, metrics):
+    """
+    Times every checkout of `pool`. The pool has no event before a checkout starts
+    waiting, so its internal _do_get, which blocks while the pool is exhausted, is wrapped.
+    """
+    do_get = pool._do_get
+
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            metrics.observe('db_pool_checkout_wait_seconds', {}, time.perf_counter() - started)
+
+    pool._do_get = timed_do_get
+
+
+def _is_running(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        key + '="' + str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for key, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
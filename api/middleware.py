@@ -1,22 +1,22 @@
-from flask import request, jsonify
+from functools import wraps
+from flask import request, jsonify, make_response, current_app, g
 from api.services.auth_service import AuthService
+from api.versioning import get_versions
+from api.request_log import get_log_shipper
 from datetime import datetime, UTC
-from marshmallow import ValidationError
 from api.config import Config
 
 def jwt_required(f):
     """
     A decorator to require JWT verification for specific routes.
     """
+    @wraps(f)
     def wrapper(*args, **kwargs):
-        token = request.headers.get('Authorization')
-
-        if not token:
+        if not request.headers.get('Authorization'):
             return jsonify({'error': 'Token is missing'}), 401
 
         try:
-            token = token.split(" ")[1]
-            payload = AuthService.decode_access_token(token)
+            payload = get_token_claims()
             if payload is None:
                 return jsonify({'error': 'Invalid or expired token'}), 401
 
@@ -28,26 +28,50 @@ def jwt_required(f):
     
     return wrapper
 
-def log_request():
+def conditional_get(*tables):
+    """
+    A decorator to answer GET requests with a strong ETag built from the versions
+    of the tables the response is read from. A request whose If-None-Match matches
+    gets a 304 without the view running.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            etag = "v" + "-".join(str(version) for version in get_versions(tables))
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+
+        return wrapper
+    return decorator
+
+def log_request(response):
     """
     A middleware to log request contexts for each endpoint to a NoSQL database.
+    Entries are handed to the background log shipper, so the request never waits
+    on log I/O and a logging failure never fails the request.
     """
     try:
         timestamp = datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S')
 
         if (method := request.method) == "GET":
-            return
+            return response
+
+        shipper = get_log_shipper()
+        if shipper is None:
+            return response
         
         endpoint = request.endpoint
 
-        auth_header = request.headers.get("Authorization", "")
-        token = auth_header.split("Bearer ")[1] if "Bearer" in auth_header else None
-        username = None
-
-        if token:
-            payload = AuthService.decode_access_token(token)
-            if payload:
-                username = payload.get("identity")
+        payload = get_token_claims()
+        username = payload.get("username") if payload else None
 
         raw_payload = request.get_json(silent=True) or {}
         sanitized_payload = redact_pii(raw_payload)
@@ -60,17 +84,31 @@ def log_request():
             'query_params': request.args.to_dict(),
             'path_params': request.view_args or {},
             'payload': sanitized_payload or {},
-            'username': username
+            'username': username,
+            'status_code': response.status_code
         }
 
-    except ValidationError as e:
-        return jsonify({"error": str(e)}), 422
+        shipper.submit(log_entry)
+
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        current_app.logger.warning(f"Failed to log request: {e}")
+
+    return response
     
 ################################################################
 #                    HELPER FUNCTIONS                          #
 ################################################################
+def get_token_claims():
+    """
+    Returns the verified claims of the request's bearer token, or None when it is
+    missing or invalid. The token is verified at most once per request and the
+    claims are kept on flask.g for the middleware, logging and routes.
+    """
+    if 'jwt_claims' not in g:
+        parts = request.headers.get('Authorization', '').split(" ")
+        g.jwt_claims = AuthService.decode_access_token(parts[1]) if len(parts) > 1 and parts[1] else None
+    return g.jwt_claims
+
 def redact_pii(data):
     """
     Recursively removes PII from request data.
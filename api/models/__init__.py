@@ -8,4 +8,7 @@ from .recipes import Recipe
 from .inventoryitems import InventoryItem
 from .outlets import Outlet
 from .product_tags import ProductTag
-from .branchstockcount import BranchStockCount
\ No newline at end of file
+from .branchstockcount import BranchStockCount
+from .table_versions import TableVersion
+from .low_stock_alerts import LowStockAlert
+from .jobs import Job
\ No newline at end of file
@@ -11,7 +11,7 @@ class Branch(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.now(UTC), onupdate=datetime.now(UTC))
     deleted_at = db.Column(db.DateTime)
 
-    branchstockcounts = db.relationship('BranchStockCount', back_populates='branch', cascade='all, delete-orphan') 
+    branchstockcounts = db.relationship('BranchStockCount', back_populates='branch', cascade='all, delete-orphan', passive_deletes=True) 
 
     def __init__(self, name, address):
         self.name = name
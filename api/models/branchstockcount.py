@@ -4,8 +4,8 @@ from api.extensions import db
 class BranchStockCount(db.Model):
     __tablename__ = 'branchstockcount'
 
-    branch_id = db.Column(db.Integer, db.ForeignKey('branches.branch_id'), primary_key=True)
-    item_id = db.Column(db.Integer, db.ForeignKey('inventoryitems.item_id'), primary_key=True)
+    branch_id = db.Column(db.Integer, db.ForeignKey('branches.branch_id', ondelete='CASCADE'), primary_key=True)
+    item_id = db.Column(db.Integer, db.ForeignKey('inventoryitems.item_id', ondelete='CASCADE'), primary_key=True, index=True)
     in_stock = db.Column(db.Float, nullable=False)
     ordered_qty = db.Column(db.Float, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.now(UTC))
@@ -9,13 +9,13 @@ class InventoryItem(db.Model):
     cost = db.Column(db.Float, nullable=False)
     unit = db.Column(db.String, nullable=False)
     stock_warning_level = db.Column(db.Float, nullable=False)
-    supplier_id = db.Column(db.Integer, nullable=False)
+    supplier_id = db.Column(db.Integer, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.now(UTC))
     updated_at = db.Column(db.DateTime, default=datetime.now(UTC), onupdate=datetime.now(UTC))
     deleted_at = db.Column(db.DateTime)
 
-    branchstockcounts = db.relationship('BranchStockCount', back_populates='item', cascade='all, delete-orphan')
-    recipes = db.relationship('Recipe', back_populates='item', cascade='all, delete-orphan')
+    branchstockcounts = db.relationship('BranchStockCount', back_populates='item', cascade='all, delete-orphan', passive_deletes=True)
+    recipes = db.relationship('Recipe', back_populates='item', cascade='all, delete-orphan', passive_deletes=True)
 
     def __init__(self, name, cost, unit, stock_warning_level, supplier_id):
         self.name = name
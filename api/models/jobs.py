@@ -0,0 +1,21 @@
+from datetime import datetime, UTC
+from api.extensions import db
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+
+    job_id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String, nullable=False)
+    status = db.Column(db.String, nullable=False, default='pending')
+    result = db.Column(db.JSON)
+    error = db.Column(db.String)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(UTC))
+    finished_at = db.Column(db.DateTime)
+
+    def __init__(self, job_id, kind):
+        self.job_id = job_id
+        self.kind = kind
+        self.status = 'pending'
+
+    def __repr__(self):
+        return f'<Job {self.job_id}: {self.kind} {self.status}>'
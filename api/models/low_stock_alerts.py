@@ -0,0 +1,20 @@
+from api.extensions import db
+
+class LowStockAlert(db.Model):
+    __tablename__ = 'low_stock_alerts'
+
+    branch_id = db.Column(db.Integer, db.ForeignKey('branches.branch_id', ondelete='CASCADE'), primary_key=True)
+    item_id = db.Column(db.Integer, db.ForeignKey('inventoryitems.item_id', ondelete='CASCADE'), primary_key=True, index=True)
+    in_stock = db.Column(db.Float, nullable=False)
+    stock_warning_level = db.Column(db.Float, nullable=False)
+    shortfall = db.Column(db.Float, nullable=False, index=True)
+
+    def __init__(self, branch_id, item_id, in_stock, stock_warning_level, shortfall):
+        self.branch_id = branch_id
+        self.item_id = item_id
+        self.in_stock = in_stock
+        self.stock_warning_level = stock_warning_level
+        self.shortfall = shortfall
+
+    def __repr__(self):
+        return f'<LowStockAlert {self.branch_id}/{self.item_id}: {self.shortfall}>'
@@ -5,13 +5,15 @@ class Outlet(db.Model):
     __tablename__ = 'outlets'
 
     outlet_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    product_id = db.Column(db.Integer, db.ForeignKey('products.product_id'))
+    product_id = db.Column(db.Integer, db.ForeignKey('products.product_id'), index=True)
     name = db.Column(db.String, nullable=False)
     price = db.Column(db.Float, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.now(UTC))
     updated_at = db.Column(db.DateTime, default=datetime.now(UTC), onupdate=datetime.now(UTC))
     deleted_at = db.Column(db.DateTime)
 
+    product = db.relationship('Product', back_populates='outlets')
+
     def __init__(self, product_id, name, price):
         self.product_id = product_id
         self.name = name
@@ -8,13 +8,14 @@ class Product(db.Model):
     name = db.Column(db.String, nullable=False)
     variant_group_id = db.Column(db.String)
     sku = db.Column(db.String, nullable=False, unique=True)
-    category_id = db.Column(db.Integer, nullable=False)
+    category_id = db.Column(db.Integer, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.now(UTC))
     updated_at = db.Column(db.DateTime, default=datetime.now(UTC), onupdate=datetime.now(UTC))
     deleted_at = db.Column(db.DateTime)
 
-    tags = db.relationship('ProductTag', back_populates='product', cascade='all, delete-orphan')
-    recipes = db.relationship('Recipe', back_populates='product', cascade='all, delete-orphan')
+    tags = db.relationship('ProductTag', back_populates='product', cascade='all, delete-orphan', passive_deletes=True)
+    recipes = db.relationship('Recipe', back_populates='product', cascade='all, delete-orphan', passive_deletes=True)
+    outlets = db.relationship('Outlet', back_populates='product')
 
     def __init__(self, name, variant_group_id, sku, category_id):
         self.name = name
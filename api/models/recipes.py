@@ -4,8 +4,8 @@ from api.extensions import db
 class Recipe(db.Model):
     __tablename__ = 'recipes'
 
-    product_id = db.Column(db.Integer, db.ForeignKey('products.product_id'), primary_key=True)
-    item_id = db.Column(db.Integer, db.ForeignKey('inventoryitems.item_id'), primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.product_id', ondelete='CASCADE'), primary_key=True)
+    item_id = db.Column(db.Integer, db.ForeignKey('inventoryitems.item_id', ondelete='CASCADE'), primary_key=True, index=True)
     quantity = db.Column(db.Float, nullable=False)
     isTakeout = db.Column(db.Boolean, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.now(UTC))
@@ -0,0 +1,14 @@
+from api.extensions import db
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+
+    table_name = db.Column(db.String, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __init__(self, table_name, version=0):
+        self.table_name = table_name
+        self.version = version
+
+    def __repr__(self):
+        return f'<TableVersion {self.table_name}: {self.version}>'
@@ -10,7 +10,7 @@ class Tag(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.now(UTC), onupdate=datetime.now(UTC))
     deleted_at = db.Column(db.DateTime)
 
-    products = db.relationship('ProductTag', back_populates='tag', cascade='all, delete-orphan')
+    products = db.relationship('ProductTag', back_populates='tag', cascade='all, delete-orphan', passive_deletes=True)
 
     def __init__(self, name):
         self.name = name
@@ -0,0 +1,112 @@
+import base64
+import json
+from urllib.parse import urlencode
+from flask import request, jsonify, current_app
+from sqlalchemy import and_, or_
+
+
+def get_page_args():
+    """
+    Reads the `limit` and `after` query parameters of a list request.
+    Raises ValueError when either of them is malformed.
+    """
+    limit = request.args.get('limit')
+    max_limit = current_app.config["PAGINATION_MAX_LIMIT"]
+
+    if limit is None:
+        limit = current_app.config["PAGINATION_DEFAULT_LIMIT"]
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if limit < 1 or limit > max_limit:
+            raise ValueError(f"limit must be between 1 and {max_limit}")
+
+    return limit, request.args.get('after') or None
+
+
+def get_include_args(allowed):
+    """
+    Reads the comma-separated `include` query parameter of a read request.
+    Raises ValueError when it names a relation outside `allowed`.
+    """
+    includes = {name.strip() for name in request.args.get('include', '').split(',') if name.strip()}
+    unknown = includes - set(allowed)
+    if unknown:
+        raise ValueError(f"include must be one of: {', '.join(allowed)}")
+    return includes
+
+
+def keyset_paginate(query, key_columns, limit, after=None):
+    """
+    Returns one page of `query` ordered by `key_columns` and the cursor of the next page.
+    Rows are located with a seek predicate on the key so the database never scans
+    the rows of previous pages the way OFFSET does.
+    """
+    if after is not None:
+        values = decode_cursor(after, len(key_columns))
+        query = query.filter(_after_clause(key_columns, values))
+
+    rows = query.order_by(*key_columns).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in key_columns])
+
+    return rows, next_cursor
+
+
+def paginated_response(data, next_cursor):
+    """
+    Wraps a serialized page in a JSON response carrying the next-page cursor
+    in the `X-Next-Cursor` and `Link` headers.
+    """
+    response = jsonify(data)
+
+    if next_cursor:
+        args = request.args.to_dict()
+        args['after'] = next_cursor
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+
+    return response
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def encode_cursor(values):
+    """
+    Encodes the key values of the last row of a page into an opaque token.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, size):
+    """
+    Decodes a token produced by encode_cursor back into `size` key values.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except ValueError:
+        raise ValueError("after must be a valid cursor")
+
+    if not isinstance(values, list) or len(values) != size or not all(type(value) is int for value in values):
+        raise ValueError("after must be a valid cursor")
+
+    return values
+
+
+def _after_clause(key_columns, values):
+    """
+    Expands the row comparison (k1, k2, ...) > (v1, v2, ...) into
+    k1 > v1 OR (k1 = v1 AND k2 > v2) OR ... so it works on every backend.
+    """
+    clauses = []
+    for index, column in enumerate(key_columns):
+        equals = [key_columns[i] == values[i] for i in range(index)]
+        clauses.append(and_(*equals, column > values[index]))
+
+    return or_(*clauses)
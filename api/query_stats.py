@@ -0,0 +1,68 @@
+import logging
+import time
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from api.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+def init_query_stats(app):
+    """
+    Counts the SQL statements of every request and the time spent running them.
+    Responses report both in the X-DB-Queries and Server-Timing headers when
+    QUERY_STATS_HEADERS is set, and statements slower than SLOW_QUERY_MS are logged
+    with the endpoint that ran them.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _start_statement)
+            event.listen(engine, "after_cursor_execute", _end_statement)
+            event.listen(engine, "handle_error", _fail_statement)
+
+    app.before_request(_start_request)
+    app.after_request(_add_timing_headers)
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _start_statement(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault('statement_started', []).append(time.perf_counter())
+
+
+def _end_statement(connection, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - connection.info['statement_started'].pop()
+
+    if has_request_context() and 'db_queries' in g:
+        g.db_queries += 1
+        g.db_time += elapsed
+
+    threshold = current_app.config["SLOW_QUERY_MS"] if has_app_context() else 0
+    if threshold and elapsed * 1000 >= threshold:
+        endpoint = request.endpoint if has_request_context() else None
+        logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, endpoint or "no request", statement[:1000])
+
+
+def _fail_statement(exception_context):
+    """Drops the start time of a statement that raised, which never reaches after_cursor_execute"""
+    started = exception_context.connection.info.get('statement_started') if exception_context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.db_queries = 0
+    g.db_time = 0.0
+
+
+def _add_timing_headers(response):
+    if not current_app.config["QUERY_STATS_HEADERS"] or 'request_started' not in g:
+        return response
+
+    elapsed = time.perf_counter() - g.request_started
+    response.headers['X-DB-Queries'] = str(g.db_queries)
+    response.headers['Server-Timing'] = (
+        f'db;dur={g.db_time * 1000:.2f};desc="{g.db_queries} queries", app;dur={elapsed * 1000:.2f}'
+    )
+    return response
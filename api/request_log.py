@@ -0,0 +1,261 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from flask import current_app
+from pymongo import MongoClient
+
+logger = logging.getLogger(__name__)
+
+
+class MongoSink:
+    """
+    Writes log entries to the NoSQL collection configured by NOSQLDB_URI.
+    """
+    def __init__(self, uri, db_name, collection_name, timeout_ms):
+        client = MongoClient(uri, serverSelectionTimeoutMS=timeout_ms, connect=False)
+        self.collection = client[db_name][collection_name]
+
+    def insert_many(self, entries):
+        # insert_many adds an _id to every document, so hand it copies
+        self.collection.insert_many([dict(entry) for entry in entries], ordered=False)
+
+
+class JsonlSink:
+    """
+    Appends log entries to a local JSON Lines file.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def insert_many(self, entries):
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(json.dumps(entry, default=str) + "\n" for entry in entries)
+
+
+class LogShipper:
+    """
+    Ships request log entries to a sink from a background thread.
+    Requests only enqueue entries and never wait: when the queue is full the entry
+    is dropped and counted. Entries are written in batches with insert_many, and a
+    batch the sink rejects is spooled to a local file and replayed once the sink
+    accepts writes again.
+    """
+    def __init__(self, sink, spool_path, queue_size, batch_size, flush_interval):
+        self.sink = sink
+        self.spool_path = spool_path
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.shipped = 0
+        self.spooled = 0
+        self.dropped = 0
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def submit(self, entry):
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout=5.0):
+        """
+        Waits until every submitted entry has been shipped or spooled.
+        """
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self.queue.unfinished_tasks
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _ensure_started(self):
+        """
+        Starts the shipping thread in the current process, including after a fork.
+        """
+        if self._pid == os.getpid() and not self._thread_died():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid() and not self._thread_died():
+                return
+            if self._pid != os.getpid():
+                self._stopping.clear()
+                atexit.register(self.stop)
+            else:
+                logger.error("Request log shipping thread died, restarting it")
+            self._thread = threading.Thread(target=self._run, name="request-log-shipper", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _thread_died(self):
+        return self._thread is not None and not self._thread.is_alive() and not self._stopping.is_set()
+
+    def _run(self):
+        while not (self._stopping.is_set() and self.queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._ship(batch)
+            except Exception:
+                logger.exception("Could not ship %d request log entries", len(batch))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def _next_batch(self):
+        """
+        Collects up to batch_size entries, waiting at most flush_interval seconds.
+        """
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _ship(self, batch):
+        try:
+            self.sink.insert_many(batch)
+        except Exception as e:
+            logger.warning("Request log sink unavailable, spooling %d entries: %s", len(batch), e)
+            if self._spool(batch):
+                self.spooled += len(batch)
+            else:
+                self.dropped += len(batch)
+            return
+
+        self.shipped += len(batch)
+        self._replay_spool()
+
+    def _spool(self, entries):
+        """
+        Appends entries to this worker's spool file. Returns False when the file can't
+        be written, and the entries are lost.
+        """
+        try:
+            with open(f"{self.spool_path}.{os.getpid()}", "a", encoding="utf-8") as file:
+                file.writelines(json.dumps(entry, default=str) + "\n" for entry in entries)
+        except OSError:
+            logger.exception("Could not spool %d request log entries", len(entries))
+            return False
+        return True
+
+    def _replay_spool(self):
+        """
+        Re-sends spooled entries. A spool file is replayed by this worker's thread, which
+        wrote it, or once the worker that wrote it has exited, so a file is never read
+        while another worker is still appending to it. A file is claimed by renaming it,
+        so two workers never replay the same one; a claimed file left behind by a
+        failed or interrupted replay is picked up again once its claimer has exited.
+        """
+        for path in glob.glob(f"{self.spool_path}.*"):
+            match = re.fullmatch(r"\.(\d+)(?:\.(\d+)\.replay)?", path[len(self.spool_path):])
+            if match is None:
+                continue
+            owner = int(match.group(2) or match.group(1))
+            if owner != os.getpid() and _is_running(owner):
+                continue
+
+            claimed = f"{self.spool_path}.{match.group(1)}.{os.getpid()}.replay"
+            try:
+                os.replace(path, claimed)
+            except OSError:
+                continue
+
+            try:
+                entries = self._read_spool(claimed)
+            except OSError:
+                # Left claimed by this worker, so its next replay tries again
+                logger.exception("Could not read request log spool %s", claimed)
+                continue
+
+            for start in range(0, len(entries), self.batch_size):
+                batch = entries[start:start + self.batch_size]
+                try:
+                    self.sink.insert_many(batch)
+                except Exception:
+                    # Keep the claimed file when the rest can't be spooled again; it is retried later
+                    if self._spool(entries[start:]):
+                        self._remove(claimed)
+                    return
+                self.shipped += len(batch)
+
+            self._remove(claimed)
+
+    def _read_spool(self, path):
+        """Reads the entries of a spool file, skipping lines that aren't valid JSON"""
+        entries = []
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    logger.warning("Skipping corrupt line %d of request log spool %s", number, path)
+        return entries
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            logger.exception("Could not remove request log spool %s", path)
+
+
+def get_log_shipper():
+    """
+    Returns the log shipper of the current app, creating it on first use.
+    Returns None when neither NOSQLDB_URI nor REQUEST_LOG_PATH is configured.
+    """
+    shipper = current_app.extensions.get('request_log')
+    if shipper is not None:
+        return shipper
+
+    config = current_app.config
+    if config["NOSQLDB_URI"]:
+        sink = MongoSink(config["NOSQLDB_URI"], config["NOSQLDB_NAME"], config["LOGGING_COLLECTION_NAME"], config["NOSQLDB_TIMEOUT_MS"])
+    elif config["REQUEST_LOG_PATH"]:
+        sink = JsonlSink(config["REQUEST_LOG_PATH"])
+    else:
+        return None
+
+    return current_app.extensions.setdefault('request_log', LogShipper(
+        sink,
+        config["REQUEST_LOG_SPOOL_PATH"],
+        config["REQUEST_LOG_QUEUE_SIZE"],
+        config["REQUEST_LOG_BATCH_SIZE"],
+        config["REQUEST_LOG_FLUSH_INTERVAL"],
+    ))
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -8,4 +8,12 @@ from .tag import *
 from .recipe import *
 from .inventoryitem import *
 from .outlet import *
-from .branchstockcount import *
\ No newline at end of file
+from .branchstockcount import *
+from .cache import *
+from .catalog import *
+from .sale import *
+from .product_cost import *
+from .job import *
+from .reorder import *
+from .csv_import import *
+from .metrics import *
\ No newline at end of file
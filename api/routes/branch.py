@@ -3,7 +3,8 @@ from flask_smorest import Blueprint
 from api.services.branch_service import BranchService
 from api.schemas.branches import BranchSchema
 from sqlalchemy.exc import IntegrityError
-from api.middleware import jwt_required
+from api.middleware import jwt_required, conditional_get
+from api.pagination import get_page_args, paginated_response
 
 branch_blueprint = Blueprint('branch', __name__, url_prefix="/branches")
 
@@ -37,6 +38,7 @@ def create_branch():
 
 @branch_blueprint.route('/<int:branch_id>', methods=['GET'])
 @jwt_required
+@conditional_get("branches")
 def get_branch(branch_id):
     branch = BranchService.get_branch_by_id(branch_id)
     if not branch:
@@ -48,10 +50,16 @@ def get_branch(branch_id):
 
 @branch_blueprint.route('/', methods=['GET'])
 @jwt_required
+@conditional_get("branches")
 def get_all_branch():
-    branches = BranchService.get_all_branches()
+    try:
+        limit, after = get_page_args()
+        branches, next_cursor = BranchService.get_all_branches(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     branch_schema = BranchSchema(many=True)
-    return jsonify(branch_schema.dump(branches)), 200
+    return paginated_response(branch_schema.dump(branches), next_cursor), 200
 
 
 @branch_blueprint.route('/<int:branch_id>', methods=['PUT'])
@@ -1,9 +1,13 @@
 from flask import request, jsonify
 from flask_smorest import Blueprint
 from api.services.branchstockcount_service import BranchStockCountService
-from api.schemas.branchstockcount import BranchStockCountSchema
+from api.schemas.branchstockcount import BranchStockCountSchema, StockAdjustmentSchema, BatchStockAdjustmentSchema, SnapshotCountSchema, SnapshotVarianceSchema, LowStockSchema
+from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
+from api.bulk import bulk_create, load_bulk_rows
 from api.middleware import jwt_required
+from api.pagination import get_page_args, paginated_response
+from api.streaming import export_response
 
 branch_stock_count_blueprint = Blueprint('branch_stock_count', __name__, url_prefix="/branchstockcounts")
 
@@ -32,6 +36,12 @@ def create_branch_stock_count():
     
     return jsonify({'message': f'Branch Stock Count for Branch {branch_stock_count.branch_id} and Item {branch_stock_count.item_id} created successfully'}), 201
 
+@branch_stock_count_blueprint.route('/bulk', methods=['POST'])
+@jwt_required
+def bulk_create_branch_stock_counts():
+    """Create many branch stock counts at once; with ?partial=true invalid rows are skipped and reported"""
+    return bulk_create(BranchStockCountSchema(), BranchStockCountService.bulk_create_branch_stock_counts)
+
 @branch_stock_count_blueprint.route('/<int:branch_id>/<int:item_id>', methods=['GET'])
 @jwt_required
 def get_branch_stock_count(branch_id, item_id):
@@ -44,9 +54,30 @@ def get_branch_stock_count(branch_id, item_id):
 @branch_stock_count_blueprint.route('/', methods=['GET'])
 @jwt_required
 def get_all_branch_stock_counts():
-    branch_stock_counts = BranchStockCountService.get_all_branch_stock_counts()
+    try:
+        limit, after = get_page_args()
+        branch_stock_counts, next_cursor = BranchStockCountService.get_all_branch_stock_counts(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     branch_stock_count_schema = BranchStockCountSchema(many=True)
-    return jsonify(branch_stock_count_schema.dump(branch_stock_counts)), 200
+    return paginated_response(branch_stock_count_schema.dump(branch_stock_counts), next_cursor), 200
+
+@branch_stock_count_blueprint.route('/low-stock', methods=['GET'])
+@jwt_required
+def get_low_stock_counts():
+    """Get every stock count at or below its warning level, optionally for one ?branch_id="""
+    branch_id = request.args.get('branch_id', type=int)
+    low_stock_counts = BranchStockCountService.get_low_stock_counts(branch_id)
+    low_stock_schema = LowStockSchema(many=True)
+    return jsonify(low_stock_schema.dump(low_stock_counts)), 200
+
+@branch_stock_count_blueprint.route('/export.<any(ndjson, csv):export_format>', methods=['GET'])
+@jwt_required
+def export_branch_stock_counts(export_format):
+    """Stream every branch stock count as NDJSON or CSV"""
+    branch_stock_counts = BranchStockCountService.stream_all_branch_stock_counts()
+    return export_response(branch_stock_counts, BranchStockCountSchema(), export_format, "branchstockcounts")
 
 @branch_stock_count_blueprint.route('/<int:branch_id>/<int:item_id>', methods=['PUT'])
 @jwt_required
@@ -62,6 +93,70 @@ def update_branch_stock_count(branch_id, item_id):
         return jsonify({'error': 'Branch stock count not found'}), 404
     return jsonify({'message': f'Branch Stock Count for Branch {branch_stock_count.branch_id} and Item {branch_stock_count.item_id} updated successfully'}), 200
 
+@branch_stock_count_blueprint.route('/<int:branch_id>/<int:item_id>/adjust', methods=['POST'])
+@jwt_required
+def adjust_branch_stock_count(branch_id, item_id):
+    """Add a signed delta to the stock on hand"""
+    stock_adjustment_schema = StockAdjustmentSchema()
+    try:
+        data = stock_adjustment_schema.load(request.json)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        branch_stock_count = BranchStockCountService.adjust_branch_stock_count(branch_id, item_id, data['delta'])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    if not branch_stock_count:
+        return jsonify({'error': 'Branch stock count not found'}), 404
+    branch_stock_count_schema = BranchStockCountSchema()
+    return jsonify(branch_stock_count_schema.dump(branch_stock_count)), 200
+
+@branch_stock_count_blueprint.route('/adjust', methods=['POST'])
+@jwt_required
+def adjust_branch_stock_counts():
+    """Apply many signed deltas at once; nothing is applied if any stock count is missing"""
+    batch_stock_adjustment_schema = BatchStockAdjustmentSchema(many=True)
+    try:
+        data = batch_stock_adjustment_schema.load(request.json)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        branch_stock_counts, missing = BranchStockCountService.adjust_branch_stock_counts(data)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    if missing:
+        return jsonify({
+            'error': 'Branch stock count not found',
+            'missing': [{'branch_id': branch_id, 'item_id': item_id} for branch_id, item_id in missing]
+        }), 404
+    branch_stock_count_schema = BranchStockCountSchema(many=True)
+    return jsonify(branch_stock_count_schema.dump(branch_stock_counts)), 200
+
+@branch_stock_count_blueprint.route('/<int:branch_id>/snapshot', methods=['PUT'])
+@jwt_required
+def upsert_branch_snapshot(branch_id):
+    """Set the stock on hand of a branch from a physical count and return the variances"""
+    try:
+        rows, _ = load_bulk_rows(SnapshotCountSchema(), request.json)
+    except ValidationError as e:
+        return jsonify({'error': e.messages}), 400
+
+    try:
+        variances = BranchStockCountService.upsert_branch_snapshot(branch_id, [values for _, values in rows])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except IntegrityError as e:
+        return jsonify({'error': str(e.orig)}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    snapshot_variance_schema = SnapshotVarianceSchema(many=True)
+    return jsonify(snapshot_variance_schema.dump(variances)), 200
+
 @branch_stock_count_blueprint.route('/<int:branch_id>/<int:item_id>', methods=['DELETE'])
 @jwt_required
 def delete_branch_stock_count(branch_id, item_id):
@@ -0,0 +1,12 @@
+from flask import jsonify
+from flask_smorest import Blueprint
+from api.cache import cache
+from api.middleware import jwt_required
+
+cache_blueprint = Blueprint('cache', __name__, url_prefix="/cache")
+
+@cache_blueprint.route('/stats', methods=['GET'])
+@jwt_required
+def get_cache_stats():
+    """Get the hit/miss counters of the catalog read cache"""
+    return jsonify(cache.store.stats()), 200
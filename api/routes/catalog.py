@@ -0,0 +1,36 @@
+from flask import request, jsonify, current_app
+from flask_smorest import Blueprint
+from api.services.catalog_service import CatalogService
+from api.middleware import jwt_required
+
+catalog_blueprint = Blueprint('catalog', __name__, url_prefix="/catalog")
+
+@catalog_blueprint.route('/', methods=['GET'])
+@jwt_required
+def get_catalog():
+    """Get the whole POS catalog, or only what changed after ?since=<version>"""
+    since = request.args.get('since')
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return jsonify({'error': 'since must be an integer'}), 400
+
+    etag = f"catalog-{CatalogService.get_catalog_version()}-{since}"
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    payload = CatalogService.get_catalog_payload(since)
+
+    if "gzip" in request.accept_encodings:
+        response = current_app.response_class(payload["gzip"], mimetype="application/json")
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = current_app.response_class(payload["body"], mimetype="application/json")
+
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['X-Catalog-Version'] = str(payload["version"])
+    response.set_etag(f"catalog-{payload['version']}-{since}")
+    return response, 200
@@ -3,7 +3,8 @@ from flask_smorest import Blueprint
 from api.services.category_service import CategoryService
 from api.schemas.categories import CategorySchema
 from sqlalchemy.exc import IntegrityError
-from api.middleware import jwt_required
+from api.middleware import jwt_required, conditional_get
+from api.pagination import get_page_args, paginated_response
 
 category_blueprint = Blueprint('category', __name__, url_prefix="/categories")
 
@@ -32,6 +33,7 @@ def create_category():
 
 @category_blueprint.route('/<int:category_id>', methods=['GET'])
 @jwt_required
+@conditional_get("categories")
 def get_category(category_id):
     category = CategoryService.get_category_by_id(category_id)
     if not category:
@@ -42,10 +44,16 @@ def get_category(category_id):
 
 @category_blueprint.route('/', methods=['GET'])
 @jwt_required
+@conditional_get("categories")
 def get_all_categories():
-    categories = CategoryService.get_all_categories()
+    try:
+        limit, after = get_page_args()
+        categories, next_cursor = CategoryService.get_all_categories(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     category_schema = CategorySchema(many=True)
-    return jsonify(category_schema.dump(categories)), 200
+    return paginated_response(category_schema.dump(categories), next_cursor), 200
 
 @category_blueprint.route('/<int:category_id>', methods=['PUT'])
 @jwt_required
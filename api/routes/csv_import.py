@@ -0,0 +1,58 @@
+import os
+import shutil
+from uuid import uuid4
+from flask import request, jsonify, current_app, send_file, url_for
+from flask_smorest import Blueprint
+from api.csv_import import IMPORT_RESOURCES, import_csv_file
+from api.jobs import submit_job
+from api.middleware import jwt_required
+
+csv_import_blueprint = Blueprint('csv_import', __name__, url_prefix="/imports")
+
+@csv_import_blueprint.route('/<string:resource>', methods=['POST'])
+@jwt_required
+def create_import(resource):
+    """Upload a CSV file, as multipart `file` or a text/csv body, and import it in the background"""
+    if resource not in IMPORT_RESOURCES:
+        return jsonify({'error': f"resource must be one of: {', '.join(sorted(IMPORT_RESOURCES))}"}), 404
+
+    upload = request.files.get('file')
+    if upload is None and request.mimetype != 'text/csv':
+        return jsonify({'error': 'Upload a CSV file as multipart "file" or a text/csv body'}), 400
+
+    import_id = uuid4().hex
+    path, rejects_path = _import_paths(import_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    try:
+        # The upload is spooled to disk so the import reads it in chunks rather than from memory
+        if upload is not None:
+            upload.save(path)
+        else:
+            with open(path, 'wb') as file:
+                shutil.copyfileobj(request.stream, file)
+        job_id = submit_job('import', import_csv_file, resource, path, rejects_path, True)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    response = jsonify({
+        'job_id': job_id,
+        'import_id': import_id,
+        'rejects': url_for('csv_import.get_import_rejects', import_id=import_id),
+    })
+    response.headers['Location'] = url_for('job.get_job', job_id=job_id)
+    return response, 202
+
+@csv_import_blueprint.route('/<string:import_id>/rejects', methods=['GET'])
+@jwt_required
+def get_import_rejects(import_id):
+    """Download the rows an import rejected, with their errors, once its job has finished"""
+    _, rejects_path = _import_paths(import_id)
+    if not import_id.isalnum() or not os.path.exists(rejects_path):
+        return jsonify({'error': 'No rejected rows for this import'}), 404
+    return send_file(os.path.abspath(rejects_path), mimetype='text/csv', as_attachment=True, download_name=f'{import_id}.rejects.csv')
+
+def _import_paths(import_id):
+    """Returns where the upload and the rejected rows of an import are stored"""
+    directory = current_app.config["IMPORT_DIR"]
+    return os.path.join(directory, f'{import_id}.csv'), os.path.join(directory, f'{import_id}.rejects.csv')
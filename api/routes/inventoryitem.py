@@ -3,7 +3,10 @@ from flask_smorest import Blueprint
 from api.services.inventoryitem_service import InventoryItemService 
 from api.schemas.inventoryitems import InventorySchema  
 from sqlalchemy.exc import IntegrityError
-from api.middleware import jwt_required
+from api.bulk import bulk_create
+from api.middleware import jwt_required, conditional_get
+from api.pagination import get_page_args, paginated_response
+from api.streaming import export_response
 
 # Define Blueprint for Inventory Items
 inventory_item_blueprint = Blueprint('inventory_item', __name__, url_prefix="/inventory-items")
@@ -33,8 +36,15 @@ def create_inventory_item():
     
     return jsonify({'message': f'Inventory item {inventory_item.name} created successfully'}), 201
 
+@inventory_item_blueprint.route('/bulk', methods=['POST'])
+@jwt_required
+def bulk_create_inventory_items():
+    """Create many inventory items at once; with ?partial=true invalid rows are skipped and reported"""
+    return bulk_create(InventorySchema(), InventoryItemService.bulk_create_inventory_items)
+
 @inventory_item_blueprint.route('/<int:item_id>', methods=['GET'])
 @jwt_required
+@conditional_get("inventoryitems")
 def get_inventory_item(item_id):
     inventory_item = InventoryItemService.get_inventory_item_by_id(item_id)
     if not inventory_item:
@@ -44,10 +54,23 @@ def get_inventory_item(item_id):
 
 @inventory_item_blueprint.route('/', methods=['GET'])
 @jwt_required
+@conditional_get("inventoryitems")
 def get_all_inventory_items():
-    inventory_items = InventoryItemService.get_all_inventory_items()
+    try:
+        limit, after = get_page_args()
+        inventory_items, next_cursor = InventoryItemService.get_all_inventory_items(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     inventory_item_schema = InventorySchema(many=True)
-    return jsonify(inventory_item_schema.dump(inventory_items)), 200
+    return paginated_response(inventory_item_schema.dump(inventory_items), next_cursor), 200
+
+@inventory_item_blueprint.route('/export.<any(ndjson, csv):export_format>', methods=['GET'])
+@jwt_required
+def export_inventory_items(export_format):
+    # Stream every inventory item as NDJSON or CSV
+    inventory_items = InventoryItemService.stream_all_inventory_items()
+    return export_response(inventory_items, InventorySchema(), export_format, "inventory-items")
 
 @inventory_item_blueprint.route('/<int:item_id>', methods=['PUT'])
 @jwt_required
@@ -0,0 +1,17 @@
+from flask import jsonify
+from flask_smorest import Blueprint
+from api.jobs import get_job as get_job_by_id
+from api.schemas.jobs import JobSchema
+from api.middleware import jwt_required
+
+job_blueprint = Blueprint('job', __name__, url_prefix="/jobs")
+
+@job_blueprint.route('/<string:job_id>', methods=['GET'])
+@jwt_required
+def get_job(job_id):
+    """Get the status, and once finished the result, of a background job"""
+    job = get_job_by_id(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    job_schema = JobSchema()
+    return jsonify(job_schema.dump(job)), 200
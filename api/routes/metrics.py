@@ -0,0 +1,13 @@
+from flask import Response
+from flask_smorest import Blueprint
+from api.metrics import render_metrics
+
+metrics_blueprint = Blueprint('metrics', __name__)
+
+@metrics_blueprint.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Request, connection pool, cache and request log metrics of every worker, in the
+    Prometheus text format. Left unauthenticated for the scraper; restrict it at the proxy.
+    """
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
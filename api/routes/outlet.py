@@ -3,7 +3,10 @@ from flask_smorest import Blueprint
 from api.services.outlet_service import OutletService
 from api.schemas.outlets import OutletSchema
 from sqlalchemy.exc import IntegrityError
-from api.middleware import jwt_required
+from api.bulk import bulk_create
+from api.middleware import jwt_required, conditional_get
+from api.pagination import get_page_args, paginated_response
+from api.streaming import export_response
 
 outlet_blueprint = Blueprint('outlet', __name__, url_prefix="/outlets")
 
@@ -29,8 +32,15 @@ def create_outlet():
     
     return jsonify({'message': f'Outlet {outlet.name} created successfully'}), 201
 
+@outlet_blueprint.route('/bulk', methods=['POST'])
+@jwt_required
+def bulk_create_outlets():
+    """Create many outlets at once; with ?partial=true invalid rows are skipped and reported"""
+    return bulk_create(OutletSchema(), OutletService.bulk_create_outlets)
+
 @outlet_blueprint.route('/<int:outlet_id>', methods=['GET'])
 @jwt_required
+@conditional_get("outlets")
 def get_outlet(outlet_id):
     outlet = OutletService.get_outlet_by_id(outlet_id)
     if not outlet:
@@ -40,6 +50,7 @@ def get_outlet(outlet_id):
 
 @outlet_blueprint.route('/', methods=['GET'])
 @jwt_required
+@conditional_get("outlets")
 def get_all_outlets():
     # Check for product_id query parameter
     product_id = request.args.get('product_id')
@@ -47,14 +58,27 @@ def get_all_outlets():
     if product_id:
         try:
             product_id = int(product_id)
-            outlets = OutletService.get_outlets_by_product_id(product_id)
         except ValueError:
             return jsonify({'error': 'product_id must be an integer'}), 400
-    else:
-        outlets = OutletService.get_all_outlets()
+
+    try:
+        limit, after = get_page_args()
+        if product_id:
+            outlets, next_cursor = OutletService.get_outlets_by_product_id(product_id, limit, after)
+        else:
+            outlets, next_cursor = OutletService.get_all_outlets(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     outlet_schema = OutletSchema(many=True)
-    return jsonify(outlet_schema.dump(outlets)), 200
+    return paginated_response(outlet_schema.dump(outlets), next_cursor), 200
+
+@outlet_blueprint.route('/export.<any(ndjson, csv):export_format>', methods=['GET'])
+@jwt_required
+def export_outlets(export_format):
+    """Stream every outlet as NDJSON or CSV"""
+    outlets = OutletService.stream_all_outlets()
+    return export_response(outlets, OutletSchema(), export_format, "outlets")
 
 @outlet_blueprint.route('/<int:outlet_id>', methods=['PUT'])
 @jwt_required
@@ -1,9 +1,11 @@
 from flask import request, jsonify
 from flask_smorest import Blueprint
 from api.services.product_service import ProductService
-from api.schemas.products import ProductSchema
+from api.schemas.products import ProductSchema, ProductIncludeSchema, PRODUCT_INCLUDES
 from sqlalchemy.exc import IntegrityError
-from api.middleware import jwt_required
+from api.bulk import bulk_create
+from api.middleware import jwt_required, conditional_get
+from api.pagination import get_page_args, get_include_args, paginated_response
 
 product_blueprint = Blueprint('product', __name__, url_prefix="/products")
 
@@ -31,21 +33,48 @@ def create_product():
     
     return jsonify({'message': f'Product {product.name} created successfully'}), 201
 
+@product_blueprint.route('/bulk', methods=['POST'])
+@jwt_required
+def bulk_create_products():
+    """Create many products at once; with ?partial=true invalid rows are skipped and reported"""
+    return bulk_create(ProductSchema(), ProductService.bulk_create_products)
+
 @product_blueprint.route('/<int:product_id>', methods=['GET'])
 @jwt_required
+@conditional_get("products", "outlets", "recipes", "inventoryitems", "product_tags", "tags")
 def get_product(product_id):
-    product = ProductService.get_product_by_id(product_id)
+    """Get a product, with ?include=outlets,recipes,tags to embed its relations"""
+    try:
+        includes = get_include_args(PRODUCT_INCLUDES)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if includes:
+        product = ProductService.get_product_with_includes(product_id, includes)
+    else:
+        product = ProductService.get_product_by_id(product_id)
     if not product:
         return jsonify({'error': 'Product not found'}), 404
-    product_schema = ProductSchema()
+    product_schema = ProductIncludeSchema(exclude=set(PRODUCT_INCLUDES) - includes)
     return jsonify(product_schema.dump(product)), 200
 
 @product_blueprint.route('/', methods=['GET'])
 @jwt_required
+@conditional_get("products", "outlets", "recipes", "inventoryitems", "product_tags", "tags")
 def get_all_products():
-    products = ProductService.get_all_products()
-    product_schema = ProductSchema(many=True)
-    return jsonify(product_schema.dump(products)), 200
+    """Get a page of products, with ?include=outlets,recipes,tags to embed their relations"""
+    try:
+        limit, after = get_page_args()
+        includes = get_include_args(PRODUCT_INCLUDES)
+        if includes:
+            products, next_cursor = ProductService.get_products_with_includes(limit, after, includes)
+        else:
+            products, next_cursor = ProductService.get_all_products(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    product_schema = ProductIncludeSchema(many=True, exclude=set(PRODUCT_INCLUDES) - includes)
+    return paginated_response(product_schema.dump(products), next_cursor), 200
 
 @product_blueprint.route('/<int:product_id>', methods=['PUT'])
 @jwt_required
@@ -64,7 +93,10 @@ def update_product(product_id):
 @product_blueprint.route('/<int:product_id>', methods=['DELETE'])
 @jwt_required
 def delete_product(product_id):
-    success = ProductService.delete_product(product_id)
+    try:
+        success = ProductService.delete_product(product_id)
+    except IntegrityError:
+        return jsonify({'error': 'Product is still sold on outlets; delete or reassign them first'}), 409
     if not success:
         return jsonify({'error': 'Product not found'}), 404
     return jsonify({'message': 'Product deleted successfully'}), 200
@@ -92,13 +124,12 @@ def add_tag_to_product(product_id):
 
 @product_blueprint.route('/<int:product_id>/tags/', methods=['GET'])
 @jwt_required
+@conditional_get("products", "product_tags", "tags")
 def get_product_tags(product_id):
     """Get all tags associated with a product"""
-    product = ProductService.get_product_by_id(product_id)
-    if not product:
-        return jsonify({"error": "Product not found"}), 404
-
     tags = ProductService.get_product_tags(product_id)
+    if tags is None:
+        return jsonify({"error": "Product not found"}), 404
     return jsonify(tags), 200
 
 @product_blueprint.route('/<int:product_id>/tags/<int:tag_id>', methods=['PUT'])
@@ -0,0 +1,24 @@
+from flask import jsonify
+from flask_smorest import Blueprint
+from api.services.product_cost_service import ProductCostService
+from api.middleware import jwt_required, conditional_get
+
+product_cost_blueprint = Blueprint('product_cost', __name__, url_prefix="/product-costs")
+
+@product_cost_blueprint.route('/', methods=['GET'])
+@jwt_required
+@conditional_get("recipes", "inventoryitems.cost")
+def get_product_costs():
+    """Get the unit cost of every product rolled up from its recipe"""
+    costs = ProductCostService.get_product_costs()
+    return jsonify([
+        {'product_id': product_id, 'cost': cost, 'takeout_cost': takeout_cost}
+        for product_id, (cost, takeout_cost) in sorted(costs.items())
+    ]), 200
+
+@product_cost_blueprint.route('/margins', methods=['GET'])
+@jwt_required
+@conditional_get("recipes", "inventoryitems.cost", "outlets")
+def get_outlet_margins():
+    """Get the price, cost and margin of every outlet"""
+    return jsonify(ProductCostService.get_outlet_margins()), 200
@@ -3,7 +3,9 @@ from flask_smorest import Blueprint
 from api.services.recipe_service import RecipeService 
 from api.schemas.recipes import RecipeSchema 
 from sqlalchemy.exc import IntegrityError
-from api.middleware import jwt_required
+from api.bulk import bulk_create
+from api.middleware import jwt_required, conditional_get
+from api.pagination import get_page_args, paginated_response
 
 recipe_blueprint = Blueprint('recipe', __name__, url_prefix="/recipes")
 
@@ -30,8 +32,15 @@ def create_recipe():
     
     return jsonify({'message': f'Recipe for Product {recipe.product_id} and Item {recipe.item_id} created successfully'}), 201
 
+@recipe_blueprint.route('/bulk', methods=['POST'])
+@jwt_required
+def bulk_create_recipes():
+    """Create many recipes at once; with ?partial=true invalid rows are skipped and reported"""
+    return bulk_create(RecipeSchema(), RecipeService.bulk_create_recipes)
+
 @recipe_blueprint.route('/<int:product_id>/<int:item_id>', methods=['GET'])
 @jwt_required
+@conditional_get("recipes")
 def get_recipe(product_id, item_id):
     recipe = RecipeService.get_recipe_by_product_item(product_id, item_id)
     if not recipe:
@@ -41,10 +50,16 @@ def get_recipe(product_id, item_id):
 
 @recipe_blueprint.route('/', methods=['GET'])
 @jwt_required
+@conditional_get("recipes")
 def get_all_recipes():
-    recipes = RecipeService.get_all_recipes()
+    try:
+        limit, after = get_page_args()
+        recipes, next_cursor = RecipeService.get_all_recipes(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     recipe_schema = RecipeSchema(many=True)
-    return jsonify(recipe_schema.dump(recipes)), 200
+    return paginated_response(recipe_schema.dump(recipes), next_cursor), 200
 
 @recipe_blueprint.route('/<int:product_id>/<int:item_id>', methods=['PUT'])
 @jwt_required
@@ -0,0 +1,30 @@
+from flask import jsonify, url_for
+from flask_smorest import Blueprint
+from api.services.reorder_service import ReorderService
+from api.jobs import submit_job
+from api.middleware import jwt_required
+
+reorder_blueprint = Blueprint('reorder', __name__, url_prefix="/reorders")
+
+@reorder_blueprint.route('/', methods=['GET'])
+@jwt_required
+def get_purchase_orders():
+    """Get the suggested purchase orders, one per supplier, across every branch"""
+    try:
+        purchase_orders = ReorderService.get_purchase_orders()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    return jsonify(purchase_orders), 200
+
+@reorder_blueprint.route('/jobs', methods=['POST'])
+@jwt_required
+def create_purchase_order_job():
+    """Compute the suggested purchase orders in the background; poll the returned job"""
+    try:
+        job_id = submit_job('reorder', ReorderService.get_purchase_orders)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    response = jsonify({'job_id': job_id})
+    response.headers['Location'] = url_for('job.get_job', job_id=job_id)
+    return response, 202
@@ -0,0 +1,33 @@
+from flask import request, jsonify
+from flask_smorest import Blueprint
+from api.services.sale_service import SaleService
+from api.schemas.sales import SaleSchema
+from api.schemas.branchstockcount import BranchStockCountSchema
+from api.middleware import jwt_required
+
+sale_blueprint = Blueprint('sale', __name__, url_prefix="/sales")
+
+@sale_blueprint.route('/', methods=['POST'])
+@jwt_required
+def record_sales():
+    """Deplete branch stock for a batch of sales through the product recipes"""
+    sale_schema = SaleSchema(many=True)
+    try:
+        data = sale_schema.load(request.json)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        branch_stock_counts, missing = SaleService.record_sales(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    if missing:
+        return jsonify({
+            'error': 'Branch stock count not found',
+            'missing': [{'branch_id': branch_id, 'item_id': item_id} for branch_id, item_id in missing]
+        }), 404
+    branch_stock_count_schema = BranchStockCountSchema(many=True)
+    return jsonify(branch_stock_count_schema.dump(branch_stock_counts)), 200
@@ -3,7 +3,9 @@ from flask_smorest import Blueprint
 from api.services.supplier_service import SupplierService
 from api.schemas.suppliers import SupplierSchema
 from sqlalchemy.exc import IntegrityError
-from api.middleware import jwt_required
+from api.bulk import bulk_create
+from api.middleware import jwt_required, conditional_get
+from api.pagination import get_page_args, paginated_response
 
 supplier_blueprint = Blueprint('supplier', __name__, url_prefix="/suppliers")
 
@@ -37,8 +39,16 @@ def create_supplier():
     return jsonify({'message': f'Supplier {supplier.name} created successfully'}), 201
 
 
+@supplier_blueprint.route('/bulk', methods=['POST'])
+@jwt_required
+def bulk_create_suppliers():
+    """Create many suppliers at once; with ?partial=true invalid rows are skipped and reported"""
+    return bulk_create(SupplierSchema(), SupplierService.bulk_create_suppliers)
+
+
 @supplier_blueprint.route('/<int:supplier_id>', methods=['GET'])
 @jwt_required
+@conditional_get("suppliers")
 def get_supplier(supplier_id):
     supplier = SupplierService.get_supplier_by_id(supplier_id)
     if not supplier:
@@ -50,10 +60,16 @@ def get_supplier(supplier_id):
 
 @supplier_blueprint.route('/', methods=['GET'])
 @jwt_required
+@conditional_get("suppliers")
 def get_all_suppliers():
-    suppliers = SupplierService.get_all_suppliers()
+    try:
+        limit, after = get_page_args()
+        suppliers, next_cursor = SupplierService.get_all_suppliers(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     supplier_schema = SupplierSchema(many=True)
-    return jsonify(supplier_schema.dump(suppliers)), 200
+    return paginated_response(supplier_schema.dump(suppliers), next_cursor), 200
 
 
 @supplier_blueprint.route('/<int:supplier_id>', methods=['PUT'])
@@ -3,7 +3,8 @@ from flask_smorest import Blueprint
 from api.services.tag_service import TagService
 from api.schemas.tags import TagSchema
 from sqlalchemy.exc import IntegrityError
-from api.middleware import jwt_required
+from api.middleware import jwt_required, conditional_get
+from api.pagination import get_page_args, paginated_response
 
 tag_blueprint = Blueprint('tag', __name__, url_prefix="/tags")
 
@@ -32,6 +33,7 @@ def create_tag():
 
 @tag_blueprint.route('/<int:tag_id>', methods=['GET'])
 @jwt_required
+@conditional_get("tags")
 def get_tag(tag_id):
     tag = TagService.get_tag_by_id(tag_id)
     if not tag:
@@ -42,10 +44,16 @@ def get_tag(tag_id):
 
 @tag_blueprint.route('/', methods=['GET'])
 @jwt_required
+@conditional_get("tags")
 def get_all_tags():
-    tags = TagService.get_all_tags()
+    try:
+        limit, after = get_page_args()
+        tags, next_cursor = TagService.get_all_tags(limit, after)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     tag_schema = TagSchema(many=True)
-    return jsonify(tag_schema.dump(tags)), 200
+    return paginated_response(tag_schema.dump(tags), next_cursor), 200
 
 @tag_blueprint.route('/<int:tag_id>', methods=['PUT'])
 @jwt_required
@@ -5,3 +5,28 @@ class BranchStockCountSchema(Schema):
     item_id = fields.Int(required=True)
     in_stock = fields.Float(required=True)
     ordered_qty = fields.Float(required=True)
+
+class StockAdjustmentSchema(Schema):
+    delta = fields.Float(required=True)
+
+class BatchStockAdjustmentSchema(Schema):
+    branch_id = fields.Int(required=True)
+    item_id = fields.Int(required=True)
+    delta = fields.Float(required=True)
+
+class SnapshotCountSchema(Schema):
+    item_id = fields.Int(required=True)
+    in_stock = fields.Float(required=True, validate=validate.Range(min=0))
+
+class SnapshotVarianceSchema(Schema):
+    item_id = fields.Int(dump_only=True)
+    previous = fields.Float(dump_only=True, allow_none=True)
+    in_stock = fields.Float(dump_only=True)
+    variance = fields.Float(dump_only=True)
+
+class LowStockSchema(Schema):
+    branch_id = fields.Int(dump_only=True)
+    item_id = fields.Int(dump_only=True)
+    in_stock = fields.Float(dump_only=True)
+    stock_warning_level = fields.Float(dump_only=True)
+    shortfall = fields.Float(dump_only=True)
@@ -0,0 +1,10 @@
+from marshmallow import Schema, fields
+
+class JobSchema(Schema):
+    job_id = fields.Str(dump_only=True)
+    kind = fields.Str(dump_only=True)
+    status = fields.Str(dump_only=True)
+    result = fields.Raw(dump_only=True)
+    error = fields.Str(dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+    finished_at = fields.DateTime(dump_only=True)
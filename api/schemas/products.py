@@ -1,8 +1,28 @@
 from marshmallow import Schema, fields, validate
+from api.schemas.outlets import OutletSchema
+
+# Relations GET /products/ and GET /products/<id> can embed with ?include=
+PRODUCT_INCLUDES = ("outlets", "recipes", "tags")
 
 class ProductSchema(Schema):
     id = fields.Int(dump_only=True, attribute="product_id")
     name = fields.Str(required=True, validate=validate.Length(min=3, max=50))
     variant_group_id = fields.Str(required=True, validate=validate.Length(min=3, max=50))
     sku = fields.Str(required=True, validate=validate.Length(min=3, max=50))
-    category_id = fields.Int(required=True)
\ No newline at end of file
+    category_id = fields.Int(required=True)
+
+class ProductRecipeSchema(Schema):
+    item_id = fields.Int(dump_only=True)
+    item_name = fields.Str(dump_only=True, attribute="item.name")
+    unit = fields.Str(dump_only=True, attribute="item.unit")
+    quantity = fields.Float(dump_only=True)
+    isTakeout = fields.Bool(dump_only=True)
+
+class ProductTagSchema(Schema):
+    tag_id = fields.Int(dump_only=True)
+    name = fields.Str(dump_only=True, attribute="tag.name")
+
+class ProductIncludeSchema(ProductSchema):
+    outlets = fields.Nested(OutletSchema, many=True, dump_only=True)
+    recipes = fields.Nested(ProductRecipeSchema, many=True, dump_only=True)
+    tags = fields.Nested(ProductTagSchema, many=True, dump_only=True)
\ No newline at end of file
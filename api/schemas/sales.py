@@ -0,0 +1,7 @@
+from marshmallow import Schema, fields, validate
+
+class SaleSchema(Schema):
+    branch_id = fields.Int(required=True)
+    outlet_id = fields.Int(required=True)
+    quantity = fields.Float(required=True, validate=validate.Range(min=0, min_inclusive=False))
+    isTakeout = fields.Bool(load_default=False)
@@ -8,3 +8,4 @@ from .branchstockcounts import register_commands as register_branch_stock_counts
 from .categories import register_commands as register_categories
 from .tags import register_commands as register_tags
 from .users import register_commands as register_user
+from .synthetic import register_commands as register_synthetic
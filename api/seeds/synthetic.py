@@ -0,0 +1,192 @@
+import csv
+import io
+import random
+import time
+from datetime import datetime, UTC
+from itertools import islice
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select, text
+from api.extensions import db
+from api.low_stock import refresh_low_stock
+from api.versioning import bump_versions
+from api.models.branches import Branch
+from api.models.branchstockcount import BranchStockCount
+from api.models.categories import Category
+from api.models.inventoryitems import InventoryItem
+from api.models.outlets import Outlet
+from api.models.product_tags import ProductTag
+from api.models.products import Product
+from api.models.recipes import Recipe
+from api.models.suppliers import Supplier
+from api.models.tags import Tag
+
+# Every product is sold on these channels, delivery apps at a markup over the store price
+CHANNELS = (("In-Store", 1.0), ("Take-Out", 1.0), ("GrabFood", 1.065), ("FoodPanda", 1.065))
+UNITS = ("kg", "g", "liters", "ml", "pcs", "dozen")
+
+@click.command("seed-synthetic")
+@click.option("--branches", default=10, show_default=True, help="Branches to create; each gets a stock count for every item.")
+@click.option("--items", default=500, show_default=True, help="Inventory items to create.")
+@click.option("--products", default=1000, show_default=True, help="Products to create, each with one outlet per channel.")
+@click.option("--suppliers", default=20, show_default=True, help="Suppliers the items are spread over.")
+@click.option("--categories", default=10, show_default=True, help="Categories the products are spread over.")
+@click.option("--tags", default=20, show_default=True, help="Tags, up to three of which are given to each product.")
+@click.option("--seed", default=0, show_default=True, help="Random seed, so the same options always produce the same data.")
+@click.option("--batch-size", default=10000, show_default=True, help="Rows sent to the database per COPY or executemany.")
+@with_appcontext
+def seed_synthetic(branches, items, products, suppliers, categories, tags, seed, batch_size):
+    """Seed the database with generated, referentially consistent data at any scale."""
+    rng = random.Random(seed)
+    connection = db.session.connection()
+    now = datetime.now(UTC)
+    started = time.perf_counter()
+
+    # Generated rows are numbered after the existing ones, so seeding can be repeated
+    supplier_ids = _new_ids(connection, Supplier.supplier_id, max(suppliers, 1))
+    category_ids = _new_ids(connection, Category.category_id, max(categories, 1))
+    tag_ids = _new_ids(connection, Tag.tag_id, tags)
+    branch_ids = _new_ids(connection, Branch.branch_id, branches)
+    item_ids = _new_ids(connection, InventoryItem.item_id, items)
+    product_ids = _new_ids(connection, Product.product_id, products)
+    first_outlet_id = _new_ids(connection, Outlet.outlet_id, 1).start
+
+    warning_levels = {item_id: rng.randint(2, 50) for item_id in item_ids}
+
+    tables = [
+        (Supplier, (
+            {'supplier_id': i, 'name': f"Supplier {i}", 'email': f"supplier{i}@example.com", 'phone': f"09{i:09d}", 'country_code': "+63"}
+            for i in supplier_ids
+        )),
+        (Category, ({'category_id': i, 'name': f"Synthetic Category {i}"} for i in category_ids)),
+        (Tag, ({'tag_id': i, 'name': f"Synthetic Tag {i}"} for i in tag_ids)),
+        (Branch, ({'branch_id': i, 'name': f"Synthetic Branch {i}", 'address': f"{i} Synthetic St."} for i in branch_ids)),
+        (InventoryItem, (
+            {
+                'item_id': i,
+                'name': f"Item {i}",
+                'cost': round(rng.uniform(1, 500), 2),
+                'unit': rng.choice(UNITS),
+                'stock_warning_level': float(warning_levels[i]),
+                'supplier_id': rng.choice(supplier_ids),
+            }
+            for i in item_ids
+        )),
+        (Product, (
+            {'product_id': i, 'name': f"Product {i}", 'variant_group_id': f"GROUP-{i // 3}", 'sku': f"SYN-{i:08d}", 'category_id': rng.choice(category_ids)}
+            for i in product_ids
+        )),
+        (Outlet, _outlets(rng, product_ids, first_outlet_id)),
+        (Recipe, _recipes(rng, product_ids, item_ids)),
+        (ProductTag, (
+            {'product_id': product_id, 'tag_id': tag_id}
+            for product_id in product_ids for tag_id in rng.sample(tag_ids, min(len(tag_ids), rng.randint(0, 3)))
+        )),
+        (BranchStockCount, (
+            {
+                'branch_id': branch_id,
+                'item_id': item_id,
+                'in_stock': float(rng.randint(0, warning_levels[item_id] * 4)),
+                'ordered_qty': float(rng.choice((0, 0, 0, rng.randint(1, 20)))),
+            }
+            for branch_id in branch_ids for item_id in item_ids
+        )),
+    ]
+
+    total = 0
+    for model, rows in tables:
+        table_started = time.perf_counter()
+        count = _write_rows(connection, model.__table__, rows, now, batch_size)
+        total += count
+        click.echo(f"{model.__tablename__}: {count} rows in {time.perf_counter() - table_started:.2f}s")
+
+    # Bulk writes bypass the session events that keep alerts, versions and sequences current
+    refresh_low_stock(connection, item_ids=item_ids)
+    bump_versions(connection, [model.__tablename__ for model, _ in tables])
+    _reset_sequences(connection, [model for model, _ in tables])
+    db.session.commit()
+
+    seconds = time.perf_counter() - started
+    click.echo(f"Seeded {total} synthetic rows in {seconds:.2f}s ({total / seconds:.0f} rows/s)")
+
+
+def register_commands(app):
+    app.cli.add_command(seed_synthetic)
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _new_ids(connection, column, count):
+    """Returns the range of `count` ids following the largest id of `column`"""
+    start = connection.execute(select(func.coalesce(func.max(column), 0))).scalar() + 1
+    return range(start, start + count)
+
+
+def _outlets(rng, product_ids, first_outlet_id):
+    outlet_id = first_outlet_id
+    for product_id in product_ids:
+        price = float(rng.randrange(80, 400, 5))
+        for name, markup in CHANNELS:
+            yield {'outlet_id': outlet_id, 'product_id': product_id, 'name': name, 'price': round(price * markup)}
+            outlet_id += 1
+
+
+def _recipes(rng, product_ids, item_ids):
+    """Gives every product two to six ingredients, the last one packaging for take-out half of the time"""
+    for product_id in product_ids:
+        ingredients = rng.sample(item_ids, min(len(item_ids), rng.randint(2, 6)))
+        for position, item_id in enumerate(ingredients, start=1):
+            is_takeout = position == len(ingredients) and position > 2 and rng.random() < 0.5
+            yield {'product_id': product_id, 'item_id': item_id, 'quantity': round(rng.uniform(0.05, 2), 2), 'isTakeout': is_takeout}
+
+
+def _write_rows(connection, table, rows, now, batch_size):
+    """
+    Writes the dicts of `rows` into `table` in batches: with COPY on PostgreSQL and
+    executemany elsewhere. Timestamp columns are filled with `now`. Returns the row count.
+    """
+    timestamps = {name: now for name in ('created_at', 'updated_at') if name in table.c}
+    count = 0
+    rows = iter(rows)
+
+    while batch := [{**row, **timestamps} for row in islice(rows, batch_size)]:
+        if connection.dialect.name == "postgresql":
+            _copy(connection, table, batch)
+        else:
+            connection.execute(table.insert(), batch)
+        count += len(batch)
+
+    return count
+
+
+def _copy(connection, table, batch):
+    """Streams a batch to PostgreSQL with COPY ... FROM STDIN, its fastest bulk load path"""
+    columns = list(batch[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([r'\N' if row[column] is None else row[column] for column in columns])
+    buffer.seek(0)
+
+    quoted = ", ".join(connection.dialect.identifier_preparer.quote(column) for column in columns)
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({quoted}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer)
+    finally:
+        cursor.close()
+
+
+def _reset_sequences(connection, models):
+    """Moves the PostgreSQL id sequences past the explicitly numbered rows"""
+    if connection.dialect.name != "postgresql":
+        return
+
+    for model in models:
+        primary_key = model.__table__.primary_key.columns
+        if len(primary_key) != 1 or not primary_key[0].autoincrement:
+            continue
+        column = primary_key[0].name
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{model.__tablename__}', '{column}'), "
+            f"(SELECT coalesce(max({column}), 1) FROM {model.__tablename__}))"
+        ))
@@ -1,3 +1,6 @@
+import time
+from flask import current_app
+from api.cache import TTLCache
 from api.extensions import db
 from api.models.users import User
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -51,9 +54,36 @@ class AuthService:
     def decode_access_token(token):
         """
         Decode a JWT token using Flask-JWT-Extended.
+        Recently verified tokens are answered from a small LRU whose entries expire
+        no later than the token itself. Returns None for an invalid or expired token.
         """
+        store = AuthService._verified_tokens()
+        if store is not None:
+            hit, payload = store.get("tokens", token)
+            if hit:
+                return payload
+
         try:
             payload = decode_token(token)
-            return payload
-        except Exception as e:
-            return e
+        except Exception:
+            return None
+
+        if store is not None:
+            # Tokens issued with JWT_ACCESS_TOKEN_EXPIRES=0 carry no exp and keep the cache's own ttl
+            expires = payload.get("exp")
+            ttl = expires - time.time() if expires is not None else None
+            store.set("tokens", token, payload, store.generation("tokens"), ttl=ttl)
+        return payload
+
+    @staticmethod
+    def _verified_tokens():
+        size = current_app.config["JWT_VERIFY_CACHE_SIZE"]
+        if not size:
+            return None
+        store = current_app.extensions.get('verified_tokens')
+        if store is None:
+            store = current_app.extensions.setdefault(
+                'verified_tokens',
+                TTLCache(size, current_app.config["JWT_VERIFY_CACHE_TTL"]),
+            )
+        return store
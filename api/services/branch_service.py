@@ -1,4 +1,6 @@
 from api.extensions import db
+from api.pagination import keyset_paginate
+from api.statements import update_returning, delete_by_key
 from api.models.branches import Branch
 
 class BranchService:
@@ -13,8 +15,8 @@ class BranchService:
         return new_branch
 
     @staticmethod
-    def get_all_branches():
-        return Branch.query.all()
+    def get_all_branches(limit, after=None):
+        return keyset_paginate(Branch.query, (Branch.branch_id,), limit, after)
 
     @staticmethod
     def get_branch_by_id(branch_id):
@@ -22,22 +24,13 @@ class BranchService:
 
     @staticmethod
     def update_branch(branch_id, data):
-        branch = db.session.get(Branch, branch_id)
-        if not branch:
-            return None
-        
-        for key, value in data.items():
-            setattr(branch, key, value)
-        
+        branch = update_returning(Branch, {'branch_id': branch_id}, data)
         db.session.commit()
         return branch
 
     @staticmethod
     def delete_branch(branch_id):
-        branch = db.session.get(Branch, branch_id)
-        if not branch:
-            return False
-        
-        db.session.delete(branch)
+        # Stock counts are removed by the database through ON DELETE CASCADE
+        deleted = delete_by_key(Branch, {'branch_id': branch_id})
         db.session.commit()
-        return True
+        return deleted
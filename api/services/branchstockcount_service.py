@@ -1,5 +1,16 @@
+from collections import Counter
+from datetime import datetime, UTC
+from flask import current_app
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from api.extensions import db
+from api.pagination import keyset_paginate
+from api.streaming import stream_query
+from api.low_stock import refresh_low_stock
+from api.statements import update_returning, delete_by_key
+from api.bulk import bulk_insert
 from api.models.branchstockcount import BranchStockCount
+from api.models.low_stock_alerts import LowStockAlert
 
 class BranchStockCountService:
     @staticmethod
@@ -15,31 +26,183 @@ class BranchStockCountService:
         return new_stock_count
 
     @staticmethod
-    def get_all_branch_stock_counts():
-        return BranchStockCount.query.all()
+    def bulk_create_branch_stock_counts(rows, partial=False):
+        """
+        Inserts many stock counts in batches and builds their low-stock alerts, which
+        the unit-of-work flush would otherwise do. Returns the errors of skipped rows.
+        """
+        errors = bulk_insert(BranchStockCount, rows, partial)
+        keys = [(values['branch_id'], values['item_id']) for index, values in rows if index not in errors]
+        refresh_low_stock(db.session.connection(), keys)
+        db.session.commit()
+        return errors
+
+    @staticmethod
+    def get_all_branch_stock_counts(limit, after=None):
+        return keyset_paginate(BranchStockCount.query, (BranchStockCount.branch_id, BranchStockCount.item_id), limit, after)
+
+    @staticmethod
+    def stream_all_branch_stock_counts():
+        return stream_query(BranchStockCount.query, (BranchStockCount.branch_id, BranchStockCount.item_id))
 
     @staticmethod
     def get_branch_stock_count_by_ids(branch_id, item_id):
         return BranchStockCount.query.filter_by(branch_id=branch_id, item_id=item_id).first()
 
+    @staticmethod
+    def get_low_stock_counts(branch_id=None):
+        """Returns the maintained low-stock alerts, furthest below the warning level first"""
+        query = LowStockAlert.query
+        if branch_id is not None:
+            query = query.filter_by(branch_id=branch_id)
+        return query.order_by(LowStockAlert.shortfall.desc(), LowStockAlert.branch_id, LowStockAlert.item_id).all()
+
     @staticmethod
     def update_branch_stock_count(branch_id, item_id, data):
-        stock_count = BranchStockCount.query.filter_by(branch_id=branch_id, item_id=item_id).first()
-        if not stock_count:
-            return None
-        
-        for key, value in data.items():
-            setattr(stock_count, key, value)
-        
+        stock_count = update_returning(BranchStockCount, {'branch_id': branch_id, 'item_id': item_id}, data)
+        if stock_count:
+            refresh_low_stock(db.session.connection(), [(branch_id, item_id), (stock_count.branch_id, stock_count.item_id)])
+        db.session.commit()
+        return stock_count
+
+    @staticmethod
+    def adjust_branch_stock_count(branch_id, item_id, delta):
+        """
+        Adds a signed delta to in_stock in a single UPDATE ... RETURNING, so concurrent
+        terminals never overwrite each other's changes. Returns None when the stock
+        count does not exist.
+        """
+        stock_count = db.session.execute(BranchStockCountService._adjust_statement(branch_id, {item_id: delta})).first()
+        refresh_low_stock(db.session.connection(), [(branch_id, item_id)])
         db.session.commit()
         return stock_count
 
+    @staticmethod
+    def adjust_branch_stock_counts(adjustments):
+        """
+        Applies many signed deltas in one transaction, with one UPDATE ... RETURNING per
+        branch. Deltas for the same item are summed. When a stock count does not exist
+        nothing is applied and the missing (branch_id, item_id) keys are returned.
+        """
+        deltas = {}
+        for adjustment in adjustments:
+            items = deltas.setdefault(adjustment['branch_id'], {})
+            items[adjustment['item_id']] = items.get(adjustment['item_id'], 0) + adjustment['delta']
+
+        stock_counts = []
+        # Branches are updated in key order so two batches always lock rows in the same order
+        for branch_id in sorted(deltas):
+            stock_counts.extend(db.session.execute(BranchStockCountService._adjust_statement(branch_id, deltas[branch_id])).all())
+
+        found = {(stock_count.branch_id, stock_count.item_id) for stock_count in stock_counts}
+        missing = [(branch_id, item_id) for branch_id in sorted(deltas) for item_id in sorted(deltas[branch_id]) if (branch_id, item_id) not in found]
+        if missing:
+            db.session.rollback()
+            return [], missing
+
+        refresh_low_stock(db.session.connection(), found)
+        db.session.commit()
+        return stock_counts, []
+
+    @staticmethod
+    def upsert_branch_snapshot(branch_id, counts):
+        """
+        Sets in_stock of every item of a physical count to the counted value with
+        INSERT ... ON CONFLICT DO UPDATE, creating the stock counts that don't exist yet,
+        in batches of BULK_BATCH_SIZE. Returns the previous and counted stock of each item
+        and the variance between them; previous is None for a new stock count.
+        """
+        duplicates = sorted(item_id for item_id, times in Counter(count['item_id'] for count in counts).items() if times > 1)
+        if duplicates:
+            raise ValueError(f"Items counted more than once: {', '.join(map(str, duplicates))}")
+
+        batch_size = current_app.config["BULK_BATCH_SIZE"]
+        counts = sorted(counts, key=lambda count: count['item_id'])
+        variances = []
+
+        for start in range(0, len(counts), batch_size):
+            batch = counts[start:start + batch_size]
+            # Lock the counted rows so an adjustment can't land between the read and the upsert
+            previous = dict(db.session.execute(
+                select(BranchStockCount.item_id, BranchStockCount.in_stock)
+                .where(BranchStockCount.branch_id == branch_id, BranchStockCount.item_id.in_([count['item_id'] for count in batch]))
+                .order_by(BranchStockCount.item_id)
+                .with_for_update()
+            ).all())
+            values = [
+                {'branch_id': branch_id, 'item_id': count['item_id'], 'in_stock': count['in_stock'], 'ordered_qty': 0.0}
+                for count in batch
+            ]
+            db.session.execute(BranchStockCountService._upsert_statement(['in_stock'], values))
+
+            for count in batch:
+                before = previous.get(count['item_id'])
+                variances.append({
+                    'item_id': count['item_id'],
+                    'previous': before,
+                    'in_stock': count['in_stock'],
+                    'variance': count['in_stock'] - (before or 0.0),
+                })
+
+        refresh_low_stock(db.session.connection(), [(branch_id, count['item_id']) for count in counts])
+        db.session.commit()
+        return variances
+
+    @staticmethod
+    def bulk_upsert_branch_stock_counts(rows, partial=False):
+        """
+        Inserts many stock counts in batches, overwriting in_stock and ordered_qty of
+        those that already exist. Returns the errors of skipped rows.
+        """
+        statement = BranchStockCountService._upsert_statement(['in_stock', 'ordered_qty'])
+        errors = bulk_insert(BranchStockCount, rows, partial, statement)
+        keys = [(values['branch_id'], values['item_id']) for index, values in rows if index not in errors]
+        refresh_low_stock(db.session.connection(), keys)
+        db.session.commit()
+        return errors
+
+    @staticmethod
+    def _upsert_statement(columns, values=None):
+        """
+        Builds INSERT ... ON CONFLICT (branch_id, item_id) DO UPDATE SET `columns`, with
+        the rows of `values` inlined or, when omitted, for executemany parameters.
+        """
+        now = datetime.now(UTC)
+        if db.session.get_bind().dialect.name == "postgresql":
+            statement = postgresql.insert(BranchStockCount)
+            conflict_target = {'constraint': 'unique_branch_item'}
+        else:
+            statement = sqlite.insert(BranchStockCount)
+            conflict_target = {'index_elements': ['branch_id', 'item_id']}
+
+        if values is not None:
+            statement = statement.values([{**row, 'created_at': now, 'updated_at': now} for row in values])
+
+        return statement.on_conflict_do_update(
+            **conflict_target,
+            set_={**{column: statement.excluded[column] for column in columns}, 'updated_at': now},
+        )
+
+    @staticmethod
+    def _adjust_statement(branch_id, deltas):
+        """Builds UPDATE ... SET in_stock = in_stock + delta RETURNING for the items of one branch"""
+        if len(deltas) == 1:
+            delta = next(iter(deltas.values()))
+        else:
+            delta = case(deltas, value=BranchStockCount.item_id)
+
+        return (
+            update(BranchStockCount)
+            .where(BranchStockCount.branch_id == branch_id, BranchStockCount.item_id.in_(deltas))
+            .values(in_stock=BranchStockCount.in_stock + delta, updated_at=datetime.now(UTC))
+            .returning(BranchStockCount.branch_id, BranchStockCount.item_id, BranchStockCount.in_stock, BranchStockCount.ordered_qty)
+            .execution_options(synchronize_session=False)
+        )
+
     @staticmethod
     def delete_branch_stock_count(branch_id, item_id):
-        stock_count = BranchStockCount.query.filter_by(branch_id=branch_id, item_id=item_id).first()
-        if not stock_count:
-            return False
-        
-        db.session.delete(stock_count)
+        deleted = delete_by_key(BranchStockCount, {'branch_id': branch_id, 'item_id': item_id})
+        if deleted:
+            refresh_low_stock(db.session.connection(), [(branch_id, item_id)])
         db.session.commit()
-        return True
+        return deleted
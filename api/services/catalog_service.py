@@ -0,0 +1,137 @@
+import gzip
+import json
+from flask import current_app
+from sqlalchemy import select
+from api.cache import TTLCache
+from api.extensions import db
+from api.models.categories import Category
+from api.models.outlets import Outlet
+from api.models.product_tags import ProductTag
+from api.models.products import Product
+from api.models.tags import Tag
+from api.versioning import get_versions
+
+CATALOG_TABLES = ("categories", "outlets", "product_tags", "products", "tags")
+CATALOG_SECTIONS = ("categories", "tags", "products")
+
+class CatalogService:
+    @staticmethod
+    def get_catalog_version(refresh=False):
+        """Every catalog write bumps one table counter, so their sum only ever grows"""
+        return sum(get_versions(CATALOG_TABLES, refresh=refresh))
+
+    @staticmethod
+    def get_catalog_payload(since=None):
+        """
+        Returns the encoded catalog as {"version", "body", "gzip"}: the whole menu,
+        or only the rows changed after `since` when that snapshot is still retained.
+        """
+        store = CatalogService._store()
+        snapshot = CatalogService._get_snapshot(store)
+        version = snapshot["version"]
+
+        previous = None
+        if since is not None and since <= version:
+            hit, previous = store.get("snapshots", since)
+
+        key = ("delta", since, version) if previous else ("full", version)
+        hit, payload = store.get("payloads", key)
+        if hit:
+            return payload
+
+        if previous:
+            document = CatalogService._diff(previous, snapshot, since)
+        else:
+            document = {
+                "version": version,
+                "since": None,
+                "full": True,
+                **{section: list(snapshot[section].values()) for section in CATALOG_SECTIONS},
+                "removed": {section: [] for section in CATALOG_SECTIONS},
+            }
+
+        body = json.dumps(document, separators=(",", ":")).encode()
+        payload = {"version": version, "body": body, "gzip": gzip.compress(body)}
+        if snapshot["stable"]:
+            store.set("payloads", key, payload, store.generation("payloads"))
+        return payload
+
+    @staticmethod
+    def _get_snapshot(store):
+        """
+        Returns the snapshot of the current catalog version, building it on first use.
+        The version is read again after the build: if a write committed in between,
+        the snapshot is labelled with the older version and not retained, so a later
+        delta can re-send a change but never miss one.
+        """
+        version = CatalogService.get_catalog_version()
+        hit, snapshot = store.get("snapshots", version)
+        if hit:
+            return snapshot
+
+        snapshot = CatalogService._build_snapshot()
+        snapshot["version"] = version
+        snapshot["stable"] = CatalogService.get_catalog_version(refresh=True) == version
+
+        if snapshot["stable"]:
+            store.set("snapshots", version, snapshot, store.generation("snapshots"))
+        return snapshot
+
+    @staticmethod
+    def _build_snapshot():
+        """Loads the whole catalog in a fixed number of queries"""
+        categories = {
+            row.category_id: {"id": row.category_id, "name": row.name}
+            for row in db.session.execute(select(Category.category_id, Category.name).order_by(Category.category_id))
+        }
+        tags = {
+            row.tag_id: {"id": row.tag_id, "name": row.name}
+            for row in db.session.execute(select(Tag.tag_id, Tag.name).order_by(Tag.tag_id))
+        }
+        products = {
+            row.product_id: {
+                "id": row.product_id,
+                "name": row.name,
+                "variant_group_id": row.variant_group_id,
+                "sku": row.sku,
+                "category_id": row.category_id,
+                "tag_ids": [],
+                "outlets": [],
+            }
+            for row in db.session.execute(
+                select(Product.product_id, Product.name, Product.variant_group_id, Product.sku, Product.category_id)
+                .order_by(Product.product_id)
+            )
+        }
+
+        for row in db.session.execute(select(ProductTag.product_id, ProductTag.tag_id).order_by(ProductTag.product_id, ProductTag.tag_id)):
+            if row.product_id in products:
+                products[row.product_id]["tag_ids"].append(row.tag_id)
+
+        for row in db.session.execute(select(Outlet.outlet_id, Outlet.product_id, Outlet.name, Outlet.price).order_by(Outlet.outlet_id)):
+            if row.product_id in products:
+                products[row.product_id]["outlets"].append({"id": row.outlet_id, "name": row.name, "price": row.price})
+
+        return {"categories": categories, "tags": tags, "products": products}
+
+    @staticmethod
+    def _diff(previous, snapshot, since):
+        """Lists the rows added or changed and the ids removed between two snapshots"""
+        document = {"version": snapshot["version"], "since": since, "full": False, "removed": {}}
+
+        for section in CATALOG_SECTIONS:
+            old_rows, new_rows = previous[section], snapshot[section]
+            document[section] = [row for row_id, row in new_rows.items() if old_rows.get(row_id) != row]
+            document["removed"][section] = [row_id for row_id in old_rows if row_id not in new_rows]
+
+        return document
+
+    @staticmethod
+    def _store():
+        store = current_app.extensions.get('catalog')
+        if store is None:
+            store = current_app.extensions.setdefault(
+                'catalog',
+                TTLCache(current_app.config["CATALOG_CACHE_SIZE"], current_app.config["CATALOG_CACHE_TTL"]),
+            )
+        return store
@@ -1,8 +1,12 @@
 from api.extensions import db
+from api.cache import cache
+from api.pagination import keyset_paginate
+from api.statements import update_returning, delete_by_key
 from api.models.categories import Category
 
 class CategoryService:
     @staticmethod
+    @cache.invalidates("categories")
     def create_category(name):
         new_category = Category(
             name=name
@@ -12,32 +16,26 @@ class CategoryService:
         return new_category
 
     @staticmethod
-    def get_all_categories():
-        return Category.query.all()
+    @cache.cached("categories")
+    def get_all_categories(limit, after=None):
+        return keyset_paginate(Category.query, (Category.category_id,), limit, after)
 
     @staticmethod
+    @cache.cached("categories")
     def get_category_by_id(category_id):
         return db.session.get(Category, category_id)
     
     @staticmethod
+    @cache.invalidates("categories")
     def update_category(category_id, data):
-        category = db.session.get(Category, category_id)
-        if not category:
-            return None
-        
-        for key, value in data.items():
-            setattr(category, key, value)
-        
+        category = update_returning(Category, {'category_id': category_id}, data)
         db.session.commit()
         return category
     
     @staticmethod
+    @cache.invalidates("categories")
     def delete_category(category_id):
-        category = db.session.get(Category, category_id)
-        if not category:
-            return False
-        
-        db.session.delete(category)
+        deleted = delete_by_key(Category, {'category_id': category_id})
         db.session.commit()
-        return True
+        return deleted
     
\ No newline at end of file
@@ -1,4 +1,9 @@
 from api.extensions import db
+from api.pagination import keyset_paginate
+from api.streaming import stream_query
+from api.statements import update_returning, delete_by_key
+from api.bulk import bulk_insert
+from api.low_stock import refresh_low_stock
 from api.models.inventoryitems import InventoryItem 
 
 class InventoryItemService:
@@ -17,11 +22,23 @@ class InventoryItemService:
         db.session.add(new_inventory_item)
         db.session.commit()
         return new_inventory_item
+
+    @staticmethod
+    def bulk_create_inventory_items(rows, partial=False):
+        # Insert many inventory items in batches, returning the errors of skipped rows
+        errors = bulk_insert(InventoryItem, rows, partial)
+        db.session.commit()
+        return errors
     
     @staticmethod
-    def get_all_inventory_items():
-        # Retrieve all inventory items and return as a list of dictionaries
-        return InventoryItem.query.all()
+    def get_all_inventory_items(limit, after=None):
+        # Retrieve one page of inventory items ordered by their ID
+        return keyset_paginate(InventoryItem.query, (InventoryItem.item_id,), limit, after)
+
+    @staticmethod
+    def stream_all_inventory_items():
+        # Iterate over every inventory item in batches for exports
+        return stream_query(InventoryItem.query, (InventoryItem.item_id,))
     
     @staticmethod
     def get_inventory_item_by_id(item_id):
@@ -31,23 +48,15 @@ class InventoryItemService:
     @staticmethod
     def update_inventory_item(item_id, data):
         # Update an inventory item
-        inventory_item = db.session.get(InventoryItem, item_id)
-        if not inventory_item:
-            return None
-        
-        for key, value in data.items():
-            setattr(inventory_item, key, value)
-        
+        inventory_item = update_returning(InventoryItem, {'item_id': item_id}, data)
+        if inventory_item and 'stock_warning_level' in data:
+            refresh_low_stock(db.session.connection(), item_ids=[item_id])
         db.session.commit()
         return inventory_item
     
     @staticmethod
     def delete_inventory_item(item_id):
-        # Delete an inventory item by its ID
-        inventory_item = db.session.get(InventoryItem, item_id)
-        if not inventory_item:
-            return False
-        
-        db.session.delete(inventory_item)
+        # Delete an inventory item by its ID; the database cascades to its stock counts and recipes
+        deleted = delete_by_key(InventoryItem, {'item_id': item_id})
         db.session.commit()
-        return True
+        return deleted
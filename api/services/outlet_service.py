@@ -1,8 +1,14 @@
 from api.extensions import db
+from api.cache import cache
+from api.pagination import keyset_paginate
+from api.streaming import stream_query
+from api.statements import update_returning, delete_by_key
+from api.bulk import bulk_insert
 from api.models.outlets import Outlet
 
 class OutletService:
     @staticmethod
+    @cache.invalidates("outlets")
     def create_outlet(product_id, name, price):
         new_outlet = Outlet(
             product_id=product_id,
@@ -14,38 +20,44 @@ class OutletService:
         return new_outlet
 
     @staticmethod
-    def get_all_outlets():
-        return Outlet.query.all()
+    @cache.invalidates("outlets")
+    def bulk_create_outlets(rows, partial=False):
+        errors = bulk_insert(Outlet, rows, partial)
+        db.session.commit()
+        return errors
+
+    @staticmethod
+    @cache.cached("outlets")
+    def get_all_outlets(limit, after=None):
+        return keyset_paginate(Outlet.query, (Outlet.outlet_id,), limit, after)
+
+    @staticmethod
+    def stream_all_outlets():
+        return stream_query(Outlet.query, (Outlet.outlet_id,))
     
     @staticmethod
-    def get_outlets_by_product_id(product_id):
+    @cache.cached("outlets")
+    def get_outlets_by_product_id(product_id, limit, after=None):
         if not product_id:
             raise ValueError("Product ID must be provided")
         
-        return Outlet.query.filter_by(product_id=product_id).all()
+        return keyset_paginate(Outlet.query.filter_by(product_id=product_id), (Outlet.outlet_id,), limit, after)
 
     @staticmethod
+    @cache.cached("outlets")
     def get_outlet_by_id(outlet_id):
         return db.session.get(Outlet, outlet_id)
 
     @staticmethod
+    @cache.invalidates("outlets")
     def update_outlet(outlet_id, data):
-        outlet = db.session.get(Outlet, outlet_id)
-        if not outlet:
-            return None
-        
-        for key, value in data.items():
-            setattr(outlet, key, value)
-        
+        outlet = update_returning(Outlet, {'outlet_id': outlet_id}, data)
         db.session.commit()
         return outlet
 
     @staticmethod
+    @cache.invalidates("outlets")
     def delete_outlet(outlet_id):
-        outlet = db.session.get(Outlet, outlet_id)
-        if not outlet:
-            return False
-        
-        db.session.delete(outlet)
+        deleted = delete_by_key(Outlet, {'outlet_id': outlet_id})
         db.session.commit()
-        return True
+        return deleted
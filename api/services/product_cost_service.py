@@ -0,0 +1,50 @@
+from sqlalchemy import case, func, select
+from api.cache import cache
+from api.extensions import db
+from api.models.inventoryitems import InventoryItem
+from api.models.outlets import Outlet
+from api.models.recipes import Recipe
+
+class ProductCostService:
+    @staticmethod
+    @cache.cached("product_costs", depends_on=("recipes", "inventoryitems.cost"))
+    def get_product_costs():
+        """
+        Returns {product_id: (cost, takeout_cost)} for every product with a recipe,
+        where cost is Σ quantity × item cost over the dine-in ingredients and
+        takeout_cost also counts the isTakeout ones. The recipe matrix × cost vector
+        product is a single grouped SUM in the database, and the result is kept in the
+        service cache until a recipe or an item cost changes. Other item writes, such
+        as new items or warning level edits, leave it cached.
+        """
+        line_cost = Recipe.quantity * InventoryItem.cost
+        rows = db.session.execute(
+            select(
+                Recipe.product_id,
+                func.sum(case((Recipe.isTakeout.is_(False), line_cost), else_=0.0)),
+                func.sum(line_cost),
+            )
+            .join(InventoryItem, InventoryItem.item_id == Recipe.item_id)
+            .group_by(Recipe.product_id)
+        )
+        return {product_id: (cost, takeout_cost) for product_id, cost, takeout_cost in rows}
+
+    @staticmethod
+    @cache.cached("product_costs", depends_on=("recipes", "inventoryitems.cost", "outlets"))
+    def get_outlet_margins():
+        """Compares the price of every outlet with the cost of its product"""
+        costs = ProductCostService.get_product_costs()
+        margins = []
+        for outlet in db.session.execute(select(Outlet.outlet_id, Outlet.product_id, Outlet.name, Outlet.price).order_by(Outlet.outlet_id)):
+            cost, takeout_cost = costs.get(outlet.product_id, (0.0, 0.0))
+            margins.append({
+                'outlet_id': outlet.outlet_id,
+                'product_id': outlet.product_id,
+                'name': outlet.name,
+                'price': outlet.price,
+                'cost': cost,
+                'takeout_cost': takeout_cost,
+                'margin': outlet.price - cost,
+                'takeout_margin': outlet.price - takeout_cost,
+            })
+        return margins
@@ -1,10 +1,18 @@
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from api.extensions import db
+from api.cache import cache
+from api.pagination import keyset_paginate
+from api.statements import update_returning, delete_by_key
+from api.bulk import bulk_insert
 from api.models.products import Product
+from api.models.recipes import Recipe
 from api.models.tags import Tag
 from api.models.product_tags import ProductTag
 
 class ProductService:
     @staticmethod
+    @cache.invalidates("products")
     def create_product(name, variant_group_id, sku, category_id):
         new_product = Product(
             name=name,
@@ -17,36 +25,62 @@ class ProductService:
         return new_product
 
     @staticmethod
-    def get_all_products():
-        return Product.query.all()
+    @cache.invalidates("products")
+    def bulk_create_products(rows, partial=False):
+        errors = bulk_insert(Product, rows, partial)
+        db.session.commit()
+        return errors
+
+    @staticmethod
+    @cache.cached("products")
+    def get_all_products(limit, after=None):
+        return keyset_paginate(Product.query, (Product.product_id,), limit, after)
 
     @staticmethod
+    @cache.cached("products")
     def get_product_by_id(product_id):
         return db.session.get(Product, product_id)
 
     @staticmethod
+    def get_products_with_includes(limit, after=None, includes=()):
+        """
+        Retrieve one page of products with the `includes` relations loaded,
+        using one query per relation whatever the page size
+        """
+        query = Product.query.options(*ProductService._include_options(includes))
+        return keyset_paginate(query, (Product.product_id,), limit, after)
+
+    @staticmethod
+    def get_product_with_includes(product_id, includes=()):
+        return db.session.get(Product, product_id, options=ProductService._include_options(includes))
+
+    @staticmethod
+    def _include_options(includes):
+        options = {
+            "outlets": selectinload(Product.outlets),
+            "recipes": selectinload(Product.recipes).joinedload(Recipe.item),
+            "tags": selectinload(Product.tags).joinedload(ProductTag.tag),
+        }
+        return [options[name] for name in sorted(includes)]
+
+    @staticmethod
+    @cache.invalidates("products")
     def update_product(product_id, data):
-        product = db.session.get(Product, product_id)
-        if not product:
-            return None
-        
-        for key, value in data.items():
-            setattr(product, key, value)
-        
+        product = update_returning(Product, {'product_id': product_id}, data)
         db.session.commit()
         return product
 
     @staticmethod
+    @cache.invalidates("products")
     def delete_product(product_id):
-        product = db.session.get(Product, product_id)
-        if not product:
-            return False
-        
-        db.session.delete(product)
+        # The database deletes the product's tags and recipes, and refuses the delete
+        # with an IntegrityError while outlets still sell the product
+        deleted = delete_by_key(Product, {'product_id': product_id})
         db.session.commit()
-        return True
+        return deleted
     
     @staticmethod
+    @cache.invalidates("products")
     def add_tag_to_product(product_id, tag_id):
         """Attach a tag to a product"""
         product = db.session.get(Product, product_id)
@@ -61,31 +95,32 @@ class ProductService:
         return True
 
     @staticmethod
+    @cache.cached("products", depends_on=("products", "product_tags", "tags"))
     def get_product_tags(product_id):
-        """Retrieve all tags associated with a product"""
-        product_tags = ProductTag.query.filter_by(product_id=product_id).all()
-        return [{"tag_id": pt.tag_id, "name": pt.tag.name} for pt in product_tags]
+        """Retrieve all tags associated with a product in one query, or None when the product doesn't exist"""
+        rows = db.session.execute(
+            select(Product.product_id, Tag.tag_id, Tag.name)
+            .outerjoin(ProductTag, ProductTag.product_id == Product.product_id)
+            .outerjoin(Tag, Tag.tag_id == ProductTag.tag_id)
+            .where(Product.product_id == product_id)
+            .order_by(Tag.tag_id)
+        ).all()
+        if not rows:
+            return None
+        return [{"tag_id": row.tag_id, "name": row.name} for row in rows if row.tag_id is not None]
 
-    @staticmethod 
+    @staticmethod
+    @cache.invalidates("products")
     def update_product_tag(product_id, tag_id, data):
         """Update a product-tag association"""
-        product_tag = db.session.query(ProductTag).filter_by(product_id=product_id, tag_id=tag_id).first()
-        if not product_tag:
-            return None
-
-        for key, value in data.items():
-            setattr(product_tag, key, value)
-
+        product_tag = update_returning(ProductTag, {'product_id': product_id, 'tag_id': tag_id}, data)
         db.session.commit()
         return product_tag
 
     @staticmethod
+    @cache.invalidates("products")
     def remove_tag_from_product(product_id, tag_id):
         """Remove a tag from a product"""
-        product_tag = ProductTag.query.filter_by(product_id=product_id, tag_id=tag_id).first()
-        if not product_tag:
-            return False
-
-        db.session.delete(product_tag)
+        deleted = delete_by_key(ProductTag, {'product_id': product_id, 'tag_id': tag_id})
         db.session.commit()
-        return True
\ No newline at end of file
+        return deleted
\ No newline at end of file
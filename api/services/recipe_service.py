@@ -1,8 +1,14 @@
+from sqlalchemy import select
 from api.extensions import db
+from api.cache import cache
+from api.pagination import keyset_paginate
+from api.statements import update_returning, delete_by_key
+from api.bulk import bulk_insert
 from api.models.recipes import Recipe
 
 class RecipeService:
     @staticmethod
+    @cache.invalidates("recipes")
     def create_recipe(product_id, item_id, quantity, isTakeout):
         new_recipe = Recipe(
             product_id=product_id,
@@ -15,31 +21,42 @@ class RecipeService:
         return new_recipe
 
     @staticmethod
-    def get_all_recipes():
-        return Recipe.query.all()
+    @cache.invalidates("recipes")
+    def bulk_create_recipes(rows, partial=False):
+        errors = bulk_insert(Recipe, rows, partial)
+        db.session.commit()
+        return errors
+
+    @staticmethod
+    def get_all_recipes(limit, after=None):
+        return keyset_paginate(Recipe.query, (Recipe.product_id, Recipe.item_id), limit, after)
 
     @staticmethod
     def get_recipe_by_product_item(product_id, item_id):
         return db.session.query(Recipe).filter_by(product_id=product_id, item_id=item_id).first()
 
     @staticmethod
+    @cache.cached("recipes")
+    def get_recipe_vector(product_id):
+        """
+        Returns the ingredients of a product as {item_id: (quantity, isTakeout)}.
+        Kept in the in-process cache so stock depletion doesn't re-query recipes.
+        """
+        rows = db.session.execute(
+            select(Recipe.item_id, Recipe.quantity, Recipe.isTakeout).where(Recipe.product_id == product_id)
+        )
+        return {row.item_id: (row.quantity, row.isTakeout) for row in rows}
+
+    @staticmethod
+    @cache.invalidates("recipes")
     def update_recipe(product_id, item_id, data):
-        recipe = db.session.query(Recipe).filter_by(product_id=product_id, item_id=item_id).first()
-        if not recipe:
-            return None
-        
-        for key, value in data.items():
-            setattr(recipe, key, value)
-        
+        recipe = update_returning(Recipe, {'product_id': product_id, 'item_id': item_id}, data)
         db.session.commit()
         return recipe
 
     @staticmethod
+    @cache.invalidates("recipes")
     def delete_recipe(product_id, item_id):
-        recipe = db.session.query(Recipe).filter_by(product_id=product_id, item_id=item_id).first()
-        if not recipe:
-            return False
-        
-        db.session.delete(recipe)
+        deleted = delete_by_key(Recipe, {'product_id': product_id, 'item_id': item_id})
         db.session.commit()
-        return True
+        return deleted
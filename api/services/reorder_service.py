@@ -0,0 +1,64 @@
+from itertools import groupby
+from operator import attrgetter
+from flask import current_app
+from sqlalchemy import select
+from api.extensions import db
+from api.models.branchstockcount import BranchStockCount
+from api.models.inventoryitems import InventoryItem
+from api.models.suppliers import Supplier
+
+class ReorderService:
+    @staticmethod
+    def get_purchase_orders():
+        """
+        Suggests what to order for every branch in one set-based query, grouped into
+        one purchase order per supplier. A stock count is reordered when its stock on
+        hand plus on order is at or below the item's warning level, and the suggestion
+        tops it up to REORDER_TARGET_MULTIPLIER times that level.
+        """
+        multiplier = current_app.config["REORDER_TARGET_MULTIPLIER"]
+        position = BranchStockCount.in_stock + BranchStockCount.ordered_qty
+        quantity = InventoryItem.stock_warning_level * multiplier - position
+
+        rows = db.session.execute(
+            select(
+                InventoryItem.supplier_id,
+                Supplier.name.label('supplier_name'),
+                BranchStockCount.branch_id,
+                BranchStockCount.item_id,
+                InventoryItem.name,
+                InventoryItem.unit,
+                InventoryItem.cost,
+                BranchStockCount.in_stock,
+                BranchStockCount.ordered_qty,
+                quantity.label('quantity'),
+            )
+            .join(InventoryItem, InventoryItem.item_id == BranchStockCount.item_id)
+            .outerjoin(Supplier, Supplier.supplier_id == InventoryItem.supplier_id)
+            .where(position <= InventoryItem.stock_warning_level, quantity > 0)
+            .order_by(InventoryItem.supplier_id, BranchStockCount.branch_id, BranchStockCount.item_id)
+        )
+
+        purchase_orders = []
+        for supplier_id, lines in groupby(rows, key=attrgetter('supplier_id')):
+            lines = list(lines)
+            purchase_orders.append({
+                'supplier_id': supplier_id,
+                'supplier_name': lines[0].supplier_name,
+                'total_cost': sum(line.quantity * line.cost for line in lines),
+                'lines': [
+                    {
+                        'branch_id': line.branch_id,
+                        'item_id': line.item_id,
+                        'name': line.name,
+                        'unit': line.unit,
+                        'in_stock': line.in_stock,
+                        'ordered_qty': line.ordered_qty,
+                        'quantity': line.quantity,
+                        'cost': line.cost,
+                        'amount': line.quantity * line.cost,
+                    }
+                    for line in lines
+                ],
+            })
+        return purchase_orders
@@ -0,0 +1,39 @@
+from api.services.branchstockcount_service import BranchStockCountService
+from api.services.outlet_service import OutletService
+from api.services.recipe_service import RecipeService
+
+class SaleService:
+    @staticmethod
+    def record_sales(sales):
+        """
+        Depletes branch stock for a batch of sales. Each sale is exploded through the
+        recipe of the outlet's product: every ingredient counts for dine-in and takeout,
+        except isTakeout ingredients such as cups and lids, which only count for takeout.
+        Quantities are summed per (branch, item) first, so each stock count gets exactly
+        one update. Returns (stock_counts, missing) like adjust_branch_stock_counts.
+        Raises ValueError for an outlet that isn't sold as a product with a recipe,
+        since its sales would deplete nothing.
+        """
+        depletion = {}
+        for sale in sales:
+            outlet = OutletService.get_outlet_by_id(sale['outlet_id'])
+            if not outlet:
+                raise ValueError(f"Outlet {sale['outlet_id']} not found")
+            if outlet.product_id is None:
+                raise ValueError(f"Outlet {sale['outlet_id']} has no product")
+
+            recipe = RecipeService.get_recipe_vector(outlet.product_id)
+            if not recipe:
+                raise ValueError(f"Product {outlet.product_id} of outlet {sale['outlet_id']} has no recipe")
+
+            for item_id, (quantity, is_takeout) in recipe.items():
+                if is_takeout and not sale['isTakeout']:
+                    continue
+                key = (sale['branch_id'], item_id)
+                depletion[key] = depletion.get(key, 0) + quantity * sale['quantity']
+
+        adjustments = [
+            {'branch_id': branch_id, 'item_id': item_id, 'delta': -quantity}
+            for (branch_id, item_id), quantity in depletion.items()
+        ]
+        return BranchStockCountService.adjust_branch_stock_counts(adjustments)
@@ -1,4 +1,7 @@
 from api.extensions import db
+from api.pagination import keyset_paginate
+from api.statements import update_returning, delete_by_key
+from api.bulk import bulk_insert
 from api.models.suppliers import Supplier
 
 class SupplierService:
@@ -15,8 +18,14 @@ class SupplierService:
         return new_supplier
 
     @staticmethod
-    def get_all_suppliers():
-        return Supplier.query.all()
+    def bulk_create_suppliers(rows, partial=False):
+        errors = bulk_insert(Supplier, rows, partial)
+        db.session.commit()
+        return errors
+
+    @staticmethod
+    def get_all_suppliers(limit, after=None):
+        return keyset_paginate(Supplier.query, (Supplier.supplier_id,), limit, after)
 
     @staticmethod
     def get_supplier_by_id(supplier_id):
@@ -24,22 +33,12 @@ class SupplierService:
 
     @staticmethod
     def update_supplier(supplier_id, data):
-        supplier = db.session.get(Supplier, supplier_id)
-        if not supplier:
-            return None
-        
-        for key, value in data.items():
-            setattr(supplier, key, value)
-        
+        supplier = update_returning(Supplier, {'supplier_id': supplier_id}, data)
         db.session.commit()
         return supplier
 
     @staticmethod
     def delete_supplier(supplier_id):
-        supplier = db.session.get(Supplier, supplier_id)
-        if not supplier:
-            return False
-        
-        db.session.delete(supplier)
+        deleted = delete_by_key(Supplier, {'supplier_id': supplier_id})
         db.session.commit()
-        return True
+        return deleted
@@ -1,9 +1,14 @@
 from api.extensions import db
+from api.cache import cache
+from sqlalchemy import exists
+from api.pagination import keyset_paginate
+from api.statements import update_returning, delete_by_key
 from api.models.tags import Tag
 from api.models.product_tags import ProductTag
 
 class TagService:
     @staticmethod
+    @cache.invalidates("tags")
     def create_tag(name):
         """Creates a new tag"""        
         new_tag = Tag(name=name)
@@ -12,35 +17,26 @@ class TagService:
         return new_tag
 
     @staticmethod
-    def get_all_tags():
-        return Tag.query.all()
+    @cache.cached("tags")
+    def get_all_tags(limit, after=None):
+        return keyset_paginate(Tag.query, (Tag.tag_id,), limit, after)
 
     @staticmethod
+    @cache.cached("tags")
     def get_tag_by_id(tag_id):
         return db.session.get(Tag, tag_id)
 
     @staticmethod
+    @cache.invalidates("tags", "products")
     def update_tag(tag_id, data):
-        tag = db.session.get(Tag, tag_id)
-        if not tag:
-            return None
-
-        for key, value in data.items():
-            setattr(tag, key, value)
-
+        tag = update_returning(Tag, {'tag_id': tag_id}, data)
         db.session.commit()
         return tag
 
     @staticmethod
+    @cache.invalidates("tags", "products")
     def delete_tag(tag_id):
-        tag = db.session.get(Tag, tag_id)
-        if not tag:
-            return False
-        
-        # Ensure the tag isn't associated with any product before deletion
-        if ProductTag.query.filter_by(tag_id=tag_id).count() > 0:
-            return False  # Tag is still in use
-
-        db.session.delete(tag)
+        # A tag still associated with a product is not deleted
+        deleted = delete_by_key(Tag, {'tag_id': tag_id}, ~exists().where(ProductTag.tag_id == tag_id))
         db.session.commit()
-        return True
+        return deleted
@@ -0,0 +1,36 @@
+from datetime import datetime, UTC
+from sqlalchemy import delete, update
+from api.extensions import db
+
+
+def update_returning(model, key, data):
+    """
+    Applies `data` to the row of `model` whose primary key matches `key` with a single
+    UPDATE ... RETURNING, without loading the row first. Keys of `data` that are not
+    columns are ignored, as setattr on the loaded object used to.
+    Returns the updated instance, or None when no row matched. The instance is
+    detached, so reading its columns after the commit doesn't reload the row.
+    """
+    columns = model.__table__.c
+    values = {name: value for name, value in data.items() if name in columns}
+    if 'updated_at' in columns:
+        values['updated_at'] = datetime.now(UTC)
+    if not values:
+        return db.session.get(model, tuple(key.values()))
+
+    statement = update(model).filter_by(**key).values(**values).returning(model)
+    instance = db.session.execute(statement).scalar_one_or_none()
+    if instance is not None:
+        db.session.expunge(instance)
+    return instance
+
+
+def delete_by_key(model, key, *criteria):
+    """
+    Deletes the row of `model` whose primary key matches `key`, and `criteria` if
+    given, with a single DELETE. Returns whether a row was deleted.
+    """
+    statement = delete(model).filter_by(**key)
+    if criteria:
+        statement = statement.where(*criteria)
+    return db.session.execute(statement).rowcount > 0
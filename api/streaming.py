@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from flask import Response, current_app, stream_with_context
+from api.extensions import db
+
+EXPORT_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def stream_query(query, key_columns):
+    """
+    Iterates over every row of `query` ordered by `key_columns`, fetching them from
+    the database in batches of EXPORT_BATCH_SIZE. On PostgreSQL this runs on a
+    server-side cursor, so only one batch is held in memory at a time.
+    The query only runs once iteration starts, inside the streamed response.
+    """
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    statement = query.order_by(*key_columns).statement.execution_options(yield_per=batch_size)
+    yield from db.session.execute(statement).scalars()
+
+
+def export_response(rows, schema, export_format, filename):
+    """
+    Streams `rows` serialized with `schema` as an NDJSON or CSV attachment.
+    """
+    generate = _ndjson_chunks if export_format == "ndjson" else _csv_chunks
+    response = Response(stream_with_context(generate(rows, schema)), mimetype=EXPORT_MIMETYPES[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{export_format}'
+    return response
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _ndjson_chunks(rows, schema):
+    """
+    Yields one JSON document per row, grouped into chunks of EXPORT_BATCH_SIZE lines.
+    """
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    lines = []
+
+    for row in rows:
+        lines.append(json.dumps(schema.dump(row), separators=(",", ":")) + "\n")
+        if len(lines) >= batch_size:
+            yield "".join(lines)
+            lines.clear()
+
+    if lines:
+        yield "".join(lines)
+
+
+def _csv_chunks(rows, schema):
+    """
+    Yields a CSV header followed by the rows, grouped into chunks of EXPORT_BATCH_SIZE lines.
+    """
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(schema.dump_fields))
+    writer.writeheader()
+
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(schema.dump(row))
+        if index % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
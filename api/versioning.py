@@ -0,0 +1,140 @@
+from itertools import chain
+from flask import g, has_app_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from api.extensions import db
+from api.models.table_versions import TableVersion
+
+# Tables whose writes bump a version counter. Stock counts and users are left out
+# because they are written constantly and a shared counter row would serialize them.
+VERSIONED_TABLES = {
+    'branches',
+    'categories',
+    'inventoryitems',
+    'outlets',
+    'product_tags',
+    'products',
+    'recipes',
+    'suppliers',
+    'tags',
+    'inventoryitems.cost',
+}
+
+# Columns tracked by their own version, bumped only when the column's values change,
+# for readers that would otherwise be invalidated by every write to the table
+VERSIONED_COLUMNS = {
+    'inventoryitems': {'cost'},
+}
+
+
+def get_versions(tables, refresh=False):
+    """
+    Returns the current versions of `tables` as a tuple.
+    Versions are read at most once per request and reused by every later caller
+    unless `refresh` is set.
+    """
+    known = g.setdefault('table_versions', {})
+    missing = list(tables) if refresh else [table for table in tables if table not in known]
+
+    if missing:
+        rows = db.session.execute(
+            select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(missing))
+        ).all()
+        known.update(dict.fromkeys(missing, 0))
+        known.update(dict(rows))
+
+    return tuple(known[table] for table in tables)
+
+
+def cascaded_tables(table):
+    """
+    Returns `table` and every table whose rows the database deletes or updates
+    through ON DELETE foreign keys when a row of `table` is deleted.
+    """
+    tables, pending = {table}, [table]
+    while pending:
+        parent = pending.pop()
+        for child in db.metadata.sorted_tables:
+            if child.name not in tables and any(
+                fk.ondelete and fk.column.table.name == parent for fk in child.foreign_keys
+            ):
+                tables.add(child.name)
+                pending.append(child.name)
+    return tables
+
+
+def bump_versions(connection, tables):
+    """
+    Increments the versions of `tables` in the transaction of `connection`,
+    creating the counter rows on first use.
+    """
+    tables = sorted(set(tables) & VERSIONED_TABLES)
+    if not tables:
+        return
+
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    statement = insert(TableVersion.__table__).values([{'table_name': table, 'version': 1} for table in tables])
+    statement = statement.on_conflict_do_update(
+        index_elements=['table_name'],
+        set_={'version': TableVersion.__table__.c.version + 1},
+    )
+    connection.execute(statement)
+
+    if has_app_context():
+        known = g.get('table_versions', {})
+        for table in tables:
+            known.pop(table, None)
+
+################################################################
+#                    SESSION EVENTS                            #
+################################################################
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session, flush_context):
+    """
+    Bumps the tables of every row written by a unit-of-work flush.
+    """
+    tables = {
+        instance.__table__.name
+        for instance in chain(session.new, session.dirty)
+        if instance in session.new or session.is_modified(instance)
+    }
+    for instance in session.dirty:
+        for column in VERSIONED_COLUMNS.get(instance.__table__.name, ()):
+            if inspect(instance).attrs[column].history.has_changes():
+                tables.add(f"{instance.__table__.name}.{column}")
+    for instance in session.deleted:
+        tables |= cascaded_tables(instance.__table__.name)
+    bump_versions(session.connection(), tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_statement_tables(orm_execute_state):
+    """
+    Bumps the table of INSERT, UPDATE and DELETE statements run through the session,
+    which bypass the flush. A DELETE also bumps the tables it cascades to.
+    """
+    if orm_execute_state.is_insert:
+        bump_versions(orm_execute_state.session.connection(), {orm_execute_state.statement.table.name})
+    elif orm_execute_state.is_update:
+        table = orm_execute_state.statement.table.name
+        bump_versions(orm_execute_state.session.connection(), {table} | _updated_columns(orm_execute_state, table))
+    elif orm_execute_state.is_delete:
+        bump_versions(orm_execute_state.session.connection(), cascaded_tables(orm_execute_state.statement.table.name))
+
+
+def _updated_columns(orm_execute_state, table):
+    """
+    Returns the column versions of `table` an UPDATE may change: those set by the
+    statement's VALUES, whose bind parameters are named after their columns, or by
+    the parameters it runs with, as a bulk UPDATE by primary key does.
+    """
+    columns = VERSIONED_COLUMNS.get(table)
+    if not columns:
+        return set()
+
+    names = set(orm_execute_state.statement.compile().params)
+    parameters = orm_execute_state.parameters or {}
+    for row in parameters if isinstance(parameters, list) else [parameters]:
+        names.update(row)
+    return {f"{table}.{column}" for column in columns & names}
@@ -1,6 +1,7 @@
 from api import create_app
 from dotenv import load_dotenv
 from api.models import *
+from benchmarks import register_commands as register_benchmarks
 import os
 
 os.environ["PYTHONDONTWRITEBYTECODE"] = "1"
@@ -8,6 +9,7 @@ os.environ["PYTHONDONTWRITEBYTECODE"] = "1"
 load_dotenv()
 
 app = create_app()
+register_benchmarks(app)
 
 if __name__ == "__main__":
     app.run(port=5000)
@@ -0,0 +1,5 @@
+"""
+HTTP benchmarks of the API. Run them with `flask bench` against a database
+seeded with `flask seed-synthetic`.
+"""
+from .cli import register_commands
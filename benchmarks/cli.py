@@ -0,0 +1,93 @@
+import json
+import os
+import platform
+from datetime import datetime, UTC
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from benchmarks.runner import BenchClient, ServerTransport, TestClientTransport, compare, run_workload, summarize
+from benchmarks.workloads import WORKLOADS, prepare_context
+
+TRANSPORTS = {"client": TestClientTransport, "server": ServerTransport}
+
+@click.command("bench")
+@click.option("--workload", "workloads", multiple=True, type=click.Choice(sorted(WORKLOADS)), help="Workload to run; repeat for several. Defaults to all of them.")
+@click.option("--transport", type=click.Choice(sorted(TRANSPORTS)), default="client", show_default=True, help="Drive the app through the test client or a real WSGI server.")
+@click.option("--iterations", default=100, show_default=True, help="Operations per workload, scaled down for the slow ones.")
+@click.option("--concurrency", default=1, show_default=True, help="Threads sending requests at once.")
+@click.option("--output", type=click.Path(dir_okay=False), default="instance/bench/latest.json", show_default=True, help="Where the JSON results are saved.")
+@click.option("--baseline", type=click.Path(dir_okay=False), default="benchmarks/baseline.json", show_default=True, help="Results to compare against, when the file exists.")
+@click.option("--tolerance", default=0.25, show_default=True, help="Allowed slowdown of p95 latency and throughput before it counts as a regression.")
+@click.option("--save-baseline", is_flag=True, help="Store these results as the new baseline instead of comparing.")
+@click.option("--seed", default=0, show_default=True, help="Random seed of the requests.")
+@with_appcontext
+def bench(workloads, transport, iterations, concurrency, output, baseline, tolerance, save_baseline, seed):
+    """Benchmark the API with scripted workloads against the synthetic dataset."""
+    app = current_app._get_current_object()
+    results = {
+        "created_at": datetime.now(UTC).isoformat(),
+        "transport": transport,
+        "concurrency": concurrency,
+        "database": app.config["SQLALCHEMY_DATABASE_URI"].split(":", 1)[0],
+        "python": platform.python_version(),
+        "workloads": {},
+    }
+
+    # Statement counts are read from the X-DB-Queries header of every response
+    app.config["QUERY_STATS_HEADERS"] = True
+    with TRANSPORTS[transport](app) as bench_transport:
+        context = prepare_context(app, BenchClient(bench_transport.session()), seed)
+        for name in workloads or WORKLOADS:
+            workload, share = WORKLOADS[name]
+            count = max(1, round(iterations * share))
+            seconds, samples = run_workload(bench_transport, workload, context, count, concurrency)
+            results["workloads"][name] = summarize(seconds, samples, count)
+            _echo_workload(name, results["workloads"][name])
+
+    _save(output, results)
+    click.echo(f"Results saved to {output}")
+
+    if save_baseline:
+        _save(baseline, results)
+        click.echo(f"Baseline saved to {baseline}")
+        return
+
+    if not os.path.exists(baseline):
+        click.echo(f"No baseline at {baseline}; run with --save-baseline to create one")
+        return
+
+    with open(baseline, encoding="utf-8") as file:
+        previous = json.load(file)
+    if (previous.get("transport"), previous.get("concurrency")) != (transport, concurrency):
+        click.echo(f"Warning: the baseline ran with --transport {previous.get('transport')} --concurrency {previous.get('concurrency')}; latencies may not be comparable", err=True)
+
+    regressions = compare(results, previous, tolerance)
+    if regressions:
+        click.echo(click.style(f"{len(regressions)} regressions against {baseline}:", fg="red", bold=True), err=True)
+        for regression in regressions:
+            click.echo(click.style(f"  {regression}", fg="red"), err=True)
+        raise SystemExit(1)
+    click.echo(f"No regressions against {baseline}")
+
+
+def register_commands(app):
+    app.cli.add_command(bench)
+
+################################################################
+#                    HELPER FUNCTIONS                          #
+################################################################
+def _echo_workload(name, report):
+    click.echo(f"\n{name}: {report['requests']} requests in {report['seconds']}s ({report['requests_per_second']} req/s)")
+    click.echo(f"  {'endpoint':<42} {'reqs':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sql':>6}")
+    for label, endpoint in report["endpoints"].items():
+        statements = "-" if endpoint["statements"] is None else endpoint["statements"]
+        click.echo(
+            f"  {label:<42} {endpoint['requests']:>6} {endpoint['errors']:>4} "
+            f"{endpoint['p50_ms']:>9} {endpoint['p95_ms']:>9} {endpoint['p99_ms']:>9} {statements:>6}"
+        )
+
+
+def _save(path, results):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
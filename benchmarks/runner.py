@@ -0,0 +1,207 @@
+import http.client
+import json
+import threading
+import time
+from collections import defaultdict
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+# Set by the app on every response, see api.query_stats
+STATEMENTS_HEADER = "X-DB-Queries"
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+
+class TestClientTransport:
+    """Sends requests through the Flask test client, in process and without a socket."""
+    name = "client"
+
+    def __init__(self, app):
+        self.app = app
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def session(self):
+        client = self.app.test_client()
+
+        def send(method, path, headers, body):
+            # A fresh app context per request, so its session is removed afterwards as
+            # it would be in a server even when the command runs in an app context
+            with self.app.app_context():
+                response = client.open(path, method=method, headers=headers, data=body)
+                return Response(response.status_code, response.headers, response.get_data())
+
+        return send
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class ServerTransport:
+    """Serves the app with a threaded WSGI server on a free local port and sends requests over HTTP."""
+    name = "server"
+
+    def __init__(self, app):
+        self.app = app
+
+    def __enter__(self):
+        self.server = make_server("127.0.0.1", 0, self.app, threaded=True, request_handler=_QuietRequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, name="bench-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.thread.join()
+
+    def session(self):
+        port = self.server.server_port
+
+        def send(method, path, headers, body):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                return Response(response.status, response.headers, response.read())
+            finally:
+                connection.close()
+
+        return send
+
+
+class BenchClient:
+    """
+    Sends the requests of a workload and records the latency, status and statement
+    count of each one under its label.
+    """
+    def __init__(self, send, auth_header=None):
+        self._send = send
+        self.auth_header = auth_header or {}
+        self.samples = defaultdict(list)
+
+    def request(self, method, path, label, json_body=None, headers=None, expected=(200, 201, 202, 207, 304)):
+        headers = {**self.auth_header, **(headers or {})}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body)
+            headers["Content-Type"] = "application/json"
+
+        started = time.perf_counter()
+        response = self._send(method, path, headers, body)
+        elapsed = time.perf_counter() - started
+
+        statements = response.headers.get(STATEMENTS_HEADER)
+        self.samples[label].append((elapsed, response.status in expected, int(statements) if statements is not None else None))
+        return response
+
+
+def run_workload(transport, workload, context, iterations, concurrency=1):
+    """
+    Runs `iterations` operations of `workload` spread over `concurrency` threads.
+    Returns the wall time and the samples of every request by label.
+    """
+    clients = [BenchClient(transport.session(), context["auth_header"]) for _ in range(concurrency)]
+    shares = [iterations // concurrency + (index < iterations % concurrency) for index in range(concurrency)]
+    failures = []
+
+    def run(client, count, worker):
+        try:
+            for iteration in range(count):
+                workload(client, context, worker * iterations + iteration)
+        except Exception as e:
+            failures.append(e)
+
+    threads = [threading.Thread(target=run, args=(client, count, worker)) for worker, (client, count) in enumerate(zip(clients, shares))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    if failures:
+        raise failures[0]
+
+    samples = defaultdict(list)
+    for client in clients:
+        for label, values in client.samples.items():
+            samples[label].extend(values)
+    return seconds, samples
+
+
+def summarize(seconds, samples, iterations):
+    """Builds the report of one workload: throughput, and latency percentiles and statements per endpoint"""
+    requests = sum(len(values) for values in samples.values())
+    endpoints = {}
+    for label, values in sorted(samples.items()):
+        latencies = sorted(elapsed for elapsed, _, _ in values)
+        statements = [count for _, _, count in values if count is not None]
+        endpoints[label] = {
+            "requests": len(values),
+            "errors": sum(1 for _, ok, _ in values if not ok),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "statements": round(sum(statements) / len(statements), 2) if statements else None,
+        }
+
+    return {
+        "iterations": iterations,
+        "requests": requests,
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(requests / seconds, 1) if seconds else None,
+        "endpoints": endpoints,
+    }
+
+
+def percentile(values, percent):
+    """Returns the nearest-rank percentile of the sorted `values`"""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+def compare(results, baseline, tolerance):
+    """
+    Lists the regressions of `results` against `baseline`: an endpoint running an extra
+    SQL statement per request, a p95 latency or a workload throughput more than
+    `tolerance` worse, or requests that used to succeed failing.
+    """
+    regressions = []
+    for name, workload in results["workloads"].items():
+        previous = baseline.get("workloads", {}).get(name)
+        if previous is None:
+            continue
+
+        if previous["requests_per_second"] and workload["requests_per_second"] < previous["requests_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {workload['requests_per_second']} req/s, baseline {previous['requests_per_second']} req/s")
+
+        for label, endpoint in workload["endpoints"].items():
+            before = previous["endpoints"].get(label)
+            if before is None:
+                continue
+            # Averages move a little with cache warmth, so only a whole extra statement counts
+            if endpoint["statements"] is not None and before["statements"] is not None and endpoint["statements"] >= before["statements"] + 1:
+                regressions.append(f"{name} {label}: {endpoint['statements']} statements per request, baseline {before['statements']}")
+            if endpoint["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{name} {label}: p95 {endpoint['p95_ms']}ms, baseline {before['p95_ms']}ms")
+            if endpoint["errors"] and not before["errors"]:
+                regressions.append(f"{name} {label}: {endpoint['errors']} failed requests, baseline none")
+
+    return regressions
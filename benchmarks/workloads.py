@@ -0,0 +1,98 @@
+import random
+from sqlalchemy import func, select
+from api.extensions import db
+from api.models.branchstockcount import BranchStockCount
+from api.models.outlets import Outlet
+from api.models.products import Product
+
+BENCH_USER = {
+    "username": "bench",
+    "first_name": "Bench",
+    "last_name": "Mark",
+    "birth_date": "1990-01-01",
+    "sex": "M",
+    "position": "Manager",
+    "email": "bench@example.com",
+    "password": "bench-password",
+}
+
+
+def prepare_context(app, client, seed=0):
+    """
+    Logs in the benchmark user, registering it on first use, and samples the ids of
+    the dataset the workloads pick their requests from.
+    """
+    client.request("POST", "/auth/register", "POST /auth/register", json_body=BENCH_USER, expected=(201, 409))
+    response = client.request("POST", "/auth/login", "POST /auth/login", json_body={"email": BENCH_USER["email"], "password": BENCH_USER["password"]})
+    if response.status != 200:
+        raise RuntimeError(f"Benchmark login failed with status {response.status}")
+
+    with app.app_context():
+        product_ids = db.session.scalars(select(Product.product_id).order_by(func.random()).limit(1000)).all()
+        outlet_ids = db.session.scalars(select(Outlet.outlet_id).where(Outlet.product_id.is_not(None)).order_by(func.random()).limit(1000)).all()
+        stock_keys = [tuple(row) for row in db.session.execute(
+            select(BranchStockCount.branch_id, BranchStockCount.item_id).order_by(func.random()).limit(5000)
+        )]
+
+    if not product_ids or not stock_keys:
+        raise RuntimeError("The database has no products or stock counts; run flask seed-synthetic first")
+
+    return {
+        "auth_header": {"Authorization": f"Bearer {response.json['access_token']}"},
+        "product_ids": product_ids,
+        "outlet_ids": outlet_ids,
+        "stock_keys": stock_keys,
+        "branch_ids": sorted({branch_id for branch_id, _ in stock_keys}),
+        "random": random.Random(seed),
+    }
+
+
+def catalog_reads(client, context, iteration):
+    """A point-of-sale terminal loading the menu, a page of products and one product with its relations"""
+    rng = context["random"]
+    client.request("GET", "/catalog/", "GET /catalog/")
+    client.request("GET", "/products/?limit=100", "GET /products/")
+    client.request("GET", f"/products/{rng.choice(context['product_ids'])}?include=outlets,recipes,tags", "GET /products/<id>?include")
+    client.request("GET", "/product-costs/", "GET /product-costs/")
+
+
+def login_storm(client, context, iteration):
+    """Every terminal logging in at the start of a shift"""
+    client.request("POST", "/auth/login", "POST /auth/login", json_body={"email": BENCH_USER["email"], "password": BENCH_USER["password"]})
+
+
+def stock_adjustments(client, context, iteration):
+    """Terminals depleting stock: single adjustments, a batch of adjustments and a recorded sale"""
+    rng = context["random"]
+    branch_id, item_id = rng.choice(context["stock_keys"])
+    client.request("POST", f"/branchstockcounts/{branch_id}/{item_id}/adjust", "POST /branchstockcounts/<b>/<i>/adjust", json_body={"delta": -1.0})
+
+    keys = rng.sample(context["stock_keys"], min(20, len(context["stock_keys"])))
+    client.request(
+        "POST", "/branchstockcounts/adjust", "POST /branchstockcounts/adjust",
+        json_body=[{"branch_id": branch_id, "item_id": item_id, "delta": -0.5} for branch_id, item_id in keys],
+    )
+
+    if context["outlet_ids"]:
+        client.request(
+            "POST", "/sales/", "POST /sales/",
+            json_body=[{"branch_id": rng.choice(context["branch_ids"]), "outlet_id": rng.choice(context["outlet_ids"]), "quantity": 1}],
+        )
+
+
+def bulk_imports(client, context, iteration):
+    """Onboarding a supplier catalog with bulk creates of 500 inventory items"""
+    rows = [
+        {"name": f"Bench Item {iteration}-{row}", "cost": 10.0 + row % 50, "unit": "kg", "stock_warning_level": 5.0, "supplier_id": 1}
+        for row in range(500)
+    ]
+    client.request("POST", "/inventory-items/bulk", "POST /inventory-items/bulk", json_body=rows)
+
+
+# Workloads by name, with the share of --iterations each runs: logins are slow by design
+WORKLOADS = {
+    "catalog": (catalog_reads, 1.0),
+    "login": (login_storm, 0.2),
+    "stock": (stock_adjustments, 1.0),
+    "bulk": (bulk_imports, 0.2),
+}
@@ -0,0 +1,28 @@
+"""add table versions
+
+Revision ID: 3c9a7e2f41d8
+Revises: b51f9d465701
+Create Date: 2026-10-18 09:12:44.215307
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a7e2f41d8'
+down_revision = 'b51f9d465701'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,43 @@
+"""add low stock alerts
+
+Revision ID: 7d41c0b9e6a2
+Revises: 3c9a7e2f41d8
+Create Date: 2026-10-18 14:03:27.518920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d41c0b9e6a2'
+down_revision = '3c9a7e2f41d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('low_stock_alerts',
+    sa.Column('branch_id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('in_stock', sa.Float(), nullable=False),
+    sa.Column('stock_warning_level', sa.Float(), nullable=False),
+    sa.Column('shortfall', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('branch_id', 'item_id')
+    )
+    with op.batch_alter_table('low_stock_alerts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_low_stock_alerts_shortfall'), ['shortfall'], unique=False)
+
+    op.execute(
+        "INSERT INTO low_stock_alerts (branch_id, item_id, in_stock, stock_warning_level, shortfall) "
+        "SELECT b.branch_id, b.item_id, b.in_stock, i.stock_warning_level, i.stock_warning_level - b.in_stock "
+        "FROM branchstockcount b JOIN inventoryitems i ON i.item_id = b.item_id "
+        "WHERE b.in_stock <= i.stock_warning_level"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('low_stock_alerts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_low_stock_alerts_shortfall'))
+
+    op.drop_table('low_stock_alerts')
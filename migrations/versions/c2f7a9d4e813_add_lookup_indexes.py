@@ -0,0 +1,50 @@
+"""add lookup indexes
+
+Revision ID: c2f7a9d4e813
+Revises: a8e5f3c17b90
+Create Date: 2026-10-18 16:20:51.402736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f7a9d4e813'
+down_revision = 'a8e5f3c17b90'
+branch_labels = None
+depends_on = None
+
+# Secondary indexes on the columns the services filter and join on. A composite
+# primary key only serves lookups on its leading column, so item_id and tag_id
+# need their own.
+INDEXES = [
+    ('ix_outlets_product_id', 'outlets', ['product_id']),
+    ('ix_products_category_id', 'products', ['category_id']),
+    ('ix_inventoryitems_supplier_id', 'inventoryitems', ['supplier_id']),
+    ('ix_product_tags_tag_id', 'product_tags', ['tag_id']),
+    ('ix_branchstockcount_item_id', 'branchstockcount', ['item_id']),
+    ('ix_recipes_item_id', 'recipes', ['item_id']),
+    ('ix_low_stock_alerts_item_id', 'low_stock_alerts', ['item_id']),
+]
+
+
+def upgrade():
+    if op.get_context().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY keeps the tables writable but can't run in a transaction
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,79 @@
+"""cascade foreign keys
+
+Revision ID: e4b8d1a6f257
+Revises: c2f7a9d4e813
+Create Date: 2026-10-18 18:07:33.146825
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8d1a6f257'
+down_revision = 'c2f7a9d4e813'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table, referred column, ON DELETE action). outlets.product_id
+# keeps no action: a product still sold on an outlet can't be deleted
+FOREIGN_KEYS = [
+    ('branchstockcount', 'branch_id', 'branches', 'branch_id', 'CASCADE'),
+    ('branchstockcount', 'item_id', 'inventoryitems', 'item_id', 'CASCADE'),
+    ('recipes', 'product_id', 'products', 'product_id', 'CASCADE'),
+    ('recipes', 'item_id', 'inventoryitems', 'item_id', 'CASCADE'),
+    ('product_tags', 'product_id', 'products', 'product_id', 'CASCADE'),
+    ('product_tags', 'tag_id', 'tags', 'tag_id', 'CASCADE'),
+]
+
+# Foreign keys low_stock_alerts didn't have, so alerts go away with their branch or item
+NEW_FOREIGN_KEYS = [
+    ('low_stock_alerts', 'branch_id', 'branches', 'branch_id', 'CASCADE'),
+    ('low_stock_alerts', 'item_id', 'inventoryitems', 'item_id', 'CASCADE'),
+]
+
+# SQLite constraints are unnamed; batch mode names them with this convention when
+# it reflects the table so they can be dropped
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _name(table, column, referred_table):
+    if op.get_context().dialect.name == 'sqlite':
+        return f"fk_{table}_{column}_{referred_table}"
+    return f"{table}_{column}_fkey"
+
+
+def _replace_foreign_keys(foreign_keys, with_ondelete):
+    for table in dict.fromkeys(fk[0] for fk in foreign_keys):
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+            for fk_table, column, referred_table, referred_column, ondelete in foreign_keys:
+                if fk_table != table:
+                    continue
+                batch_op.drop_constraint(_name(table, column, referred_table), type_='foreignkey')
+                batch_op.create_foreign_key(
+                    _name(table, column, referred_table), referred_table, [column], [referred_column],
+                    ondelete=ondelete if with_ondelete else None,
+                )
+
+
+def upgrade():
+    _replace_foreign_keys(FOREIGN_KEYS, with_ondelete=True)
+
+    # Drop alerts whose branch or item is already gone before enforcing the keys
+    op.execute("DELETE FROM low_stock_alerts WHERE branch_id NOT IN (SELECT branch_id FROM branches) "
+               "OR item_id NOT IN (SELECT item_id FROM inventoryitems)")
+    for table in dict.fromkeys(fk[0] for fk in NEW_FOREIGN_KEYS):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for fk_table, column, referred_table, referred_column, ondelete in NEW_FOREIGN_KEYS:
+                batch_op.create_foreign_key(
+                    _name(table, column, referred_table), referred_table, [column], [referred_column], ondelete=ondelete
+                )
+
+
+def downgrade():
+    for table in dict.fromkeys(fk[0] for fk in NEW_FOREIGN_KEYS):
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+            for fk_table, column, referred_table, referred_column, ondelete in NEW_FOREIGN_KEYS:
+                batch_op.drop_constraint(_name(table, column, referred_table), type_='foreignkey')
+
+    _replace_foreign_keys(FOREIGN_KEYS, with_ondelete=False)
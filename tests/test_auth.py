@@ -1,6 +1,10 @@
 from unittest import TestCase
 from api import create_app
 from api.extensions import db
+from unittest.mock import patch
+from flask_jwt_extended import create_access_token, decode_token
+import os
+import tempfile
 
 class AuthTestCase(TestCase):
     def setUp(self):
@@ -117,3 +121,59 @@ class AuthTestCase(TestCase):
         })
 
         self.assertEqual(response.status_code, 401, "Login should fail when the password is incorrect")
+
+    def _register_and_login(self):
+        self.client.post("/auth/register", json={
+            "username": "tokenuser",
+            "first_name": "Token",
+            "middle_name": "T.",
+            "last_name": "User",
+            "birth_date": "1995-03-03",
+            "sex": "F",
+            "position": "Manager",
+            "email": "tokenuser@gmail.com",
+            "password": "tokenpassword"
+        })
+        response = self.client.post("/auth/login", json={
+            "email": "tokenuser@gmail.com",
+            "password": "tokenpassword"
+        })
+        return response.get_json()["access_token"]
+
+    def test_invalid_token_unauthorized(self):
+        response = self.client.get("/categories/", headers={"Authorization": "Bearer not.a.token"})
+
+        self.assertEqual(response.status_code, 401, "An invalid token should be rejected with 401")
+
+    def test_token_decoded_once_per_request(self):
+        token = self._register_and_login()
+        self.app.config["JWT_VERIFY_CACHE_SIZE"] = 0
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.app.config["REQUEST_LOG_PATH"] = os.path.join(tmpdir, "requests.jsonl")
+            self.app.config["REQUEST_LOG_SPOOL_PATH"] = os.path.join(tmpdir, "requests.spool")
+            with patch("api.services.auth_service.decode_token", wraps=decode_token) as decode:
+                response = self.client.post("/categories/", json={"name": "Coffee"}, headers={"Authorization": f"Bearer {token}"})
+            self.app.extensions["request_log"].stop()
+
+        self.assertEqual(response.status_code, 201, "Category should be created")
+        self.assertEqual(decode.call_count, 1, "The token should be verified once for the route and the request log")
+
+    def test_verified_token_reused_across_requests(self):
+        token = self._register_and_login()
+
+        with patch("api.services.auth_service.decode_token", wraps=decode_token) as decode:
+            for _ in range(3):
+                response = self.client.get("/categories/", headers={"Authorization": f"Bearer {token}"})
+                self.assertEqual(response.status_code, 200, "Categories should be listed")
+
+        self.assertEqual(decode.call_count, 1, "A verified token should be answered from the cache")
+
+
+    def test_token_without_expiry_is_accepted(self):
+        with self.app.app_context():
+            token = create_access_token(identity="1", expires_delta=False)
+
+        for _ in range(2):
+            response = self.client.get("/categories/", headers={"Authorization": f"Bearer {token}"})
+            self.assertEqual(response.status_code, 200, "A token without exp should be verified and cached")
@@ -0,0 +1,78 @@
+from unittest import TestCase
+from api import create_app
+from api.extensions import db
+from api.seeds.synthetic import seed_synthetic
+from benchmarks.cli import bench
+from benchmarks.runner import compare, percentile
+import json
+import os
+import tempfile
+
+class BenchmarkTestCase(TestCase):
+    def setUp(self):
+        """Set up the app, initialize the database and seed a small synthetic dataset."""
+        self.app = create_app()
+        self.app.testing = True
+        self.directory = tempfile.TemporaryDirectory()
+
+        with self.app.app_context():
+            db.create_all()
+        self.runner = self.app.test_cli_runner()
+        result = self.runner.invoke(seed_synthetic, ["--branches", "2", "--items", "20", "--products", "10"])
+        self.assertEqual(result.exit_code, 0, result.output)
+
+    def tearDown(self):
+        """Tear down the database after each test."""
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        self.directory.cleanup()
+
+    def _bench(self, *args):
+        output = os.path.join(self.directory.name, "latest.json")
+        baseline = os.path.join(self.directory.name, "baseline.json")
+        result = self.runner.invoke(bench, [
+            "--workload", "catalog", "--workload", "stock", "--iterations", "5",
+            "--output", output, "--baseline", baseline, *args
+        ])
+        return result, output, baseline
+
+    def test_bench_saves_results(self):
+        """Test that a run reports every endpoint of its workloads and saves a baseline."""
+        result, output, baseline = self._bench("--save-baseline")
+        self.assertEqual(result.exit_code, 0, result.output)
+
+        with open(output) as file:
+            results = json.load(file)
+        self.assertEqual(sorted(results["workloads"]), ["catalog", "stock"])
+        endpoint = results["workloads"]["catalog"]["endpoints"]["GET /products/<id>?include"]
+        self.assertEqual((endpoint["requests"], endpoint["errors"]), (5, 0))
+        self.assertGreater(endpoint["statements"], 0)
+        self.assertTrue(os.path.exists(baseline))
+
+    def test_bench_fails_on_regression(self):
+        """Test that more SQL statements per request than the baseline fail the run."""
+        result, output, baseline = self._bench("--save-baseline")
+        with open(baseline) as file:
+            results = json.load(file)
+        results["workloads"]["stock"]["endpoints"]["POST /sales/"]["statements"] -= 2
+        with open(baseline, "w") as file:
+            json.dump(results, file)
+
+        result, output, baseline = self._bench("--tolerance", "100")
+        self.assertEqual(result.exit_code, 1, result.exception)
+        self.assertIn("POST /sales/", result.output)
+
+    def test_compare(self):
+        """Test the regression rules on hand-written results."""
+        endpoint = {"requests": 10, "errors": 0, "p95_ms": 10.0, "statements": 3.0}
+        baseline = {"workloads": {"catalog": {"requests_per_second": 100.0, "endpoints": {"GET /catalog/": endpoint}}}}
+
+        same = {"workloads": {"catalog": {"requests_per_second": 90.0, "endpoints": {"GET /catalog/": {**endpoint, "statements": 3.5}}}}}
+        self.assertEqual(compare(same, baseline, 0.25), [])
+
+        slower = {"workloads": {"catalog": {"requests_per_second": 50.0, "endpoints": {"GET /catalog/": {**endpoint, "p95_ms": 20.0, "errors": 1}}}}}
+        self.assertEqual(len(compare(slower, baseline, 0.25)), 3)
+        self.assertEqual([percentile([1, 2, 3, 4], 50), percentile([1, 2, 3, 4], 99)], [2, 4])
@@ -268,5 +268,29 @@ class BranchTestCase(TestCase):
             auth_header = {"Authorization": self._register_and_login()}
             response = self.client.delete("/branches/999", headers=auth_header)
             self.assertEqual(response.status_code, 404)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_delete_branch_cascades_to_stock_counts(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self.client.post("/branches/", json={"name": "TLC Mandaluyong", "address": "124 Mandaluyong"}, headers=auth_header)
+            self.client.post("/inventory-items/", 
+                json={"name": "Rice", "cost": 50.0, "unit": "kg", "stock_warning_level": 10.0, "supplier_id": 1},
+                headers=auth_header
+            )
+            self.client.post("/branchstockcounts/", 
+                json={"branch_id": 1, "item_id": 1, "in_stock": 2.0, "ordered_qty": 0.0},
+                headers=auth_header
+            )
+            self.assertEqual(len(self.client.get("/branchstockcounts/low-stock", headers=auth_header).json), 1)
+
+            response = self.client.delete("/branches/1", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+
+            response = self.client.get("/branchstockcounts/1/1", headers=auth_header)
+            self.assertEqual(response.status_code, 404, "Stock counts should be deleted with their branch")
+            response = self.client.get("/branchstockcounts/low-stock", headers=auth_header)
+            self.assertEqual(response.json, [], "Low-stock alerts should be deleted with their branch")
         except ValueError as e:
             self.fail(str(e))
\ No newline at end of file
@@ -350,5 +350,228 @@ class BranchStockCountTestCase(TestCase):
             )
             self.assertEqual(response.status_code, 404)
             self.assertIn("not found", response.json["error"])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_branch_stock_counts_paginated(self):
+        """Test paging through branch stock counts on their composite key."""
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_test_data(auth_header)
+            self.client.post("/branches/", json={"name": "Branch 2", "address": "456 Test St."}, headers=auth_header)
+            self.client.post("/inventory-items/", 
+                json={"name": "Item 2", "cost": 5.0, "unit": "kg", "stock_warning_level": 2.0, "supplier_id": 1},
+                headers=auth_header
+            )
+            for branch_id, item_id in [(2, 1), (1, 2), (1, 1)]:
+                self.client.post("/branchstockcounts/", 
+                    json={"branch_id": branch_id, "item_id": item_id, "in_stock": 10.0, "ordered_qty": 0.0},
+                    headers=auth_header
+                )
+
+            keys = []
+            cursor = None
+            while True:
+                url = "/branchstockcounts/?limit=2" + (f"&after={cursor}" if cursor else "")
+                response = self.client.get(url, headers=auth_header)
+                self.assertEqual(response.status_code, 200)
+                keys.extend((row["branch_id"], row["item_id"]) for row in response.json)
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+
+            self.assertEqual(keys, [(1, 1), (1, 2), (2, 1)])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_export_branch_stock_counts_ndjson(self):
+        """Test streaming every branch stock count as NDJSON."""
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_test_data(auth_header)
+            self.client.post("/branchstockcounts/", 
+                json={"branch_id": self.branch_id, "item_id": self.item_id, "in_stock": 100.0, "ordered_qty": 20.0},
+                headers=auth_header
+            )
+
+            response = self.client.get("/branchstockcounts/export.ndjson", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "application/x-ndjson")
+            rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+            self.assertEqual(rows, [{"branch_id": self.branch_id, "item_id": self.item_id, "in_stock": 100.0, "ordered_qty": 20.0}])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_adjust_branch_stock_count(self):
+        """Test adding signed deltas to a branch stock count."""
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_test_data(auth_header)
+            self.client.post("/branchstockcounts/", 
+                json={"branch_id": self.branch_id, "item_id": self.item_id, "in_stock": 100.0, "ordered_qty": 20.0},
+                headers=auth_header
+            )
+
+            for delta in (-2.5, -7.5, 4.0):
+                response = self.client.post(
+                    f"/branchstockcounts/{self.branch_id}/{self.item_id}/adjust",
+                    json={"delta": delta},
+                    headers=auth_header
+                )
+                self.assertEqual(response.status_code, 200)
+
+            self.assertEqual(response.json["in_stock"], 94.0)
+            self.assertEqual(response.json["ordered_qty"], 20.0)
+
+            response = self.client.get(f"/branchstockcounts/{self.branch_id}/{self.item_id}", headers=auth_header)
+            self.assertEqual(response.json["in_stock"], 94.0)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_adjust_branch_stock_count_not_found(self):
+        """Test adjusting a branch stock count that doesn't exist."""
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            response = self.client.post("/branchstockcounts/999/999/adjust", json={"delta": 1.0}, headers=auth_header)
+            self.assertEqual(response.status_code, 404)
+
+            response = self.client.post("/branchstockcounts/999/999/adjust", json={}, headers=auth_header)
+            self.assertEqual(response.status_code, 400)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_adjust_branch_stock_counts_batch(self):
+        """Test applying many deltas across branches at once."""
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_test_data(auth_header)
+            self.client.post("/branches/", json={"name": "Branch 2", "address": "456 Test St."}, headers=auth_header)
+            self.client.post("/inventory-items/", 
+                json={"name": "Item 2", "cost": 5.0, "unit": "kg", "stock_warning_level": 2.0, "supplier_id": 1},
+                headers=auth_header
+            )
+            for branch_id, item_id in [(1, 1), (1, 2), (2, 1)]:
+                self.client.post("/branchstockcounts/", 
+                    json={"branch_id": branch_id, "item_id": item_id, "in_stock": 10.0, "ordered_qty": 0.0},
+                    headers=auth_header
+                )
+
+            response = self.client.post("/branchstockcounts/adjust", json=[
+                {"branch_id": 1, "item_id": 1, "delta": -1.0},
+                {"branch_id": 1, "item_id": 2, "delta": 5.0},
+                {"branch_id": 2, "item_id": 1, "delta": -3.0},
+                {"branch_id": 1, "item_id": 1, "delta": -2.0}
+            ], headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            stock = {(row["branch_id"], row["item_id"]): row["in_stock"] for row in response.json}
+            self.assertEqual(stock, {(1, 1): 7.0, (1, 2): 15.0, (2, 1): 7.0})
+
+            # A missing stock count rejects the whole batch
+            response = self.client.post("/branchstockcounts/adjust", json=[
+                {"branch_id": 1, "item_id": 1, "delta": -1.0},
+                {"branch_id": 2, "item_id": 2, "delta": -1.0}
+            ], headers=auth_header)
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.json["missing"], [{"branch_id": 2, "item_id": 2}])
+
+            response = self.client.get("/branchstockcounts/1/1", headers=auth_header)
+            self.assertEqual(response.json["in_stock"], 7.0)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_low_stock_counts(self):
+        """Test that the low-stock index follows stock and warning level writes."""
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_test_data(auth_header)
+            self.client.post("/branches/", json={"name": "Branch 2", "address": "456 Test St."}, headers=auth_header)
+            for branch_id, in_stock in [(1, 4.0), (2, 1.0)]:
+                self.client.post("/branchstockcounts/", 
+                    json={"branch_id": branch_id, "item_id": self.item_id, "in_stock": in_stock, "ordered_qty": 0.0},
+                    headers=auth_header
+                )
+
+            response = self.client.get("/branchstockcounts/low-stock", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([(row["branch_id"], row["shortfall"]) for row in response.json], [(2, 4.0), (1, 1.0)])
+
+            # Restocking branch 2 clears its alert
+            self.client.post(f"/branchstockcounts/2/{self.item_id}/adjust", json={"delta": 10.0}, headers=auth_header)
+            response = self.client.get("/branchstockcounts/low-stock", headers=auth_header)
+            self.assertEqual([row["branch_id"] for row in response.json], [1])
+
+            # Lowering the warning level clears the other one
+            self.client.put(f"/inventory-items/{self.item_id}", json={"stock_warning_level": 3.0}, headers=auth_header)
+            response = self.client.get("/branchstockcounts/low-stock", headers=auth_header)
+            self.assertEqual(response.json, [])
+
+            self.client.put(f"/branchstockcounts/1/{self.item_id}", json={"in_stock": 3.0}, headers=auth_header)
+            response = self.client.get("/branchstockcounts/low-stock?branch_id=1", headers=auth_header)
+            self.assertEqual(response.json, [{"branch_id": 1, "item_id": self.item_id, "in_stock": 3.0, "stock_warning_level": 3.0, "shortfall": 0.0}])
+
+            self.client.delete(f"/branchstockcounts/1/{self.item_id}", headers=auth_header)
+            response = self.client.get("/branchstockcounts/low-stock", headers=auth_header)
+            self.assertEqual(response.json, [])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_bulk_create_branch_stock_counts(self):
+        """Test that bulk created stock counts are inserted and indexed for low stock."""
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_test_data(auth_header)
+            self.client.post("/branches/", json={"name": "Branch 2", "address": "456 Test St."}, headers=auth_header)
+            rows = [
+                {"branch_id": 1, "item_id": self.item_id, "in_stock": 10.0, "ordered_qty": 0.0},
+                {"branch_id": 2, "item_id": self.item_id, "in_stock": 2.0, "ordered_qty": 0.0},
+                {"branch_id": 99, "item_id": self.item_id, "in_stock": 1.0, "ordered_qty": 0.0},
+            ]
+            response = self.client.post("/branchstockcounts/bulk?partial=true", json=rows, headers=auth_header)
+            self.assertEqual(response.status_code, 207)
+            self.assertEqual(response.json["created"], 2)
+            self.assertEqual([error["index"] for error in response.json["errors"]], [2], "The unknown branch should be skipped")
+
+            response = self.client.get("/branchstockcounts/low-stock", headers=auth_header)
+            self.assertEqual([(row["branch_id"], row["shortfall"]) for row in response.json], [(2, 3.0)])
+
+            response = self.client.post("/branchstockcounts/bulk", json={"branch_id": 1}, headers=auth_header)
+            self.assertEqual(response.status_code, 400, "The body should be a list of rows")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_upsert_branch_snapshot(self):
+        """Test that a physical count overwrites and creates stock counts and reports variances."""
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_test_data(auth_header)
+            self.client.post("/inventory-items/", 
+                json={"name": "Item 2", "cost": 5.0, "unit": "pcs", "stock_warning_level": 2.0, "supplier_id": 1},
+                headers=auth_header
+            )
+            self.client.post("/branchstockcounts/", 
+                json={"branch_id": 1, "item_id": 1, "in_stock": 10.0, "ordered_qty": 4.0},
+                headers=auth_header
+            )
+
+            response = self.client.put("/branchstockcounts/1/snapshot", 
+                json=[{"item_id": 2, "in_stock": 1.0}, {"item_id": 1, "in_stock": 7.5}],
+                headers=auth_header
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, [
+                {"item_id": 1, "previous": 10.0, "in_stock": 7.5, "variance": -2.5},
+                {"item_id": 2, "previous": None, "in_stock": 1.0, "variance": 1.0},
+            ])
+
+            response = self.client.get("/branchstockcounts/1/1", headers=auth_header)
+            self.assertEqual((response.json["in_stock"], response.json["ordered_qty"]), (7.5, 4.0), "Only in_stock should be overwritten")
+            response = self.client.get("/branchstockcounts/low-stock", headers=auth_header)
+            self.assertEqual([(row["item_id"], row["shortfall"]) for row in response.json], [(2, 1.0)])
+
+            response = self.client.put("/branchstockcounts/1/snapshot", 
+                json=[{"item_id": 1, "in_stock": 1.0}, {"item_id": 1, "in_stock": 2.0}],
+                headers=auth_header
+            )
+            self.assertEqual(response.status_code, 400, "An item counted twice should be rejected")
         except ValueError as e:
             self.fail(str(e))
\ No newline at end of file
@@ -0,0 +1,108 @@
+from unittest import TestCase
+from unittest.mock import patch
+from api import create_app
+from api.cache import TTLCache
+from api.extensions import db
+import json
+
+class CacheTestCase(TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+    
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+
+    def _register_and_login(self):
+        """Helper function to register and login a test user."""
+        register_response = self.client.post("/auth/register", json={
+            "username": "Testing",
+            "first_name": "Tes",
+            "middle_name": "T.",
+            "last_name": "Ing",
+            "birth_date": "1990-01-15",
+            "sex": "M",
+            "position": "Cashier",
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        if register_response.status_code != 201:
+            raise ValueError(f"Registration failed: {register_response.data}")
+        
+        login_response = self.client.post("/auth/login", json={
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        login_data = json.loads(login_response.data)
+        
+        if login_response.status_code != 200 or 'access_token' not in login_data:
+            raise ValueError(f"Login failed: {login_data}")
+            
+        return f"Bearer {login_data['access_token']}"
+
+    def test_lru_eviction(self):
+        store = TTLCache(maxsize=2, ttl=60)
+        store.set("tags", "a", 1, 0)
+        store.set("tags", "b", 2, 0)
+        store.get("tags", "a")
+        store.set("tags", "c", 3, 0)
+
+        self.assertEqual(store.get("tags", "a"), (True, 1), "Recently used entry should be kept")
+        self.assertEqual(store.get("tags", "b"), (False, None), "Least recently used entry should be evicted")
+        self.assertEqual(store.stats()["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        store = TTLCache(maxsize=2, ttl=60)
+        with patch("api.cache.time.monotonic", return_value=100.0):
+            store.set("tags", "a", 1, 0)
+        with patch("api.cache.time.monotonic", return_value=161.0):
+            self.assertEqual(store.get("tags", "a"), (False, None), "Expired entry should be a miss")
+
+    def test_invalidate_skips_stale_fill(self):
+        store = TTLCache(maxsize=2, ttl=60)
+        generation = store.generation("tags")
+        store.invalidate("tags")
+        store.set("tags", "a", 1, generation)
+        self.assertEqual(store.get("tags", "a"), (False, None), "A read that raced a write should not be cached")
+
+    def test_get_cache_stats(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self.client.post("/categories/", json={"name": "Main Meals"}, headers=auth_header)
+            first = self.client.get("/categories/", headers=auth_header)
+            second = self.client.get("/categories/", headers=auth_header)
+            self.assertEqual(first.json, second.json, "A cache hit should return the same rows")
+
+            response = self.client.get("/cache/stats", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json["namespaces"]["categories"], {"hits": 1, "misses": 1})
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_cache_stats_unauthorized(self):
+        response = self.client.get("/cache/stats")
+        self.assertIn(response.status_code, [400, 401], "Should fail without authentication")
+
+    def test_cache_sees_writes_from_other_workers(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self.client.post("/categories/", json={"name": "Main Meals"}, headers=auth_header)
+            self.client.get("/categories/1", headers=auth_header)
+
+            other_worker = create_app().test_client()
+            other_worker.put("/categories/1", json={"name": "Side Dishes"}, headers=auth_header)
+
+            response = self.client.get("/categories/1", headers=auth_header)
+            self.assertEqual(response.json["name"], "Side Dishes", "Cached category should follow the table version")
+        except ValueError as e:
+            self.fail(str(e))
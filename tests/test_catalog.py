@@ -0,0 +1,150 @@
+from unittest import TestCase
+from api import create_app
+from api.extensions import db
+import gzip
+import json
+
+class CatalogTestCase(TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+    
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+
+    def _register_and_login(self):
+        """Helper function to register and login a test user."""
+        register_response = self.client.post("/auth/register", json={
+            "username": "Testing",
+            "first_name": "Tes",
+            "middle_name": "T.",
+            "last_name": "Ing",
+            "birth_date": "1990-01-15",
+            "sex": "M",
+            "position": "Cashier",
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        if register_response.status_code != 201:
+            raise ValueError(f"Registration failed: {register_response.data}")
+        
+        login_response = self.client.post("/auth/login", json={
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        login_data = json.loads(login_response.data)
+        
+        if login_response.status_code != 200 or 'access_token' not in login_data:
+            raise ValueError(f"Login failed: {login_data}")
+            
+        return f"Bearer {login_data['access_token']}"
+
+
+    def _create_menu(self, auth_header):
+        """Helper function to create a product with its outlets, tags and category."""
+        self.client.post("/categories/", json={"name": "Main Meals"}, headers=auth_header)
+        self.client.post("/tags/", json={"name": "Bestseller"}, headers=auth_header)
+        self.client.post("/products/", 
+            json={
+                "name": "Beef Tapa",
+                "variant_group_id": "Beef-Tapa-01",
+                "sku": "123456789",
+                "category_id": 1
+            },
+            headers=auth_header
+        )
+        self.client.post("/products/1/tags/", json={"tag_id": 1}, headers=auth_header)
+        for name, price in [("In-Store", 230.0), ("GrabFood", 245.0)]:
+            self.client.post("/outlets/", json={"product_id": 1, "name": name, "price": price}, headers=auth_header)
+
+    def test_get_catalog_full(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_menu(auth_header)
+
+            response = self.client.get("/catalog/", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json["full"])
+            self.assertEqual(response.json["categories"], [{"id": 1, "name": "Main Meals"}])
+            self.assertEqual(response.json["tags"], [{"id": 1, "name": "Bestseller"}])
+            product = response.json["products"][0]
+            self.assertEqual(product["tag_ids"], [1])
+            self.assertEqual([(o["name"], o["price"]) for o in product["outlets"]], [("In-Store", 230.0), ("GrabFood", 245.0)])
+            self.assertEqual(response.headers["X-Catalog-Version"], str(response.json["version"]))
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_catalog_delta(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_menu(auth_header)
+            self.client.post("/products/", 
+                json={
+                    "name": "Pork Tapa",
+                    "variant_group_id": "Pork-Tapa-01",
+                    "sku": "987654321",
+                    "category_id": 1
+                },
+                headers=auth_header
+            )
+            version = self.client.get("/catalog/", headers=auth_header).json["version"]
+
+            self.client.put("/outlets/2", json={"price": 250.0}, headers=auth_header)
+            self.client.delete("/products/2", headers=auth_header)
+
+            response = self.client.get(f"/catalog/?since={version}", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.json["full"], "Should only return what changed")
+            self.assertGreater(response.json["version"], version)
+            self.assertEqual(response.json["categories"], [])
+            self.assertEqual([p["id"] for p in response.json["products"]], [1])
+            self.assertEqual(response.json["products"][0]["outlets"][1]["price"], 250.0)
+            self.assertEqual(response.json["removed"]["products"], [2])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_catalog_unknown_since_returns_full(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_menu(auth_header)
+            response = self.client.get("/catalog/?since=999999", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json["full"], "Should fall back to the whole catalog")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_catalog_gzip_and_not_modified(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_menu(auth_header)
+
+            response = self.client.get("/catalog/", headers={**auth_header, "Accept-Encoding": "gzip"})
+            self.assertEqual(response.headers["Content-Encoding"], "gzip")
+            self.assertEqual(json.loads(gzip.decompress(response.data))["products"][0]["sku"], "123456789")
+
+            response = self.client.get("/catalog/", headers={**auth_header, "If-None-Match": response.headers["ETag"]})
+            self.assertEqual(response.status_code, 304, "Should return 304 when the catalog did not change")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_catalog_invalid_since(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            response = self.client.get("/catalog/?since=abc", headers=auth_header)
+            self.assertEqual(response.status_code, 400)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_catalog_unauthorized(self):
+        response = self.client.get("/catalog/")
+        self.assertIn(response.status_code, [400, 401], "Should fail without authentication")
@@ -1,6 +1,7 @@
 from unittest import TestCase
 from api import create_app
 from api.extensions import db
+from sqlalchemy import event
 import json
 
 class CategoryTestCase(TestCase):
@@ -197,5 +198,68 @@ class CategoryTestCase(TestCase):
             auth_header = {"Authorization": self._register_and_login()}
             response = self.client.delete("/categories/1", headers=auth_header)
             self.assertEqual(response.status_code, 404, "Category should not be found")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_category_after_update_is_not_stale(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self.client.post("/categories/", 
+                json={"name": "Main Meals"},
+                headers=auth_header
+            )
+            self.client.get("/categories/1", headers=auth_header)
+            self.client.put("/categories/1", 
+                json={"name": "Side Dishes"},
+                headers=auth_header
+            )
+            response = self.client.get("/categories/1", headers=auth_header)
+            self.assertEqual(response.json["name"], "Side Dishes", "Cached category should be invalidated on update")
+
+            self.client.delete("/categories/1", headers=auth_header)
+            response = self.client.get("/categories/1", headers=auth_header)
+            self.assertEqual(response.status_code, 404, "Cached category should be invalidated on delete")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_categories_not_modified(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            response = self.client.get("/categories/", headers=auth_header)
+            etag = response.headers["ETag"]
+
+            response = self.client.get("/categories/", headers={**auth_header, "If-None-Match": etag})
+            self.assertEqual(response.status_code, 304, "Should return 304 when no category changed")
+
+            self.client.post("/categories/", json={"name": "Main Meals"}, headers=auth_header)
+            response = self.client.get("/categories/", headers={**auth_header, "If-None-Match": etag})
+            self.assertEqual(response.status_code, 200, "Should return the categories after one was created")
+            self.assertEqual(len(response.json), 1)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_update_and_delete_category_single_statement(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self.client.post("/categories/", json={"name": "Main Meals"}, headers=auth_header)
+
+            statements = []
+            def record(conn, cursor, statement, parameters, context, executemany):
+                if "categories" in statement:
+                    statements.append(statement.split()[0])
+            with self.app.app_context():
+                engine = db.engine
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                response = self.client.put("/categories/1", json={"name": "Side Dishes"}, headers=auth_header)
+                self.assertEqual(response.status_code, 200)
+                response = self.client.delete("/categories/1", headers=auth_header)
+                self.assertEqual(response.status_code, 200)
+                response = self.client.delete("/categories/1", headers=auth_header)
+                self.assertEqual(response.status_code, 404, "Should detect the missing row from the rowcount")
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+
+            self.assertEqual(statements, ["UPDATE", "DELETE", "DELETE"], "Writes should not load the row first")
         except ValueError as e:
             self.fail(str(e))
\ No newline at end of file
@@ -0,0 +1,153 @@
+from unittest import TestCase
+from api import create_app
+from api.csv_import import import_csv_command
+from api.extensions import db
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+
+class CsvImportTestCase(TestCase):
+    def setUp(self):
+        """Set up the test client and initialize the database."""
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.testing = True
+        self.directory = tempfile.TemporaryDirectory()
+        self.app.config["IMPORT_DIR"] = self.directory.name
+        self.app.config["IMPORT_CHUNK_SIZE"] = 2
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Tear down the database after each test."""
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        self.directory.cleanup()
+
+    def _register_and_login(self):
+        """Helper function to register and login a test user."""
+        register_response = self.client.post("/auth/register", json={
+            "username": "Testing",
+            "first_name": "Tes",
+            "middle_name": "T.",
+            "last_name": "Ing",
+            "birth_date": "1990-01-15",
+            "sex": "M",
+            "position": "Cashier",
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        if register_response.status_code != 201:
+            raise ValueError(f"Registration failed: {register_response.data}")
+        
+        login_response = self.client.post("/auth/login", json={
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        login_data = json.loads(login_response.data)
+        
+        if login_response.status_code != 200 or 'access_token' not in login_data:
+            raise ValueError(f"Login failed: {login_data}")
+            
+        return {"Authorization": f"Bearer {login_data['access_token']}"}
+
+    def _write_csv(self, name, rows):
+        """Helper function to write rows to a CSV file in the import directory."""
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerows(rows)
+        return path
+
+    def test_import_inventory_items_command(self):
+        """Test importing inventory items from the CLI, with bad rows sent to the rejects file."""
+        try:
+            auth_header = self._register_and_login()
+            self.client.post("/suppliers/", 
+                json={"name": "Bean Co", "email": "beans@gmail.com", "phone": "9991114444", "country_code": "+63"},
+                headers=auth_header
+            )
+            path = self._write_csv("items.csv", [
+                ["id", "name", "cost", "unit", "stock_warning_level", "supplier_id"],
+                ["", "Beans", "500", "kg", "5", "1"],
+                ["", "Milk", "not a number", "l", "10", "1"],
+                ["", "Sugar", "50", "kg", "10", "1"],
+                ["", "Cups", "2", "pc", "100", ""],
+                ["", "Lids", "1", "pc", "100", "1"],
+            ])
+
+            result = self.app.test_cli_runner().invoke(import_csv_command, ["inventory-items", path])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn("Imported 3 of 5 inventory-items rows", result.output)
+            self.assertIn("2 rejected rows written to", result.output)
+
+            response = self.client.get("/inventory-items/", headers=auth_header)
+            self.assertEqual([item["name"] for item in response.json], ["Beans", "Sugar", "Lids"])
+
+            with open(os.path.join(self.directory.name, "items.rejects.csv"), newline="") as file:
+                rejects = list(csv.DictReader(file))
+            self.assertEqual([(reject["row"], reject["name"]) for reject in rejects], [("2", "Milk"), ("4", "Cups")])
+            self.assertIn("cost", json.loads(rejects[0]["errors"]))
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_import_branch_stock_counts_upload(self):
+        """Test uploading a stock count CSV, which upserts rows in a background job."""
+        try:
+            auth_header = self._register_and_login()
+            self.client.post("/branches/", json={"name": "Branch 1", "address": "123 Test St."}, headers=auth_header)
+            for name in ["Beans", "Milk"]:
+                self.client.post("/inventory-items/", 
+                    json={"name": name, "cost": 10.0, "unit": "kg", "stock_warning_level": 5.0, "supplier_id": 1},
+                    headers=auth_header
+                )
+            self.client.post("/branchstockcounts/", 
+                json={"branch_id": 1, "item_id": 1, "in_stock": 50.0, "ordered_qty": 0.0},
+                headers=auth_header
+            )
+
+            body = "branch_id,item_id,in_stock,ordered_qty\n1,1,3,2\n1,2,20,0\n1,3,1,0\n"
+            response = self.client.post("/imports/branchstockcounts", 
+                data={"file": (io.BytesIO(body.encode()), "counts.csv")},
+                headers=auth_header
+            )
+            self.assertEqual(response.status_code, 202)
+
+            deadline = time.monotonic() + 10
+            while True:
+                job = self.client.get(response.headers["Location"], headers=auth_header)
+                if job.json["status"] in ("finished", "failed") or time.monotonic() > deadline:
+                    break
+                time.sleep(0.05)
+
+            self.assertEqual(job.json["status"], "finished", job.json["error"])
+            self.assertEqual((job.json["result"]["imported"], job.json["result"]["rejected"]), (2, 1))
+
+            response_counts = self.client.get("/branchstockcounts/1/1", headers=auth_header)
+            self.assertEqual((response_counts.json["in_stock"], response_counts.json["ordered_qty"]), (3.0, 2.0), "Existing stock counts should be overwritten")
+            low_stock = self.client.get("/branchstockcounts/low-stock", headers=auth_header)
+            self.assertEqual([row["item_id"] for row in low_stock.json], [1])
+
+            rejects = self.client.get(response.json["rejects"], headers=auth_header)
+            self.assertEqual(rejects.status_code, 200)
+            self.assertEqual(list(csv.DictReader(io.StringIO(rejects.get_data(as_text=True))))[0]["item_id"], "3")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_import_unknown_resource(self):
+        """Test that only importable resources are accepted."""
+        try:
+            auth_header = self._register_and_login()
+            response = self.client.post("/imports/users", data="name\nx\n", content_type="text/csv", headers=auth_header)
+            self.assertEqual(response.status_code, 404)
+        except ValueError as e:
+            self.fail(str(e))
@@ -0,0 +1,36 @@
+from unittest import TestCase
+from sqlalchemy import inspect
+from api import create_app
+from api.extensions import db
+
+# Columns the services filter or join on. Every one of them must lead an index,
+# otherwise the lookup scans the whole table.
+FILTER_COLUMNS = [
+    ('outlets', 'product_id'),
+    ('products', 'category_id'),
+    ('inventoryitems', 'supplier_id'),
+    ('product_tags', 'product_id'),
+    ('product_tags', 'tag_id'),
+    ('branchstockcount', 'branch_id'),
+    ('branchstockcount', 'item_id'),
+    ('recipes', 'product_id'),
+    ('recipes', 'item_id'),
+    ('low_stock_alerts', 'shortfall'),
+    ('low_stock_alerts', 'item_id'),
+]
+
+class DatabaseIndexTestCase(TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+
+    def test_filter_columns_are_indexed(self):
+        with self.app.app_context():
+            inspector = inspect(db.engine)
+            for table, column in FILTER_COLUMNS:
+                leading_columns = {index['column_names'][0] for index in inspector.get_indexes(table)}
+                leading_columns.add(inspector.get_pk_constraint(table)['constrained_columns'][0])
+                self.assertIn(column, leading_columns, f"{table}.{column} is filtered on but has no index")
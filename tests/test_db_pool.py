@@ -0,0 +1,73 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from api import create_app
+from api.config import Config
+from api.db_pool import _limit_request_statements, engine_options, warm_pool
+from api.extensions import db
+
+
+class DbPoolTestCase(TestCase):
+    def _config(self, **overrides):
+        config = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+        config.update(overrides)
+        return config
+
+    def test_postgresql_engine_options(self):
+        options = engine_options(self._config(
+            SQLALCHEMY_DATABASE_URI="postgresql+psycopg2://user:secret@db/tlc",
+            DB_POOL_SIZE=15, DB_MAX_OVERFLOW=5, DB_STATEMENT_TIMEOUT_MS=5000,
+        ))
+
+        self.assertEqual(options['pool_size'], 15)
+        self.assertEqual(options['max_overflow'], 5)
+        self.assertTrue(options['pool_pre_ping'])
+        self.assertNotIn('options', options['connect_args'], "The statement timeout should only apply to requests")
+        self.assertEqual(options['connect_args']['keepalives'], 1)
+        self.assertEqual(options['connect_args']['connect_timeout'], Config.DB_CONNECT_TIMEOUT)
+
+    def test_sqlite_engine_options(self):
+        options = engine_options(self._config(SQLALCHEMY_DATABASE_URI="sqlite://"))
+
+        self.assertNotIn('pool_size', options)
+        self.assertNotIn('connect_args', options)
+
+        options = engine_options(self._config(SQLALCHEMY_DATABASE_URI="sqlite:////tmp/tlc.db", DB_POOL_SIZE=7, DB_POOL_TIMEOUT=3, DB_POOL_WARMUP=0))
+
+        self.assertEqual(options['pool_size'], 7, "A SQLite file is pooled like a server database")
+        self.assertEqual(options['pool_timeout'], 3)
+        self.assertNotIn('connect_args', options)
+
+    def test_statement_timeout_only_in_requests(self):
+        app = create_app()
+        app.config["DB_STATEMENT_TIMEOUT_MS"] = 5000
+        connection = MagicMock()
+        connection.dialect.name = "postgresql"
+
+        with app.app_context():
+            _limit_request_statements(None, None, connection)
+        connection.exec_driver_sql.assert_not_called()
+
+        with app.test_request_context("/"):
+            _limit_request_statements(None, None, connection)
+        connection.exec_driver_sql.assert_called_once_with("SET LOCAL statement_timeout = 5000")
+
+    def test_invalid_pool_settings(self):
+        with self.assertRaises(ValueError) as context:
+            engine_options(self._config(DB_POOL_SIZE=0, DB_POOL_WARMUP=5, DB_POOL_TIMEOUT=0))
+
+        message = str(context.exception)
+        self.assertIn("DB_POOL_SIZE must be at least 1", message)
+        self.assertIn("DB_POOL_TIMEOUT must be positive", message)
+        self.assertIn("DB_POOL_WARMUP must be between 0 and DB_POOL_SIZE", message)
+
+    def test_warm_pool_opens_connections(self):
+        app = create_app()
+        app.config["DB_POOL_WARMUP"] = 3
+        with app.app_context():
+            engine = db.engines[None]
+            engine.dispose()
+            # SQLite pools are never warmed, so pose as a server database
+            with patch.object(engine.dialect, 'name', "mysql"):
+                warm_pool(app)
+            self.assertEqual(engine.pool.checkedin(), 3)
+            engine.dispose()
@@ -250,4 +250,31 @@ class InventoryItemTestCase(TestCase):
             response = self.client.delete("/inventory-items/999", headers=auth_header)
             self.assertEqual(response.status_code, 404, "Should return 404 when inventory item is not found")
         except ValueError as e:
-            self.fail(str(e))
\ No newline at end of file
+            self.fail(str(e))
+
+    def test_export_inventory_items_csv(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            for name in ["Item 1", "Item 2"]:
+                self.client.post("/inventory-items/", 
+                    json={
+                        "name": name,
+                        "cost": 100.00,
+                        "unit": "kg",
+                        "stock_warning_level": 10.0,
+                        "supplier_id": 1
+                    },
+                    headers=auth_header
+                )
+            response = self.client.get("/inventory-items/export.csv", headers=auth_header)
+            self.assertEqual(response.status_code, 200, "Should stream inventory items as CSV")
+            self.assertEqual(response.mimetype, "text/csv")
+            lines = response.get_data(as_text=True).splitlines()
+            self.assertEqual(lines[0], "id,name,cost,unit,stock_warning_level,supplier_id")
+            self.assertEqual(lines[1:], ["1,Item 1,100.0,kg,10.0,1", "2,Item 2,100.0,kg,10.0,1"])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_export_inventory_items_unauthorized(self):
+        response = self.client.get("/inventory-items/export.csv")
+        self.assertIn(response.status_code, [400, 401], "Should fail without authentication")
\ No newline at end of file
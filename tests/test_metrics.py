@@ -0,0 +1,160 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest import TestCase
+from api import create_app
+from api.extensions import db
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+
+    def _metrics(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        return response.get_data(as_text=True)
+
+    def test_request_metrics(self):
+        self.client.get('/')
+        self.client.get('/')
+        self.client.get('/does-not-exist')
+
+        body = self._metrics()
+
+        self.assertIn('http_requests_total{blueprint="index",endpoint="index.index",method="GET",status="200"} 2', body)
+        self.assertIn('http_requests_total{blueprint="",endpoint="unmatched",method="GET",status="404"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{blueprint="index",endpoint="index.index",le="+Inf"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{blueprint="index",endpoint="index.index"} 2', body)
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        # The scrape itself is in flight while it renders
+        self.assertIn("http_requests_in_flight 1", body)
+        self.assertIn("db_pool_checkout_wait_seconds_count", body)
+
+    def test_cache_metrics(self):
+        with self.app.app_context():
+            store = self.app.extensions['cache']
+            store.set("tags", "a", 1, 0)
+            store.get("tags", "a")
+            store.get("tags", "a")
+            store.get("tags", "b")
+
+        body = self._metrics()
+
+        self.assertIn('cache_hits_total{cache="read",namespace="tags"} 2', body)
+        self.assertIn('cache_misses_total{cache="read",namespace="tags"} 1', body)
+        self.assertIn('cache_entries{cache="read"} 1', body)
+        self.assertIn('cache_hit_ratio{cache="read"} 0.6666666666666666', body)
+
+    def test_multi_process_aggregation(self):
+        """Counters of every worker are summed; gauges of exited workers are dropped"""
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+
+        with tempfile.TemporaryDirectory() as directory:
+            metrics = self.app.extensions['metrics']
+            metrics.directory = directory
+            labels = [["blueprint", "index"], ["endpoint", "index.index"], ["method", "GET"], ["status", "200"]]
+            with open(os.path.join(directory, f"metrics-{exited.pid}.json"), "w", encoding="utf-8") as file:
+                json.dump({
+                    'pid': exited.pid,
+                    'counters': [["http_requests_total", labels, 5]],
+                    'gauges': [["http_requests_in_flight", [], 3]],
+                    'histograms': [],
+                }, file)
+
+            self.client.get('/')
+            body = self._metrics()
+
+            self.assertTrue(os.path.exists(os.path.join(directory, f"metrics-{os.getpid()}.json")))
+            self.assertFalse(os.path.exists(os.path.join(directory, f"metrics-{exited.pid}.json")), "Exited workers should be archived")
+            self.assertTrue(os.path.exists(os.path.join(directory, "archive.json")))
+
+            self.assertIn('http_requests_total{blueprint="index",endpoint="index.index",method="GET",status="200"} 6', body)
+            self.assertIn("http_requests_in_flight 1", body)
+
+            body = self._metrics()
+
+        self.assertIn('http_requests_total{blueprint="index",endpoint="index.index",method="GET",status="200"} 6', body)
+
+    def test_reused_pid_keeps_earlier_counters(self):
+        """A worker given the pid of an exited one archives its file instead of overwriting it"""
+        with tempfile.TemporaryDirectory() as directory:
+            metrics = self.app.extensions['metrics']
+            metrics.directory = directory
+            labels = [["blueprint", "index"], ["endpoint", "index.index"], ["method", "GET"], ["status", "200"]]
+            with open(os.path.join(directory, f"metrics-{os.getpid()}.json"), "w", encoding="utf-8") as file:
+                json.dump({
+                    'pid': os.getpid(),
+                    'token': "exited-worker",
+                    'counters': [["http_requests_total", labels, 5]],
+                    'gauges': [],
+                    'histograms': [],
+                }, file)
+
+            self.client.get('/')
+            body = self._metrics()
+
+        self.assertIn('http_requests_total{blueprint="index",endpoint="index.index",method="GET",status="200"} 6', body)
+
+    def test_worker_flush_includes_cache_counters(self):
+        """A worker's periodic flush writes its cache counters, not only its request counts"""
+        with tempfile.TemporaryDirectory() as directory:
+            metrics = self.app.extensions['metrics']
+            metrics.directory = directory
+            metrics.flush_interval = 0
+
+            pid = os.fork()
+            if pid == 0:
+                # The second worker serves a request that reads its cache, then exits
+                try:
+                    with self.app.test_request_context('/'):
+                        store = self.app.extensions['cache']
+                        store.set("tags", "a", 1, 0)
+                        store.get("tags", "a")
+                        store.get("tags", "a")
+                        metrics.maybe_flush()
+                finally:
+                    os._exit(0)
+            os.waitpid(pid, 0)
+
+            with open(os.path.join(directory, f"metrics-{pid}.json"), encoding="utf-8") as file:
+                counters = {name for name, _, _ in json.load(file)['counters']}
+            self.assertIn("cache_hits_total", counters)
+
+            body = self._metrics()
+
+        self.assertIn('cache_hits_total{cache="read",namespace="tags"} 2', body)
+        self.assertIn('cache_hit_ratio{cache="read"} 1', body)
+
+    def test_exited_thread_shards_are_retired(self):
+        metrics = self.app.extensions['metrics']
+
+        def count():
+            metrics.inc('http_requests_total', {'endpoint': "test"})
+
+        for _ in range(50):
+            thread = threading.Thread(target=count)
+            thread.start()
+            thread.join()
+
+        snapshot = metrics.snapshot()
+
+        self.assertLessEqual(len(metrics._shards), 1, "Shards of exited threads should be folded away")
+        self.assertIn(["http_requests_total", [("endpoint", "test")], 50], snapshot['counters'])
@@ -1,6 +1,7 @@
 from unittest import TestCase
 from api import create_app
 from api.extensions import db
+from api.models.products import Product
 import json
 
 class OutletTestCase(TestCase):
@@ -11,6 +12,12 @@ class OutletTestCase(TestCase):
 
         with self.app.app_context():
             db.create_all()
+            # Outlets reference products, and the database enforces the foreign key
+            db.session.add_all([
+                Product(name="Beef Tapa", variant_group_id="Beef-Tapa-01", sku="123456789", category_id=1),
+                Product(name="Pork Tapa", variant_group_id="Pork-Tapa-01", sku="987654321", category_id=1)
+            ])
+            db.session.commit()
     
     def tearDown(self):
         with self.app.app_context():
@@ -1,7 +1,10 @@
 from unittest import TestCase
 from api import create_app
 from api.extensions import db
+from contextlib import contextmanager
+from sqlalchemy import event
 import json
+import sqlite3
 
 class ProductTestCase(TestCase):
     def setUp(self):
@@ -418,6 +421,10 @@ class ProductTestCase(TestCase):
                 json={"name": "Malupit na Tapa"},
                 headers=auth_header
             )
+            self.client.post("/tags/", 
+                json={"name": "Masarap na Tapa"},
+                headers=auth_header
+            )
             self.client.post("/products/1/tags/", 
                 json={"tag_id": 1},
                 headers=auth_header
@@ -471,5 +478,321 @@ class ProductTestCase(TestCase):
             auth_header = {"Authorization": self._register_and_login()}
             response = self.client.delete("/products/1/tags/999", headers=auth_header)
             self.assertEqual(response.status_code, 404)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_products_paginated(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            for index in range(3):
+                self.client.post("/products/", 
+                    json={
+                        "name": f"Beef Tapa {index}",
+                        "variant_group_id": "Beef-Tapa-01",
+                        "sku": f"12345678{index}",
+                        "category_id": 1
+                    },
+                    headers=auth_header
+                )
+
+            first_page = self.client.get("/products/?limit=2", headers=auth_header)
+            self.assertEqual(first_page.status_code, 200)
+            self.assertEqual([p["sku"] for p in first_page.json], ["123456780", "123456781"])
+            self.assertIn("X-Next-Cursor", first_page.headers, "Should return a cursor when more rows exist")
+
+            cursor = first_page.headers["X-Next-Cursor"]
+            second_page = self.client.get(f"/products/?limit=2&after={cursor}", headers=auth_header)
+            self.assertEqual(second_page.status_code, 200)
+            self.assertEqual([p["sku"] for p in second_page.json], ["123456782"])
+            self.assertNotIn("X-Next-Cursor", second_page.headers, "Should not return a cursor on the last page")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_products_invalid_page_args(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            response = self.client.get("/products/?limit=0", headers=auth_header)
+            self.assertEqual(response.status_code, 400, "Should reject a limit below 1")
+            response = self.client.get("/products/?after=not-a-cursor", headers=auth_header)
+            self.assertEqual(response.status_code, 400, "Should reject a malformed cursor")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_product_not_modified(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self.client.post("/products/", 
+                json={
+                    "name": "Beef Tapa",
+                    "variant_group_id": "Beef-Tapa-01",
+                    "sku": "123456789",
+                    "category_id": 1
+                },
+                headers=auth_header
+            )
+            response = self.client.get("/products/1", headers=auth_header)
+            etag = response.headers.get("ETag")
+            self.assertIsNotNone(etag, "Should return an ETag")
+            self.assertFalse(etag.startswith("W/"), "ETag should be strong")
+
+            response = self.client.get("/products/1", headers={**auth_header, "If-None-Match": etag})
+            self.assertEqual(response.status_code, 304, "Should return 304 when the product did not change")
+            self.assertEqual(response.data, b"")
+
+            self.client.put("/products/1", json={"name": "Pork Tapa"}, headers=auth_header)
+            response = self.client.get("/products/1", headers={**auth_header, "If-None-Match": etag})
+            self.assertEqual(response.status_code, 200, "Should return the product again after it changed")
+            self.assertEqual(response.json["name"], "Pork Tapa")
+            self.assertNotEqual(response.headers["ETag"], etag)
+        except ValueError as e:
+            self.fail(str(e))
+
+    @contextmanager
+    def _count_queries(self):
+        """Counts the SQL statements run inside the block."""
+        statements = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+    def _create_tagged_products(self, auth_header, count):
+        """Helper function to create products that carry two tags each."""
+        for name in ("Bestseller", "Spicy"):
+            self.client.post("/tags/", json={"name": name}, headers=auth_header)
+        for index in range(count):
+            response = self.client.post("/products/", 
+                json={
+                    "name": f"Beef Tapa {index}",
+                    "variant_group_id": "Beef-Tapa-01",
+                    "sku": f"12345678{index}",
+                    "category_id": 1
+                },
+                headers=auth_header
+            )
+            self.assertEqual(response.status_code, 201)
+        for product_id in range(1, count + 1):
+            for tag_id in (1, 2):
+                self.client.post(f"/products/{product_id}/tags/", json={"tag_id": tag_id}, headers=auth_header)
+
+    def test_get_products_include_tags(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_tagged_products(auth_header, 1)
+            with self._count_queries() as one_product:
+                response = self.client.get("/products/?include=tags", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+
+            for index in range(1, 5):
+                self.client.post("/products/", 
+                    json={"name": f"Pork Tapa {index}", "variant_group_id": "Pork-Tapa-01", "sku": f"98765432{index}", "category_id": 1},
+                    headers=auth_header
+                )
+                self.client.post(f"/products/{index + 1}/tags/", json={"tag_id": 2}, headers=auth_header)
+            with self._count_queries() as five_products:
+                response = self.client.get("/products/?include=tags", headers=auth_header)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json), 5)
+            self.assertEqual([tag["name"] for tag in response.json[0]["tags"]], ["Bestseller", "Spicy"])
+            self.assertEqual([tag["name"] for tag in response.json[4]["tags"]], ["Spicy"])
+            self.assertEqual(len(five_products), len(one_product), "Tags should load in a fixed number of statements")
+            self.assertLessEqual(len(five_products), 3, "Versions, one products page and one tags query")
+
+            response = self.client.get("/products/?include=suppliers", headers=auth_header)
+            self.assertEqual(response.status_code, 400, "Should reject an unsupported include")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_product_tags_single_query(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_tagged_products(auth_header, 1)
+            with self._count_queries() as statements:
+                response = self.client.get("/products/1/tags/", headers=auth_header)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json), 2)
+            self.assertLessEqual(len(statements), 2, "Versions and one joined tags query")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_products_compound_include(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_tagged_products(auth_header, 3)
+            self.client.post("/inventory-items/", 
+                json={"name": "Beef", "cost": 300.0, "unit": "kg", "stock_warning_level": 5.0, "supplier_id": 1},
+                headers=auth_header
+            )
+            for product_id in (1, 2, 3):
+                self.client.post("/outlets/", json={"product_id": product_id, "name": "Dine In", "price": 150.0}, headers=auth_header)
+                self.client.post("/outlets/", json={"product_id": product_id, "name": "Delivery", "price": 180.0}, headers=auth_header)
+                self.client.post("/recipes/", 
+                    json={"product_id": product_id, "item_id": 1, "quantity": 0.2, "isTakeout": False},
+                    headers=auth_header
+                )
+
+            with self._count_queries() as statements:
+                response = self.client.get("/products/?include=outlets,recipes,tags", headers=auth_header)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json), 3)
+            product = response.json[2]
+            self.assertEqual([outlet["name"] for outlet in product["outlets"]], ["Dine In", "Delivery"])
+            self.assertEqual(product["recipes"], [{"item_id": 1, "item_name": "Beef", "unit": "kg", "quantity": 0.2, "isTakeout": False}])
+            self.assertEqual([tag["name"] for tag in product["tags"]], ["Bestseller", "Spicy"])
+            self.assertLessEqual(len(statements), 5, "Versions, one products page and one query per relation")
+
+            response = self.client.get("/products/2?include=recipes", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json["recipes"][0]["item_name"], "Beef")
+            self.assertNotIn("outlets", response.json)
+
+            response = self.client.get("/products/2", headers=auth_header)
+            self.assertNotIn("tags", response.json)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_delete_product_cascades(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_tagged_products(auth_header, 1)
+            self.client.post("/inventory-items/", 
+                json={"name": "Beef", "cost": 300.0, "unit": "kg", "stock_warning_level": 5.0, "supplier_id": 1},
+                headers=auth_header
+            )
+            self.client.post("/recipes/", json={"product_id": 1, "item_id": 1, "quantity": 0.2, "isTakeout": False}, headers=auth_header)
+            self.client.post("/outlets/", json={"product_id": 1, "name": "Dine In", "price": 150.0}, headers=auth_header)
+            recipe = self.client.get("/recipes/1/1", headers=auth_header)
+
+            response = self.client.delete("/products/1", headers=auth_header)
+            self.assertEqual(response.status_code, 409, "A product still sold on an outlet should not be deleted")
+            self.assertEqual(self.client.get("/recipes/1/1", headers=auth_header).status_code, 200)
+
+            self.client.delete("/outlets/1", headers=auth_header)
+            response = self.client.delete("/products/1", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+
+            self.assertEqual(self.client.get("/recipes/1/1", headers=auth_header).status_code, 404, "Recipes should be deleted with their product")
+            response = self.client.get("/recipes/1/1", headers={**auth_header, "If-None-Match": recipe.headers["ETag"]})
+            self.assertEqual(response.status_code, 404, "The cascade should change the recipes ETag")
+            self.assertEqual(self.client.get("/tags/1", headers=auth_header).status_code, 200, "Tags themselves should remain")
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_bulk_create_products(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            rows = [
+                {"name": f"Product {i}", "variant_group_id": f"Group-{i}", "sku": f"SKU-{i:04d}", "category_id": 1}
+                for i in range(5)
+            ]
+            response = self.client.post("/products/bulk", json=rows, headers=auth_header)
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(response.json, {"created": 5, "errors": []})
+
+            response = self.client.get("/products/", headers=auth_header)
+            self.assertEqual([product["sku"] for product in response.json], [row["sku"] for row in rows])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_bulk_create_products_all_or_nothing(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            rows = [
+                {"name": "Beef Tapa", "variant_group_id": "Beef-Tapa-01", "sku": "123456789", "category_id": 1},
+                {"name": "Pork Tapa", "variant_group_id": "Pork-Tapa-01", "sku": "123456789", "category_id": 1},
+            ]
+            response = self.client.post("/products/bulk", json=rows, headers=auth_header)
+            self.assertEqual(response.status_code, 409, "A duplicate SKU should abort the whole batch")
+
+            response = self.client.post("/products/bulk", json=[rows[0], {"name": "Pork Tapa"}], headers=auth_header)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("1", response.json["error"], "Validation errors should be reported by row index")
+
+            response = self.client.get("/products/", headers=auth_header)
+            self.assertEqual(response.json, [])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_bulk_create_products_partial(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            rows = [
+                {"name": "Beef Tapa", "variant_group_id": "Beef-Tapa-01", "sku": "123456789", "category_id": 1},
+                {"name": "Pork Tapa", "variant_group_id": "Pork-Tapa-01", "sku": "123456789", "category_id": 1},
+                {"name": "Tocino", "variant_group_id": "Tocino-01"},
+                {"name": "Longganisa", "variant_group_id": "Longganisa-01", "sku": "987654321", "category_id": 1},
+            ]
+            response = self.client.post("/products/bulk?partial=true", json=rows, headers=auth_header)
+            self.assertEqual(response.status_code, 207)
+            self.assertEqual(response.json["created"], 2)
+            self.assertEqual([error["index"] for error in response.json["errors"]], [1, 2])
+            self.assertIn("sku", response.json["errors"][1]["errors"])
+
+            response = self.client.get("/products/", headers=auth_header)
+            self.assertEqual([product["name"] for product in response.json], ["Beef Tapa", "Longganisa"])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_bulk_create_products_partial_skips_data_errors(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            rows = [
+                {"name": "Beef Tapa", "variant_group_id": "Beef-Tapa-01", "sku": "123456789", "category_id": 1},
+                {"name": "Pork Tapa", "variant_group_id": "Pork-Tapa-01", "sku": "999999999", "category_id": 1},
+            ]
+
+            # SQLite never rejects a value for its type, so reject one like a server database would
+            def reject_value(conn, cursor, statement, parameters, context, executemany):
+                if statement.startswith("INSERT INTO products") and "999999999" in str(parameters):
+                    raise sqlite3.DataError("value too long for type character varying")
+
+            with self.app.app_context():
+                engine = db.engine
+            event.listen(engine, "before_cursor_execute", reject_value)
+            try:
+                response = self.client.post("/products/bulk?partial=true", json=rows, headers=auth_header)
+                self.assertEqual(response.status_code, 207)
+                self.assertEqual(response.json["created"], 1)
+                self.assertEqual([error["index"] for error in response.json["errors"]], [1])
+
+                response = self.client.post("/products/bulk", json=rows[1:], headers=auth_header)
+                self.assertEqual(response.status_code, 400)
+            finally:
+                event.remove(engine, "before_cursor_execute", reject_value)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_query_stats_headers(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self._create_tagged_products(auth_header, 3)
+
+            with self._count_queries() as statements:
+                response = self.client.get("/products/?include=tags", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(int(response.headers["X-DB-Queries"]), len(statements))
+            self.assertRegex(response.headers["Server-Timing"], rf'^db;dur=[0-9.]+;desc="{len(statements)} queries", app;dur=[0-9.]+$')
+
+            self.app.config["QUERY_STATS_HEADERS"] = False
+            response = self.client.get("/products/", headers=auth_header)
+            self.assertNotIn("X-DB-Queries", response.headers)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_slow_query_log(self):
+        try:
+            auth_header = {"Authorization": self._register_and_login()}
+            self.app.config["SLOW_QUERY_MS"] = 0.000001
+            with self.assertLogs("api.query_stats", "WARNING") as logs:
+                self.client.get("/products/", headers=auth_header)
+            self.assertTrue(any("on product.get_all_products: SELECT" in line for line in logs.output))
         except ValueError as e:
             self.fail(str(e))
\ No newline at end of file
@@ -0,0 +1,139 @@
+from unittest import TestCase
+from api import create_app
+from api.extensions import db
+import json
+
+class ProductCostTestCase(TestCase):
+    def setUp(self):
+        """Set up the test client and initialize the database."""
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Tear down the database after each test."""
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+
+    def _register_and_login(self):
+        """Helper function to register and login a test user."""
+        register_response = self.client.post("/auth/register", json={
+            "username": "Testing",
+            "first_name": "Tes",
+            "middle_name": "T.",
+            "last_name": "Ing",
+            "birth_date": "1990-01-15",
+            "sex": "M",
+            "position": "Cashier",
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        if register_response.status_code != 201:
+            raise ValueError(f"Registration failed: {register_response.data}")
+        
+        login_response = self.client.post("/auth/login", json={
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        login_data = json.loads(login_response.data)
+        
+        if login_response.status_code != 200 or 'access_token' not in login_data:
+            raise ValueError(f"Login failed: {login_data}")
+            
+        return {"Authorization": f"Bearer {login_data['access_token']}"}
+
+    def _create_test_data(self, auth_header):
+        """Helper function to create a product with a recipe and one outlet."""
+        try:
+            self.assertEqual(self.client.post("/products/", 
+                json={"name": "Latte", "variant_group_id": "12345ABCDE", "sku": "ABCDE12345", "category_id": 1},
+                headers=auth_header
+            ).status_code, 201)
+            self.assertEqual(self.client.post("/outlets/", json={"product_id": 1, "name": "Counter", "price": 120.0}, headers=auth_header).status_code, 201)
+
+            for name, cost in [("Beans", 500.0), ("Cup", 2.0)]:
+                self.assertEqual(self.client.post("/inventory-items/", 
+                    json={"name": name, "cost": cost, "unit": "pc", "stock_warning_level": 5.0, "supplier_id": 1},
+                    headers=auth_header
+                ).status_code, 201)
+
+            self.client.post("/recipes/", json={"product_id": 1, "item_id": 1, "quantity": 0.02, "isTakeout": False}, headers=auth_header)
+            self.client.post("/recipes/", json={"product_id": 1, "item_id": 2, "quantity": 1.0, "isTakeout": True}, headers=auth_header)
+        except Exception as e:
+            self.fail(f"Failed to create test data: {str(e)}")
+
+    def test_get_product_costs(self):
+        """Test rolling up product costs from recipes and item costs."""
+        try:
+            auth_header = self._register_and_login()
+            self._create_test_data(auth_header)
+
+            response = self.client.get("/product-costs/", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, [{"product_id": 1, "cost": 10.0, "takeout_cost": 12.0}])
+
+            # An item cost change is picked up by the next read
+            self.client.put("/inventory-items/1", json={"cost": 1000.0}, headers=auth_header)
+            response = self.client.get("/product-costs/", headers=auth_header)
+            self.assertEqual(response.json[0]["cost"], 20.0)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_outlet_margins(self):
+        """Test comparing outlet prices with product costs."""
+        try:
+            auth_header = self._register_and_login()
+            self._create_test_data(auth_header)
+            self.client.post("/products/", 
+                json={"name": "Water", "variant_group_id": "67890FGHIJ", "sku": "FGHIJ67890", "category_id": 1},
+                headers=auth_header
+            )
+            self.client.post("/outlets/", json={"product_id": 2, "name": "No Recipe", "price": 50.0}, headers=auth_header)
+
+            response = self.client.get("/product-costs/margins", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json[0]["margin"], 110.0)
+            self.assertEqual(response.json[0]["takeout_margin"], 108.0)
+            self.assertEqual(response.json[1]["cost"], 0.0)
+
+            response = self.client.get("/product-costs/margins", headers={**auth_header, "If-None-Match": response.headers["ETag"]})
+            self.assertEqual(response.status_code, 304)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_get_product_costs_unauthorized(self):
+        """Test reading product costs without a token."""
+        response = self.client.get("/product-costs/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_product_costs_ignore_other_item_writes(self):
+        """Test that only item cost changes invalidate the cached product costs."""
+        try:
+            auth_header = self._register_and_login()
+            self._create_test_data(auth_header)
+
+            response = self.client.get("/product-costs/", headers=auth_header)
+            etag = response.headers["ETag"]
+
+            self.client.put("/inventory-items/1", json={"stock_warning_level": 50.0}, headers=auth_header)
+            self.client.post("/inventory-items/bulk",
+                json=[{"name": "Lid", "cost": 1.0, "unit": "pc", "stock_warning_level": 5.0, "supplier_id": 1}],
+                headers=auth_header
+            )
+            response = self.client.get("/product-costs/", headers={**auth_header, "If-None-Match": etag})
+            self.assertEqual(response.status_code, 304, "Writes that leave item costs alone should keep the costs")
+
+            self.client.put("/inventory-items/1", json={"cost": 1000.0}, headers=auth_header)
+            response = self.client.get("/product-costs/", headers={**auth_header, "If-None-Match": etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json[0]["cost"], 20.0)
+        except ValueError as e:
+            self.fail(str(e))
@@ -0,0 +1,141 @@
+from unittest import TestCase
+from api import create_app
+from api.extensions import db
+from api.jobs import get_job, submit_job
+import json
+import time
+
+class ReorderTestCase(TestCase):
+    def setUp(self):
+        """Set up the test client and initialize the database."""
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Tear down the database after each test."""
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+
+    def _register_and_login(self):
+        """Helper function to register and login a test user."""
+        register_response = self.client.post("/auth/register", json={
+            "username": "Testing",
+            "first_name": "Tes",
+            "middle_name": "T.",
+            "last_name": "Ing",
+            "birth_date": "1990-01-15",
+            "sex": "M",
+            "position": "Cashier",
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        if register_response.status_code != 201:
+            raise ValueError(f"Registration failed: {register_response.data}")
+        
+        login_response = self.client.post("/auth/login", json={
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        login_data = json.loads(login_response.data)
+        
+        if login_response.status_code != 200 or 'access_token' not in login_data:
+            raise ValueError(f"Login failed: {login_data}")
+            
+        return {"Authorization": f"Bearer {login_data['access_token']}"}
+
+    def _create_test_data(self, auth_header):
+        """Helper function to create two suppliers, their items and stock at two branches."""
+        try:
+            for name, phone in [("Bean Co", "9991114444"), ("Cup Co", "9992225555")]:
+                self.assertEqual(self.client.post("/suppliers/", 
+                    json={"name": name, "email": f"{phone}@gmail.com", "phone": phone, "country_code": "+63"},
+                    headers=auth_header
+                ).status_code, 201)
+            for name, address in [("Branch 1", "123 Test St."), ("Branch 2", "456 Test St.")]:
+                self.client.post("/branches/", json={"name": name, "address": address}, headers=auth_header)
+
+            for name, cost, warning, supplier_id in [("Beans", 500.0, 5.0, 1), ("Milk", 90.0, 10.0, 1), ("Cup", 2.0, 100.0, 2)]:
+                self.assertEqual(self.client.post("/inventory-items/", 
+                    json={"name": name, "cost": cost, "unit": "pc", "stock_warning_level": warning, "supplier_id": supplier_id},
+                    headers=auth_header
+                ).status_code, 201)
+
+            for branch_id, item_id, in_stock, ordered_qty in [
+                (1, 1, 2.0, 1.0),     # 3 on hand and ordered, top up to 10
+                (1, 2, 50.0, 0.0),    # above the warning level
+                (2, 1, 4.0, 2.0),     # 6 is above the warning level once the order lands
+                (2, 3, 20.0, 30.0)    # 50 on hand and ordered, top up to 200
+            ]:
+                self.client.post("/branchstockcounts/", 
+                    json={"branch_id": branch_id, "item_id": item_id, "in_stock": in_stock, "ordered_qty": ordered_qty},
+                    headers=auth_header
+                )
+        except Exception as e:
+            self.fail(f"Failed to create test data: {str(e)}")
+
+    def test_get_purchase_orders(self):
+        """Test grouping reorder suggestions into one purchase order per supplier."""
+        try:
+            auth_header = self._register_and_login()
+            self._create_test_data(auth_header)
+
+            response = self.client.get("/reorders/", headers=auth_header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([order["supplier_name"] for order in response.json], ["Bean Co", "Cup Co"])
+            self.assertEqual([(line["branch_id"], line["item_id"], line["quantity"]) for line in response.json[0]["lines"]], [(1, 1, 7.0)])
+            self.assertEqual(response.json[0]["total_cost"], 3500.0)
+            self.assertEqual([(line["branch_id"], line["item_id"], line["quantity"]) for line in response.json[1]["lines"]], [(2, 3, 150.0)])
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_purchase_order_job(self):
+        """Test computing purchase orders in a background job."""
+        try:
+            auth_header = self._register_and_login()
+            self._create_test_data(auth_header)
+
+            response = self.client.post("/reorders/jobs", headers=auth_header)
+            self.assertEqual(response.status_code, 202)
+            location = response.headers["Location"]
+            self.assertEqual(location, f"/jobs/{response.json['job_id']}")
+
+            deadline = time.monotonic() + 10
+            while True:
+                job = self.client.get(location, headers=auth_header)
+                self.assertEqual(job.status_code, 200)
+                if job.json["status"] in ("finished", "failed") or time.monotonic() > deadline:
+                    break
+                time.sleep(0.05)
+
+            self.assertEqual(job.json["status"], "finished")
+            self.assertEqual(job.json["result"], self.client.get("/reorders/", headers=auth_header).json)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_job_with_unstorable_result_fails(self):
+        """Test that a job whose result can't be saved is marked failed rather than left running."""
+        with self.app.app_context():
+            job_id = submit_job("test", lambda: {"value": object()})
+            self.app.extensions["jobs"].shutdown(wait=True)
+            db.session.remove()
+            job = get_job(job_id)
+            self.assertEqual(job.status, "failed")
+            self.assertIsNotNone(job.finished_at)
+
+    def test_get_job_not_found(self):
+        """Test fetching a job that doesn't exist."""
+        try:
+            auth_header = self._register_and_login()
+            response = self.client.get("/jobs/doesnotexist", headers=auth_header)
+            self.assertEqual(response.status_code, 404)
+        except ValueError as e:
+            self.fail(str(e))
\ No newline at end of file
@@ -0,0 +1,174 @@
+from unittest import TestCase
+from api import create_app
+from api.extensions import db
+from api.request_log import LogShipper, get_log_shipper
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+class FlakySink:
+    """A stand-in for the NoSQL collection that can be switched off."""
+    def __init__(self):
+        self.available = True
+        self.entries = []
+
+    def insert_many(self, entries):
+        if not self.available:
+            raise ConnectionError("store is down")
+        self.entries.extend(entries)
+
+class RequestLogTestCase(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.app = create_app()
+        self.app.config["REQUEST_LOG_PATH"] = os.path.join(self.tmpdir.name, "requests.jsonl")
+        self.app.config["REQUEST_LOG_SPOOL_PATH"] = os.path.join(self.tmpdir.name, "requests.spool")
+        self.app.config["REQUEST_LOG_FLUSH_INTERVAL"] = 0.05
+        self.client = self.app.test_client()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+    
+    def tearDown(self):
+        with self.app.app_context():
+            shipper = self.app.extensions.get("request_log")
+            if shipper is not None:
+                shipper.stop()
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        self.tmpdir.cleanup()
+
+    def _read_log(self):
+        with self.app.app_context():
+            self.assertTrue(get_log_shipper().flush(), "Log entries should be shipped")
+        with open(self.app.config["REQUEST_LOG_PATH"]) as file:
+            return [json.loads(line) for line in file]
+
+    def test_write_requests_are_logged_and_redacted(self):
+        self.client.post("/auth/register", json={
+            "username": "Testing",
+            "first_name": "Tes",
+            "middle_name": "T.",
+            "last_name": "Ing",
+            "birth_date": "1990-01-15",
+            "sex": "M",
+            "position": "Cashier",
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        self.client.get("/")
+
+        entries = self._read_log()
+        self.assertEqual(len(entries), 1, "Only non-GET requests should be logged")
+        self.assertEqual(entries[0]["method"], "POST")
+        self.assertEqual(entries[0]["status_code"], 201)
+        self.assertEqual(entries[0]["payload"]["password"], "***REDACTED***")
+
+    def test_spool_when_store_is_down_and_replay(self):
+        sink = FlakySink()
+        shipper = LogShipper(sink, self.app.config["REQUEST_LOG_SPOOL_PATH"], 100, 10, 0.05)
+        try:
+            sink.available = False
+            shipper.submit({"method": "POST", "n": 1})
+            self.assertTrue(shipper.flush())
+            self.assertEqual(shipper.spooled, 1, "Entry should be spooled while the store is down")
+            self.assertEqual(sink.entries, [])
+
+            sink.available = True
+            shipper.submit({"method": "POST", "n": 2})
+            self.assertTrue(shipper.flush())
+            self.assertEqual(sorted(entry["n"] for entry in sink.entries), [1, 2], "Spooled entry should be replayed")
+            self.assertEqual(os.listdir(self.tmpdir.name), [], "Spool file should be removed after replay")
+        finally:
+            shipper.stop()
+
+    def test_full_queue_drops_without_blocking(self):
+        shipper = LogShipper(FlakySink(), self.app.config["REQUEST_LOG_SPOOL_PATH"], 1, 10, 0.05)
+        shipper._pid = os.getpid()  # keep the shipping thread from draining the queue
+        self.assertTrue(shipper.submit({"n": 1}))
+        self.assertFalse(shipper.submit({"n": 2}), "A full queue should drop the entry")
+        self.assertEqual(shipper.dropped, 1)
+
+
+    def test_spool_errors_keep_the_shipper_running(self):
+        sink = FlakySink()
+        missing = os.path.join(self.tmpdir.name, "missing", "requests.spool")
+        shipper = LogShipper(sink, missing, 100, 10, 0.05)
+        try:
+            sink.available = False
+            shipper.submit({"n": 1})
+            self.assertTrue(shipper.flush(), "An unwritable spool should not hold up flush")
+            self.assertEqual(shipper.dropped, 1, "Entries that can't be spooled should be counted as dropped")
+
+            sink.available = True
+            shipper.submit({"n": 2})
+            self.assertTrue(shipper.flush())
+            self.assertEqual([entry["n"] for entry in sink.entries], [2], "The shipper should keep running")
+        finally:
+            shipper.stop()
+
+    def _exited_pid(self):
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        return process.pid
+
+    def test_corrupt_spool_lines_are_skipped(self):
+        spool_path = self.app.config["REQUEST_LOG_SPOOL_PATH"]
+        with open(f"{spool_path}.{self._exited_pid()}", "w", encoding="utf-8") as file:
+            file.write('{"n": 1}\n{"n": \n{"n": 3}\n')
+
+        sink = FlakySink()
+        shipper = LogShipper(sink, spool_path, 100, 10, 0.05)
+        try:
+            shipper.submit({"n": 2})
+            self.assertTrue(shipper.flush())
+            self.assertEqual(sorted(entry["n"] for entry in sink.entries), [1, 2, 3])
+            self.assertEqual(os.listdir(self.tmpdir.name), [], "The replayed spool should be removed")
+        finally:
+            shipper.stop()
+
+    def test_dead_thread_is_restarted(self):
+        sink = FlakySink()
+        shipper = LogShipper(sink, self.app.config["REQUEST_LOG_SPOOL_PATH"], 100, 10, 0.05)
+        try:
+            next_batch = shipper._next_batch
+
+            def fail_once():
+                shipper._next_batch = next_batch
+                raise RuntimeError("shipper crashed")
+
+            shipper._next_batch = fail_once
+            shipper._ensure_started()
+            shipper._thread.join(1)
+            self.assertFalse(shipper._thread.is_alive())
+
+            shipper.submit({"n": 1})
+            self.assertTrue(shipper._thread.is_alive(), "A dead shipping thread should be restarted")
+            self.assertTrue(shipper.flush())
+            self.assertEqual(len(sink.entries), 1)
+        finally:
+            shipper.stop()
+
+    def test_replay_only_spools_of_exited_workers(self):
+        spool_path = self.app.config["REQUEST_LOG_SPOOL_PATH"]
+        live = f"{spool_path}.{os.getppid()}"
+        with open(live, "w", encoding="utf-8") as file:
+            file.write('{"n": 1}\n')
+        # A replay whose worker died before finishing it
+        with open(f"{spool_path}.{os.getppid()}.{self._exited_pid()}.replay", "w", encoding="utf-8") as file:
+            file.write('{"n": 3}\n')
+
+        sink = FlakySink()
+        shipper = LogShipper(sink, spool_path, 100, 10, 0.05)
+        try:
+            shipper.submit({"n": 2})
+            self.assertTrue(shipper.flush())
+            self.assertEqual(sorted(entry["n"] for entry in sink.entries), [2, 3], "A running worker's spool should be left to it")
+            self.assertEqual(os.listdir(self.tmpdir.name), [os.path.basename(live)])
+        finally:
+            shipper.stop()
@@ -0,0 +1,159 @@
+from unittest import TestCase
+from api import create_app
+from api.extensions import db
+from api.models.outlets import Outlet
+from sqlalchemy import update
+import json
+
+class SaleTestCase(TestCase):
+    def setUp(self):
+        """Set up the test client and initialize the database."""
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Tear down the database after each test."""
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+
+    def _register_and_login(self):
+        """Helper function to register and login a test user."""
+        register_response = self.client.post("/auth/register", json={
+            "username": "Testing",
+            "first_name": "Tes",
+            "middle_name": "T.",
+            "last_name": "Ing",
+            "birth_date": "1990-01-15",
+            "sex": "M",
+            "position": "Cashier",
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        if register_response.status_code != 201:
+            raise ValueError(f"Registration failed: {register_response.data}")
+        
+        login_response = self.client.post("/auth/login", json={
+            "email": "cashier@gmail.com",
+            "password": "password"
+        })
+        
+        login_data = json.loads(login_response.data)
+        
+        if login_response.status_code != 200 or 'access_token' not in login_data:
+            raise ValueError(f"Login failed: {login_data}")
+            
+        return {"Authorization": f"Bearer {login_data['access_token']}"}
+
+    def _create_test_data(self, auth_header):
+        """Helper function to create a product with a recipe, sold on one outlet at one branch."""
+        try:
+            self.assertEqual(self.client.post("/branches/", json={"name": "Branch 1", "address": "123 Test St."}, headers=auth_header).status_code, 201)
+            self.assertEqual(self.client.post("/products/", 
+                json={"name": "Latte", "variant_group_id": "12345ABCDE", "sku": "ABCDE12345", "category_id": 1},
+                headers=auth_header
+            ).status_code, 201)
+            self.assertEqual(self.client.post("/outlets/", json={"product_id": 1, "name": "Counter", "price": 120.0}, headers=auth_header).status_code, 201)
+
+            for name, unit in [("Beans", "kg"), ("Cup", "pc")]:
+                self.assertEqual(self.client.post("/inventory-items/", 
+                    json={"name": name, "cost": 10.0, "unit": unit, "stock_warning_level": 5.0, "supplier_id": 1},
+                    headers=auth_header
+                ).status_code, 201)
+
+            # Beans go into every latte, cups only into takeout ones
+            self.client.post("/recipes/", json={"product_id": 1, "item_id": 1, "quantity": 0.02, "isTakeout": False}, headers=auth_header)
+            self.client.post("/recipes/", json={"product_id": 1, "item_id": 2, "quantity": 1.0, "isTakeout": True}, headers=auth_header)
+
+            self.client.post("/branchstockcounts/", json={"branch_id": 1, "item_id": 1, "in_stock": 10.0, "ordered_qty": 0.0}, headers=auth_header)
+            self.client.post("/branchstockcounts/", json={"branch_id": 1, "item_id": 2, "in_stock": 100.0, "ordered_qty": 0.0}, headers=auth_header)
+        except Exception as e:
+            self.fail(f"Failed to create test data: {str(e)}")
+
+    def test_record_sales_depletes_stock(self):
+        """Test that a batch of sales depletes each ingredient once."""
+        try:
+            auth_header = self._register_and_login()
+            self._create_test_data(auth_header)
+
+            response = self.client.post("/sales/", json=[
+                {"branch_id": 1, "outlet_id": 1, "quantity": 3},
+                {"branch_id": 1, "outlet_id": 1, "quantity": 2, "isTakeout": True},
+                {"branch_id": 1, "outlet_id": 1, "quantity": 1}
+            ], headers=auth_header)
+
+            self.assertEqual(response.status_code, 200)
+            stock = {row["item_id"]: row["in_stock"] for row in response.json}
+            self.assertAlmostEqual(stock[1], 9.88)
+            self.assertEqual(stock[2], 98.0)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_record_sales_uses_updated_recipe(self):
+        """Test that a recipe change is picked up by the next sale."""
+        try:
+            auth_header = self._register_and_login()
+            self._create_test_data(auth_header)
+
+            self.client.post("/sales/", json=[{"branch_id": 1, "outlet_id": 1, "quantity": 1}], headers=auth_header)
+            self.client.put("/recipes/1/1", json={"quantity": 0.5}, headers=auth_header)
+            response = self.client.post("/sales/", json=[{"branch_id": 1, "outlet_id": 1, "quantity": 2}], headers=auth_header)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertAlmostEqual(response.json[0]["in_stock"], 8.98)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_record_sales_invalid(self):
+        """Test sales with an unknown outlet, a missing stock count and a bad quantity."""
+        try:
+            auth_header = self._register_and_login()
+            self._create_test_data(auth_header)
+
+            response = self.client.post("/sales/", json=[{"branch_id": 1, "outlet_id": 99, "quantity": 1}], headers=auth_header)
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.post("/sales/", json=[{"branch_id": 1, "outlet_id": 1, "quantity": 0}], headers=auth_header)
+            self.assertEqual(response.status_code, 400)
+
+            # Outlets that would deplete nothing are refused rather than silently ignored
+            self.client.post("/outlets/", json={"product_id": 1, "name": "Gift Card", "price": 500.0}, headers=auth_header)
+            with self.app.app_context():
+                db.session.execute(update(Outlet).where(Outlet.outlet_id == 2).values(product_id=None))
+                db.session.commit()
+            response = self.client.post("/sales/", json=[{"branch_id": 1, "outlet_id": 2, "quantity": 1}], headers=auth_header)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json["error"], "Outlet 2 has no product")
+
+            self.client.post("/products/",
+                json={"name": "Water", "variant_group_id": "67890FGHIJ", "sku": "FGHIJ67890", "category_id": 1},
+                headers=auth_header
+            )
+            self.client.post("/outlets/", json={"product_id": 2, "name": "Bottle", "price": 50.0}, headers=auth_header)
+            response = self.client.post("/sales/", json=[{"branch_id": 1, "outlet_id": 3, "quantity": 1}], headers=auth_header)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json["error"], "Product 2 of outlet 3 has no recipe")
+
+            response = self.client.post("/sales/", json=[
+                {"branch_id": 1, "outlet_id": 1, "quantity": 1},
+                {"branch_id": 2, "outlet_id": 1, "quantity": 1}
+            ], headers=auth_header)
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.json["missing"], [{"branch_id": 2, "item_id": 1}])
+
+            response = self.client.get("/branchstockcounts/1/1", headers=auth_header)
+            self.assertEqual(response.json["in_stock"], 10.0)
+        except ValueError as e:
+            self.fail(str(e))
+
+    def test_record_sales_unauthorized(self):
+        """Test recording sales without a token."""
+        response = self.client.post("/sales/", json=[{"branch_id": 1, "outlet_id": 1, "quantity": 1}])
+        self.assertEqual(response.status_code, 401)
\ No newline at end of file
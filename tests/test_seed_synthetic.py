@@ -0,0 +1,55 @@
+from unittest import TestCase
+from sqlalchemy import func, select
+from api import create_app
+from api.extensions import db
+from api.models.branchstockcount import BranchStockCount
+from api.models.inventoryitems import InventoryItem
+from api.models.low_stock_alerts import LowStockAlert
+from api.models.outlets import Outlet
+from api.models.products import Product
+from api.models.recipes import Recipe
+from api.seeds.synthetic import seed_synthetic
+
+class SeedSyntheticTestCase(TestCase):
+    def setUp(self):
+        """Set up the app and initialize the database."""
+        self.app = create_app()
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Tear down the database after each test."""
+        with self.app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+
+    def _seed(self, *args):
+        result = self.app.test_cli_runner().invoke(seed_synthetic, list(args))
+        self.assertEqual(result.exit_code, 0, result.output)
+        return result
+
+    def test_seed_synthetic(self):
+        """Test that generated rows are consistent and that seeding can be repeated."""
+        self._seed("--branches", "3", "--items", "40", "--products", "25", "--batch-size", "7")
+        self._seed("--branches", "2", "--items", "10", "--products", "5")
+
+        with self.app.app_context():
+            count = lambda model: db.session.scalar(select(func.count()).select_from(model))
+            self.assertEqual(count(Product), 30)
+            self.assertEqual(count(Outlet), 4 * 30, "Every product should have one outlet per channel")
+            self.assertEqual(count(BranchStockCount), 3 * 40 + 2 * 10)
+            self.assertEqual(
+                db.session.scalar(select(func.count()).select_from(Recipe).where(Recipe.item_id.not_in(select(InventoryItem.item_id)))), 0,
+                "Recipes should only use existing items"
+            )
+
+            low_stock = db.session.scalar(
+                select(func.count()).select_from(BranchStockCount)
+                .join(InventoryItem, InventoryItem.item_id == BranchStockCount.item_id)
+                .where(BranchStockCount.in_stock <= InventoryItem.stock_warning_level)
+            )
+            self.assertEqual(count(LowStockAlert), low_stock, "Low-stock alerts should match the generated stock")